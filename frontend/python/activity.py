@@ -0,0 +1,156 @@
+import os
+import math
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Any, Tuple
+from python.common import DATA_DIR, get_env_int, safe_read_json, safe_write_json
+
+logger = logging.getLogger(__name__)
+
+ARTIST_ACTIVITY_PATH: str = os.path.join(DATA_DIR, "artist_activity.json")
+DORMANT_AFTER_DAYS: int = 730
+INACTIVE_AFTER_DAYS: int = 3650
+DORMANT_CHECK_DAYS: int = 7
+INACTIVE_CHECK_DAYS: int = 30
+MAX_RELEASE_DATES: int = 100
+TIERS: List[str] = ['active', 'dormant', 'inactive']
+
+def parse_release_date(value: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    parts = value.split('-')
+    try:
+        return date(int(parts[0]), int(parts[1]) if len(parts) > 1 else 1, int(parts[2]) if len(parts) > 2 else 1)
+    except ValueError:
+        return None
+
+class ArtistActivity:
+    def __init__(self, activity_path: str = ARTIST_ACTIVITY_PATH):
+        self.activity_path: str = activity_path
+        self.dormant_after: timedelta = timedelta(days=get_env_int('ACTIVITY_DORMANT_AFTER_DAYS', DORMANT_AFTER_DAYS))
+        self.inactive_after: timedelta = timedelta(days=get_env_int('ACTIVITY_INACTIVE_AFTER_DAYS', INACTIVE_AFTER_DAYS))
+        self.check_intervals: Dict[str, timedelta] = {
+            'active': timedelta(0),
+            'dormant': timedelta(days=get_env_int('ACTIVITY_DORMANT_CHECK_DAYS', DORMANT_CHECK_DAYS)),
+            'inactive': timedelta(days=get_env_int('ACTIVITY_INACTIVE_CHECK_DAYS', INACTIVE_CHECK_DAYS))
+        }
+        # mbid -> {release_dates, history_known, last_checked}
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+
+    def load(self) -> None:
+        data = safe_read_json(self.activity_path) if os.path.exists(self.activity_path) else None
+        entries = data.get('artists', {}) if data else {}
+        self.entries = entries if isinstance(entries, dict) else {}
+
+    def save(self) -> bool:
+        with self.lock:
+            return safe_write_json(self.activity_path, {
+                'artists': self.entries,
+                'last_updated': datetime.now().isoformat()
+            })
+
+    def observe(self, artist_id: str, release_groups: List[Dict[str, Any]], complete_history: bool = False) -> None:
+        dates = {rg.get('first-release-date') for rg in release_groups if parse_release_date(rg.get('first-release-date'))}
+        with self.lock:
+            entry = self.entries.setdefault(artist_id, {'release_dates': [], 'history_known': False, 'last_checked': None})
+            entry['release_dates'] = sorted(set(entry['release_dates']) | dates)[-MAX_RELEASE_DATES:]
+            entry['history_known'] = entry['history_known'] or complete_history
+
+    def mark_checked(self, artist_ids: List[str], checked_at: Optional[datetime] = None) -> None:
+        checked = (checked_at or datetime.now()).isoformat()
+        with self.lock:
+            for artist_id in artist_ids:
+                entry = self.entries.setdefault(artist_id, {'release_dates': [], 'history_known': False, 'last_checked': None})
+                entry['last_checked'] = checked
+
+    def last_checked(self, artist_id: Optional[str]) -> str:
+        # ISO timestamps sort chronologically; never-checked artists sort first
+        return (self.entries.get(artist_id) or {}).get('last_checked') or '' if artist_id else ''
+
+    def history_known(self, artist_id: str) -> bool:
+        entry = self.entries.get(artist_id)
+        return bool(entry and (entry['history_known'] or entry['release_dates']))
+
+    def tier(self, artist_id: str, today: Optional[date] = None) -> str:
+        today = today or date.today()
+        entry = self.entries.get(artist_id)
+        dates = [parse_release_date(value) for value in (entry or {}).get('release_dates', [])]
+        dates = [value for value in dates if value]
+        if not dates:
+            # Unknown artists stay active until their history has been looked up once
+            return 'inactive' if entry and entry['history_known'] else 'active'
+
+        age = today - max(dates)
+        if age <= self.dormant_after:
+            return 'active'
+        tier = 'dormant' if age <= self.inactive_after else 'inactive'
+
+        # Artists who have averaged a release a year are given the benefit of the doubt
+        years = {value.year for value in dates}
+        span = max(1, today.year - min(years) + 1)
+        if len(years) / span >= 1.0:
+            tier = TIERS[TIERS.index(tier) - 1]
+        return tier
+
+    def overdue(self, artist_id: str, now: datetime) -> float:
+        # How many check intervals have passed since the last check; >= 1 means due
+        entry = self.entries.get(artist_id)
+        last_checked = (entry or {}).get('last_checked')
+        if not last_checked:
+            return math.inf
+        try:
+            elapsed = now - datetime.fromisoformat(last_checked)
+        except ValueError:
+            return math.inf
+        interval = self.check_intervals[self.tier(artist_id, now.date())]
+        if not interval:
+            return math.inf
+        return elapsed / interval
+
+    def plan(
+        self,
+        artists: List[Dict[str, Any]],
+        budget: int,
+        cost: Callable[[int], int],
+        max_probes: int,
+        now: Optional[datetime] = None
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        # Returns (due artists to check normally, due artists whose history should be looked up in full)
+        now = now or datetime.now()
+        ranked = sorted(
+            ((self.overdue(artist['id'], now), index, artist) for index, artist in enumerate(artists) if artist.get('id')),
+            key=lambda item: (-item[0], item[1])
+        )
+        due = [artist for overdue, _, artist in ranked if overdue >= 1]
+        if budget > 0 and cost(len(due)) > budget:
+            affordable = 0
+            while affordable < len(due) and cost(affordable + 1) <= budget:
+                affordable += 1
+            logger.info(f"Request budget of {budget} covers {affordable} of {len(due)} due artists")
+            due = due[:affordable]
+
+        probe_limit = min(max_probes, budget - cost(len(due))) if budget > 0 else max_probes
+        probes = [artist for artist in due if not self.history_known(artist['id'])][:max(0, probe_limit)]
+        probe_ids = {artist['id'] for artist in probes}
+        due = [artist for artist in due if artist['id'] not in probe_ids]
+
+        tiers: Dict[str, int] = {}
+        for _, _, artist in ranked:
+            tier = self.tier(artist['id'], now.date())
+            tiers[tier] = tiers.get(tier, 0) + 1
+        logger.info(f"Artist tiers: {', '.join(f'{tiers.get(t, 0)} {t}' for t in TIERS)}; "
+                    f"{len(due) + len(probes)} due this tick, {len(probes)} of them with a full history lookup")
+        return due, probes
+
+_activity: Optional[ArtistActivity] = None
+_activity_lock = threading.Lock()
+
+def get_artist_activity() -> ArtistActivity:
+    global _activity
+    with _activity_lock:
+        if _activity is None:
+            _activity = ArtistActivity()
+            _activity.load()
+        return _activity
@@ -0,0 +1,94 @@
+import os
+import re
+import logging
+import difflib
+import threading
+import unicodedata
+from typing import Dict, Iterable, Optional, Set
+from python.common import MUSIC_DIR, get_env_bool, get_env_float
+from python.tracing import span
+
+logger = logging.getLogger(__name__)
+
+ALBUM_FUZZY_THRESHOLD: float = 0.9
+EDITION_WORDS = (
+    r'deluxe|expanded|remaster(?:ed)?|anniversary|special|limited|collector\'?s?|bonus|'
+    r'super deluxe|extended|standard|explicit|clean|edition|version|reissue'
+)
+EDITION_SUFFIX = re.compile(rf'\s*[\(\[][^\)\]]*\b(?:{EDITION_WORDS})\b[^\)\]]*[\)\]]\s*$')
+EDITION_DASH_SUFFIX = re.compile(rf'\s+-\s+[^-]*\b(?:{EDITION_WORDS})\b[^-]*$')
+YEAR_SUFFIX = re.compile(r'\s*[\(\[]\s*(?:19|20)\d{2}\s*[\)\]]\s*$')
+# A bare leading year is part of the title ("2020 Vision"); only a bracketed one or one followed by a separator is dropped
+YEAR_PREFIX = re.compile(r'^\s*(?:[\(\[]\s*(?:19|20)\d{2}\s*[\)\]]\s*(?:[-–—_.]\s*)?|(?:19|20)\d{2}\s*[-–—_.]\s*)(?=\S)')
+NON_WORD = re.compile(r'[\W_]+')
+
+def normalize_album_title(title: str) -> str:
+    normalized = unicodedata.normalize('NFKC', title).casefold().strip()
+    # Folder names often carry the year or edition that MusicBrainz keeps out of the title
+    previous = None
+    while previous != normalized:
+        previous = normalized
+        normalized = EDITION_SUFFIX.sub('', normalized)
+        normalized = EDITION_DASH_SUFFIX.sub('', normalized)
+        normalized = YEAR_SUFFIX.sub('', normalized)
+    stripped = YEAR_PREFIX.sub('', normalized)
+    if stripped:
+        normalized = stripped
+    normalized = normalized.replace('&', ' and ')
+    return ' '.join(NON_WORD.sub(' ', normalized).split())
+
+class AlbumIndex:
+    def __init__(self, music_dir: str = MUSIC_DIR):
+        self.music_dir: str = music_dir
+        self.fuzzy: bool = get_env_bool('ALBUM_FUZZY_MATCH', False)
+        self.fuzzy_threshold: float = get_env_float('ALBUM_FUZZY_THRESHOLD', ALBUM_FUZZY_THRESHOLD)
+        self.albums: Dict[str, Set[str]] = {}
+        self.lock = threading.Lock()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.albums = {}
+            self.fuzzy = get_env_bool('ALBUM_FUZZY_MATCH', False)
+            self.fuzzy_threshold = get_env_float('ALBUM_FUZZY_THRESHOLD', ALBUM_FUZZY_THRESHOLD)
+
+    def set_albums(self, artist_name: str, album_titles: Iterable[str]) -> None:
+        with self.lock:
+            self.albums[artist_name] = {key for key in map(normalize_album_title, album_titles) if key}
+
+    def albums_for(self, artist_name: str) -> Set[str]:
+        with self.lock:
+            albums = self.albums.get(artist_name)
+            if albums is None:
+                albums = set()
+                try:
+                    with span('album_index.scandir', 'filesystem', artist=artist_name), \
+                            os.scandir(os.path.join(self.music_dir, artist_name)) as entries:
+                        albums = {normalize_album_title(entry.name) for entry in entries if entry.is_dir()}
+                    # Titles made only of punctuation normalize to nothing and must not match each other
+                    albums.discard('')
+                except OSError as e:
+                    logger.warning(f"Could not list albums for {artist_name}: {str(e)}")
+                self.albums[artist_name] = albums
+            return albums
+
+    def owns(self, artist_name: str, album_title: str) -> bool:
+        albums = self.albums_for(artist_name)
+        normalized = normalize_album_title(album_title)
+        if not normalized:
+            return False
+        if normalized in albums:
+            return True
+        if self.fuzzy and albums:
+            return any(difflib.SequenceMatcher(None, normalized, owned).ratio() >= self.fuzzy_threshold
+                       for owned in albums)
+        return False
+
+_album_index: Optional[AlbumIndex] = None
+_album_index_lock = threading.Lock()
+
+def get_album_index() -> AlbumIndex:
+    global _album_index
+    with _album_index_lock:
+        if _album_index is None:
+            _album_index = AlbumIndex()
+        return _album_index
@@ -0,0 +1,98 @@
+import os
+import logging
+import unicodedata
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Any, Tuple
+from python.common import DATA_DIR, get_env_int, safe_read_json, safe_write_json
+
+logger = logging.getLogger(__name__)
+
+ARTIST_ID_CACHE_PATH: str = os.path.join(DATA_DIR, "artist_ids.json")
+ARTIST_ID_OVERRIDES_PATH: str = os.path.join(DATA_DIR, "artist_overrides.json")
+DEFAULT_ARTIST_ID_TTL_DAYS: int = 90
+DEFAULT_ARTIST_ID_NEGATIVE_TTL_DAYS: int = 3
+CACHE_FLUSH_EVERY: int = 50
+
+def normalize_artist_name(artist_name: str) -> str:
+    normalized = unicodedata.normalize('NFKC', artist_name).casefold()
+    return ' '.join(normalized.split())
+
+class ArtistIdCache:
+    def __init__(
+        self,
+        cache_path: str = ARTIST_ID_CACHE_PATH,
+        overrides_path: str = ARTIST_ID_OVERRIDES_PATH
+    ):
+        self.cache_path: str = cache_path
+        self.overrides_path: str = overrides_path
+        self.ttl: timedelta = timedelta(days=get_env_int('ARTIST_ID_TTL_DAYS', DEFAULT_ARTIST_ID_TTL_DAYS))
+        self.negative_ttl: timedelta = timedelta(
+            days=get_env_int('ARTIST_ID_NEGATIVE_TTL_DAYS', DEFAULT_ARTIST_ID_NEGATIVE_TTL_DAYS)
+        )
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.overrides: Dict[str, Optional[str]] = {}
+        self.unsaved: int = 0
+        self.hits: int = 0
+        self.resolved: int = 0
+
+    def load(self) -> None:
+        data = safe_read_json(self.cache_path) if os.path.exists(self.cache_path) else None
+        entries = data.get('entries', {}) if data else {}
+        self.entries = entries if isinstance(entries, dict) else {}
+
+        # artist_overrides.json is a plain {"Folder Name": "mbid"} map; null keeps an artist unresolved
+        overrides = safe_read_json(self.overrides_path) if os.path.exists(self.overrides_path) else None
+        self.overrides = {
+            normalize_artist_name(name): artist_id
+            for name, artist_id in (overrides or {}).items()
+        }
+        logger.info(f"Loaded {len(self.entries)} cached artist IDs and {len(self.overrides)} overrides")
+
+    def is_expired(self, entry: Dict[str, Any]) -> bool:
+        try:
+            resolved_at = datetime.fromisoformat(entry['resolved_at'])
+        except (KeyError, TypeError, ValueError):
+            return True
+        ttl = self.ttl if entry.get('id') else self.negative_ttl
+        return datetime.now() - resolved_at > ttl
+
+    def lookup(self, artist_name: str) -> Tuple[bool, Optional[str]]:
+        key = normalize_artist_name(artist_name)
+        if key in self.overrides:
+            self.hits += 1
+            return True, self.overrides[key]
+
+        entry = self.entries.get(key)
+        if entry is None or self.is_expired(entry):
+            return False, None
+        self.hits += 1
+        return True, entry.get('id')
+
+    def has_override(self, artist_name: str) -> bool:
+        return normalize_artist_name(artist_name) in self.overrides
+
+    def has_entry(self, artist_name: str) -> bool:
+        # Overrides, fresh IDs and expired ones that need resolving again all take precedence over stored IDs
+        key = normalize_artist_name(artist_name)
+        return key in self.overrides or key in self.entries
+
+    def store(self, artist_name: str, artist_id: Optional[str]) -> None:
+        key = normalize_artist_name(artist_name)
+        self.entries[key] = {
+            'name': artist_name,
+            'id': artist_id,
+            'resolved_at': datetime.now().isoformat()
+        }
+        self.unsaved += 1
+        self.resolved += 1
+        if self.unsaved >= CACHE_FLUSH_EVERY:
+            self.save()
+
+    def save(self) -> bool:
+        if safe_write_json(self.cache_path, {
+            'entries': self.entries,
+            'last_updated': datetime.now().isoformat()
+        }):
+            self.unsaved = 0
+            return True
+        return False
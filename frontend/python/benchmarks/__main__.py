@@ -0,0 +1,180 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import resource
+import tempfile
+import subprocess
+from typing import Dict, List, Any, Callable
+from python.benchmarks.catalog import generate_library
+from python.benchmarks.offline import check_offline_index
+from python.benchmarks.standin import StandIn
+
+# Each scenario runs in a fresh interpreter so module-level singletons and caches start cold
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    'cold': {'runs': 1},
+    'warm': {'runs': 2},
+    'per-artist': {'runs': 1, 'env': {'BULK_RELEASE_POLLING': 'false'}},
+    # Library comes from the stand-in's Jellyfin API instead of a /music tree
+    'jellyfin': {'runs': 1, 'jellyfin': True},
+    # Imports a fixture dump (checking repeat and newer imports) and scans without the web service
+    'offline': {'runs': 1, 'offline': True, 'env': {'MUSICBRAINZ_OFFLINE': 'true'}}
+}
+# os.path helpers go through os.stat, so counting these covers them too
+FS_CALLS: List[str] = ['scandir', 'listdir', 'stat', 'lstat', 'open']
+OUTBOX_DRAIN_TIMEOUT: float = 30.0
+
+def count_fs_calls(counters: Dict[str, int]) -> None:
+    import builtins
+    for name in FS_CALLS:
+        owner = builtins if name == 'open' else os
+        original = getattr(owner, name)
+
+        def wrapper(*args: Any, _original: Callable = original, _name: str = name, **kwargs: Any) -> Any:
+            counters[_name] = counters.get(_name, 0) + 1
+            return _original(*args, **kwargs)
+        setattr(owner, name, wrapper)
+
+def run_child(runs: int) -> None:
+    counters: Dict[str, int] = {}
+    count_fs_calls(counters)
+    from python import main
+    from python.outbox import get_outbox
+    from python.http_client import get_musicbrainz_limiter
+
+    outbox = get_outbox()
+    outbox.start()
+    results = []
+    for _ in range(runs):
+        counters.clear()
+        limiter = get_musicbrainz_limiter()
+        limiter.sleep_seconds = 0.0
+        limiter.requests = 0
+
+        started = time.perf_counter()
+        main.update_artist_list()
+        artists_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        main.check_new_releases()
+        releases_seconds = time.perf_counter() - started
+
+        deadline = time.monotonic() + OUTBOX_DRAIN_TIMEOUT
+        while outbox.pending() and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        results.append({
+            'artist_scan_seconds': round(artists_seconds, 3),
+            'release_scan_seconds': round(releases_seconds, 3),
+            'wall_seconds': round(artists_seconds + releases_seconds, 3),
+            'limiter_requests': limiter.requests,
+            'limiter_sleep_seconds': round(limiter.sleep_seconds, 3),
+            'outbox_pending': outbox.pending(),
+            'fs_calls': sum(counters.values()),
+            'fs_calls_by_type': dict(sorted(counters.items()))
+        })
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({'runs': results, 'peak_rss_mb': round(peak_rss_kb / 1024, 1)}))
+
+def run_scenario(name: str, scenario: Dict[str, Any], args: argparse.Namespace, stand_in: StandIn, base_url: str) -> Dict[str, Any]:
+    work_dir = tempfile.mkdtemp(prefix=f"trackly-bench-{name}-")
+    music_dir = os.path.join(work_dir, 'music')
+    data_dir = os.path.join(work_dir, 'data')
+    os.makedirs(data_dir)
+    try:
+        if scenario.get('jellyfin'):
+            os.makedirs(music_dir)
+        else:
+            generate_library(music_dir, args.artists)
+        offline_check = None
+        if scenario.get('offline'):
+            offline_check = check_offline_index(work_dir, os.path.join(data_dir, 'musicbrainz_offline.db'), args.artists)
+        env = dict(os.environ)
+        env.update({
+            'TRACKLY_DATA_DIR': data_dir,
+            'TRACKLY_MUSIC_DIR': music_dir,
+            'MUSICBRAINZ_BASE_URL': f"{base_url}/ws/2",
+            'MUSICBRAINZ_RATE_LIMIT': str(args.rate_limit),
+            'DISCORD_WEBHOOK': f"{base_url}/webhook",
+            'OUTBOX_COALESCE_SECONDS': '0'
+        })
+        if scenario.get('jellyfin'):
+            env.update({'JELLYFIN_URL': f"{base_url}/jellyfin", 'JELLYFIN_API_KEY': 'benchmark'})
+        env.update(scenario.get('env', {}))
+        env.update(dict(pair.split('=', 1) for pair in args.env))
+
+        stand_in.reset()
+        child = subprocess.run(
+            [sys.executable, '-m', 'python.benchmarks', '--child', str(scenario['runs'])],
+            env=env, cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+            stdout=subprocess.PIPE, stderr=None if args.verbose else subprocess.DEVNULL, text=True
+        )
+        if child.returncode != 0:
+            raise RuntimeError(f"Scenario {name} exited with status {child.returncode}")
+        result = json.loads(child.stdout.strip().splitlines()[-1])
+        result['http_requests'] = dict(stand_in.counts)
+        result['discord_embeds'] = stand_in.embeds
+        if offline_check is not None:
+            result['offline_index'] = offline_check
+        return result
+    finally:
+        if args.keep:
+            print(f"Kept {work_dir}", file=sys.stderr)
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    lines = []
+    for name, result in results['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if not previous:
+            continue
+        for metric in ('wall_seconds', 'limiter_requests', 'limiter_sleep_seconds', 'fs_calls'):
+            before = previous['runs'][-1][metric]
+            after = result['runs'][-1][metric]
+            change = ((after - before) / before * 100) if before else 0.0
+            lines.append(f"{name:<12} {metric:<24} {before:>10} -> {after:<10} ({change:+.1f}%)")
+        lines.append(f"{name:<12} {'peak_rss_mb':<24} {previous['peak_rss_mb']:>10} -> {result['peak_rss_mb']:<10}")
+    return lines
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m python.benchmarks', description="Benchmark Trackly scans against a local MusicBrainz and Discord stand-in")
+    parser.add_argument('--artists', type=int, default=500, help="Synthetic library size")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS), help="Scenario to run (repeatable, default all)")
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="Added latency per stand-in response")
+    parser.add_argument('--rate-limit', type=float, default=1000.0, help="MUSICBRAINZ_RATE_LIMIT for the scan under test")
+    parser.add_argument('--record', metavar='CASSETTE', help="Proxy to musicbrainz.org at 1 req/s and save the responses")
+    parser.add_argument('--replay', metavar='CASSETTE', help="Serve responses from a recorded cassette")
+    parser.add_argument('--baseline', metavar='RESULTS', help="Compare against a previous results file")
+    parser.add_argument('--output', metavar='RESULTS', help="Write results JSON to this file")
+    parser.add_argument('--env', action='append', default=[], metavar='NAME=VALUE', help="Extra environment for the scan under test")
+    parser.add_argument('--keep', action='store_true', help="Keep the temporary library and data directories")
+    parser.add_argument('--verbose', action='store_true', help="Show scan logs")
+    parser.add_argument('--child', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child)
+        return
+
+    stand_in = StandIn(args.latency_ms, args.record or args.replay, bool(args.record), args.artists)
+    base_url = stand_in.start()
+    results: Dict[str, Any] = {'artists': args.artists, 'latency_ms': args.latency_ms, 'scenarios': {}}
+    try:
+        for name in args.scenario or list(SCENARIOS):
+            results['scenarios'][name] = run_scenario(name, SCENARIOS[name], args, stand_in, base_url)
+    finally:
+        stand_in.stop()
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            print('\n'.join(compare(results, json.load(f))))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import os
+import json
+import uuid
+import hashlib
+from datetime import datetime
+from typing import Dict, List, Any
+from python.artist_cache import normalize_artist_name
+
+FIRST_YEAR: int = 1990
+IMAGE_BYTES: bytes = b'\x89PNG\r\n\x1a\n' + b'\x00' * 256
+
+def stable_int(value: str) -> int:
+    return int.from_bytes(hashlib.sha1(value.encode('utf-8')).digest()[:8], 'big')
+
+def artist_name(index: int) -> str:
+    return f"Artist {index:05d}"
+
+def artist_mbid(name: str) -> str:
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"artist:{normalize_artist_name(name)}"))
+
+def release_groups(mbid: str, current_year: int = None) -> List[Dict[str, Any]]:
+    # Every artist gets a deterministic discography; roughly one in twenty has an album this year
+    current_year = current_year or datetime.now().year
+    seed = stable_int(mbid)
+    count = 3 + seed % 6
+    groups = []
+    for i in range(count):
+        year = FIRST_YEAR + (seed >> (i + 3)) % (current_year - FIRST_YEAR)
+        groups.append({
+            'id': str(uuid.uuid5(uuid.NAMESPACE_URL, f"release-group:{mbid}:{i}")),
+            'title': f"Album {i + 1}",
+            'primary-type': 'Album',
+            'first-release-date': f"{year}-{1 + i % 12:02d}-15",
+            'artist-credit': [{'artist': {'id': mbid}}]
+        })
+    if seed % 20 == 0:
+        groups.append({
+            'id': str(uuid.uuid5(uuid.NAMESPACE_URL, f"release-group:{mbid}:new")),
+            'title': "Brand New Album",
+            'primary-type': 'Album',
+            'first-release-date': f"{current_year}-01-10",
+            'artist-credit': [{'artist': {'id': mbid}}]
+        })
+    return groups
+
+def generate_library(music_dir: str, artists: int, with_images: bool = True) -> int:
+    os.makedirs(music_dir, exist_ok=True)
+    created = 0
+    for index in range(artists):
+        name = artist_name(index)
+        artist_path = os.path.join(music_dir, name)
+        if os.path.isdir(artist_path):
+            continue
+        os.makedirs(artist_path)
+        for group in release_groups(artist_mbid(name)):
+            if group['title'] != "Brand New Album":
+                os.makedirs(os.path.join(artist_path, group['title']), exist_ok=True)
+        if with_images:
+            for image in ('backdrop.jpg', 'cover.png' if index % 2 else 'folder.jpg'):
+                with open(os.path.join(artist_path, image), 'wb') as f:
+                    f.write(IMAGE_BYTES)
+        created += 1
+    return created
+
+def write_dump(dump_dir: str, artists: int, timestamp: str, revision: int = 0) -> None:
+    # A JSON dump in the layout python.offline_index imports; later revisions rename and redate albums,
+    # add aliases and drop the last artist with their albums, as merges upstream do
+    mbdump = os.path.join(dump_dir, 'mbdump')
+    os.makedirs(mbdump, exist_ok=True)
+    with open(os.path.join(dump_dir, 'TIMESTAMP'), 'w') as f:
+        f.write(timestamp)
+    with open(os.path.join(mbdump, 'artist'), 'w') as artist_file, \
+            open(os.path.join(mbdump, 'release-group'), 'w') as group_file:
+        for index in range(artists - 1 if revision else artists):
+            name = artist_name(index)
+            mbid = artist_mbid(name)
+            aliases = [{'name': f"{name} Revision {revision}"}] if revision else []
+            artist_file.write(json.dumps({'id': mbid, 'name': name, 'aliases': aliases}) + '\n')
+            for group in release_groups(mbid):
+                if revision:
+                    # Moving the date re-keys the release group's artist links, which must replace the old ones
+                    year = int(group['first-release-date'][:4]) + revision
+                    group = {**group, 'title': f"{group['title']} (Revision {revision})",
+                             'first-release-date': f"{year}{group['first-release-date'][4:]}"}
+                group_file.write(json.dumps(group) + '\n')
@@ -0,0 +1,61 @@
+import os
+from typing import Dict, Any
+from python.benchmarks.catalog import FIRST_YEAR, artist_mbid, artist_name, release_groups, write_dump
+from python.offline_index import OfflineIndex
+
+FIRST_DUMP: str = "2026-01-01 00:00:00.000000+00"
+SECOND_DUMP: str = "2026-01-08 00:00:00.000000+00"
+
+def expect(condition: bool, message: str) -> None:
+    if not condition:
+        raise RuntimeError(f"Offline index check failed: {message}")
+
+def expected_titles(artists: int, revision: int = 0) -> Dict[str, set]:
+    # Revisions drop the last artist, who should then have no release groups at all
+    suffix = f" (Revision {revision})" if revision else ""
+    kept = artists - 1 if revision else artists
+    return {artist_mbid(artist_name(index)): {group['title'] + suffix for group in release_groups(artist_mbid(artist_name(index)))}
+            if index < kept else set() for index in range(artists)}
+
+def indexed_titles(index: OfflineIndex, artists: int) -> Dict[str, set]:
+    titles: Dict[str, set] = {artist_mbid(artist_name(i)): set() for i in range(artists)}
+    for group in index.release_groups_for(list(titles), FIRST_YEAR):
+        for credit in group['artist-credit']:
+            titles[credit['artist']['id']].add(group['title'])
+    return titles
+
+def check_offline_index(work_dir: str, db_path: str, artists: int) -> Dict[str, Any]:
+    # Imports a fixture dump twice, then a newer one, checking what release_groups_for returns after each
+    first_dir = os.path.join(work_dir, 'dump-1')
+    second_dir = os.path.join(work_dir, 'dump-2')
+    write_dump(first_dir, artists, FIRST_DUMP)
+    write_dump(second_dir, artists, SECOND_DUMP, revision=1)
+    index = OfflineIndex(db_path)
+    groups = sum(len(titles) for titles in expected_titles(artists).values())
+
+    imported = index.import_dump(first_dir)
+    expect(imported == {'artist': artists, 'release-group': groups}, f"first import returned {imported}")
+    expect(indexed_titles(index, artists) == expected_titles(artists), "release groups differ from the dump")
+
+    repeated = index.import_dump(first_dir)
+    expect(repeated == {'artist': 0, 'release-group': 0}, f"re-importing the same dump returned {repeated}")
+
+    updated = index.import_dump(second_dir)
+    kept_groups = sum(len(titles) for titles in expected_titles(artists, 1).values())
+    expect(updated == {'artist': artists - 1, 'release-group': kept_groups}, f"newer dump returned {updated}")
+    expect(indexed_titles(index, artists) == expected_titles(artists, 1), "newer dump did not replace release groups")
+    links = index.connection().execute('SELECT COUNT(*) FROM release_group_artists').fetchone()[0]
+    expect(links == kept_groups, f"{links} artist links for {kept_groups} release groups after the update")
+    dropped = artist_name(artists - 1)
+    expect(index.lookup_artist_id(dropped) is None, "artist missing from the newer dump is still indexed")
+    name = artist_name(0)
+    expect(index.lookup_artist_id(f"{name} Revision 1") == artist_mbid(name), "alias from the newer dump is missing")
+    expect(index.lookup_artist_id(name) == artist_mbid(name), "artist name lookup failed")
+    index.connection().close()
+
+    # Leave the index as the first dump had it, so the scan sees the catalog the stand-in serves
+    os.remove(db_path)
+    index = OfflineIndex(db_path)
+    index.import_dump(first_dir)
+    index.connection().close()
+    return {'artists': artists, 'release_groups': groups}
@@ -0,0 +1,179 @@
+import re
+import json
+import uuid
+import time
+import threading
+from typing import Dict, List, Optional, Any, Tuple
+from urllib.parse import urlsplit, parse_qs, urlencode
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+from python.benchmarks.catalog import artist_name, artist_mbid, release_groups
+
+ARTIST_TERM = re.compile(r'artist:"((?:[^"\\]|\\.)*)"')
+ARID_TERMS = re.compile(r'arid:\(([^)]*)\)')
+YEAR_RANGE = re.compile(r'firstreleasedate:\[(\d{4}) TO')
+MUSICBRAINZ_URL: str = "https://musicbrainz.org"
+
+def unescape(value: str) -> str:
+    return re.sub(r'\\(.)', r'\1', value)
+
+def cassette_key(path: str, query: Dict[str, List[str]]) -> str:
+    return f"{path}?{urlencode(sorted((k, v[0]) for k, v in query.items()))}"
+
+class StandIn:
+    def __init__(self, latency_ms: float = 0.0, cassette_path: Optional[str] = None, record: bool = False,
+                 jellyfin_artists: int = 0):
+        self.latency: float = latency_ms / 1000.0
+        self.jellyfin_artists: int = jellyfin_artists
+        self.cassette_path: Optional[str] = cassette_path
+        self.record: bool = record
+        self.cassette: Dict[str, Any] = {}
+        if cassette_path and not record:
+            with open(cassette_path, 'r') as f:
+                self.cassette = json.load(f)
+        self.counts: Dict[str, int] = {'artist': 0, 'release-group': 0, 'webhook': 0, 'unrecorded': 0}
+        self.embeds: int = 0
+        self.lock = threading.Lock()
+        self.server: Optional[ThreadingHTTPServer] = None
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self.lock:
+            self.counts[name] = self.counts.get(name, 0) + amount
+
+    def reset(self) -> None:
+        with self.lock:
+            self.counts = {key: 0 for key in self.counts}
+            self.embeds = 0
+
+    def artist_search(self, query: str, limit: int) -> Dict[str, Any]:
+        names = [unescape(term) for term in ARTIST_TERM.findall(query)] or [query]
+        artists = [{'id': artist_mbid(name), 'name': name, 'score': 100}
+                   for name in names if 'unknown' not in name.lower()]
+        return {'count': len(artists), 'offset': 0, 'artists': artists[:limit]}
+
+    def release_group_lookup(self, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        limit = int(query.get('limit', ['25'])[0])
+        offset = int(query.get('offset', ['0'])[0])
+        if 'artist' in query:
+            # Browse responses use their own count keys, unlike searches
+            groups = release_groups(query['artist'][0])
+            return {'release-group-count': len(groups), 'release-group-offset': offset,
+                    'release-groups': groups[offset:offset + limit]}
+        else:
+            search = query.get('query', [''])[0]
+            ids = ARID_TERMS.search(search)
+            year = YEAR_RANGE.search(search)
+            min_year = year.group(1) if year else '0000'
+            groups = [group
+                      for mbid in (ids.group(1).split(' OR ') if ids else [])
+                      for group in release_groups(mbid.strip())
+                      if group['first-release-date'][:4] >= min_year]
+        return {'count': len(groups), 'offset': offset, 'release-groups': groups[offset:offset + limit]}
+
+    def jellyfin_library(self, endpoint: str, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        # The same catalog as generate_library, tagged the way Jellyfin reports it; every tenth artist is untagged
+        items = []
+        for index in range(self.jellyfin_artists):
+            name = artist_name(index)
+            mbid = artist_mbid(name)
+            artist = {'Name': name, 'Id': uuid.uuid5(uuid.NAMESPACE_URL, f"jellyfin:{name}").hex}
+            if endpoint == 'AlbumArtists':
+                tag = mbid[:8]
+                items.append({**artist, 'ProviderIds': {} if index % 10 == 9 else {'MusicBrainzArtist': mbid},
+                              'ImageTags': {'Primary': tag}, 'BackdropImageTags': [tag]})
+                continue
+            for group in release_groups(mbid):
+                if group['title'] != "Brand New Album":
+                    items.append({'Name': group['title'], 'Id': uuid.uuid5(uuid.NAMESPACE_URL, group['id']).hex,
+                                  'AlbumArtists': [artist], 'ProviderIds': {'MusicBrainzReleaseGroup': group['id']}})
+        start = int(query.get('StartIndex', ['0'])[0])
+        limit = int(query.get('Limit', [str(len(items))])[0])
+        return {'Items': items[start:start + limit], 'TotalRecordCount': len(items), 'StartIndex': start}
+
+    def handle(self, method: str, url: str, body: Optional[bytes],
+               headers: Optional[Dict[str, str]] = None) -> Tuple[int, Optional[Dict[str, Any]]]:
+        parts = urlsplit(url)
+        query = parse_qs(parts.query)
+        if self.latency:
+            time.sleep(self.latency)
+
+        if parts.path.startswith('/webhook'):
+            self.count('webhook')
+            with self.lock:
+                self.embeds += len(json.loads(body or b'{}').get('embeds', []))
+            return 204, None
+
+        if parts.path.startswith('/jellyfin/'):
+            self.count('jellyfin')
+            if not (headers or {}).get('X-Emby-Token'):
+                return 401, {'error': 'Unauthorized'}
+            endpoint = parts.path.rstrip('/').rsplit('/', 1)[-1]
+            if endpoint not in ('AlbumArtists', 'Items'):
+                return 404, {'error': 'Not found'}
+            return 200, self.jellyfin_library(endpoint, query)
+
+        endpoint = parts.path.rstrip('/').rsplit('/', 1)[-1]
+        self.count(endpoint)
+        key = cassette_key(parts.path, query)
+        if self.record:
+            response = requests.get(f"{MUSICBRAINZ_URL}{url}", headers={
+                'User-Agent': 'Trackly-benchmark/1.0 ( https://github.com/7eventy7/trackly )',
+                'Accept': 'application/json'
+            }, timeout=30)
+            time.sleep(1.0)
+            data = response.json()
+            with self.lock:
+                self.cassette[key] = data
+            return response.status_code, data
+        if self.cassette_path:
+            if key not in self.cassette:
+                self.count('unrecorded')
+                return 404, {'error': 'Not recorded'}
+            return 200, self.cassette[key]
+
+        if endpoint == 'artist':
+            return 200, self.artist_search(query.get('query', [''])[0], int(query.get('limit', ['25'])[0]))
+        if endpoint == 'release-group':
+            return 200, self.release_group_lookup(query)
+        return 404, {'error': 'Not found'}
+
+    def save_cassette(self) -> None:
+        if self.record and self.cassette_path:
+            with open(self.cassette_path, 'w') as f:
+                json.dump(self.cassette, f, indent=1, sort_keys=True)
+
+    def start(self) -> str:
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def respond(self, method: str) -> None:
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else None
+                status, data = stand_in.handle(method, self.path, body, dict(self.headers))
+                payload = json.dumps(data).encode('utf-8') if data is not None else b''
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self) -> None:
+                self.respond('GET')
+
+            def do_POST(self) -> None:
+                self.respond('POST')
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def stop(self) -> None:
+        if self.server is not None:
+            self.server.shutdown()
+        self.save_cassette()
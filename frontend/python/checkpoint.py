@@ -0,0 +1,94 @@
+import os
+import time
+import uuid
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any, Set
+from python.common import DATA_DIR, get_env_float, safe_read_json, safe_write_json
+
+logger = logging.getLogger(__name__)
+
+SCAN_CHECKPOINT_PATH: str = os.path.join(DATA_DIR, "scan_checkpoint.json")
+CHECKPOINT_SECONDS: float = 30.0
+CHECKPOINT_MAX_AGE_HOURS: float = 24.0
+
+def artist_key(artist: Dict[str, Any]) -> str:
+    return artist.get('id') or artist['name']
+
+class ScanCheckpoint:
+    def __init__(self, checkpoint_path: str = SCAN_CHECKPOINT_PATH):
+        self.checkpoint_path: str = checkpoint_path
+        self.interval: float = get_env_float('SCAN_CHECKPOINT_SECONDS', CHECKPOINT_SECONDS)
+        self.max_age: timedelta = timedelta(hours=get_env_float('SCAN_CHECKPOINT_MAX_AGE_HOURS', CHECKPOINT_MAX_AGE_HOURS))
+        self.state: Optional[Dict[str, Any]] = None
+        self.done: Set[str] = set()
+        self.saved_at: float = 0.0
+        self.lock = threading.Lock()
+
+    def load(self, year: int) -> Optional[Dict[str, Any]]:
+        # Returns the interrupted scan to resume, discarding checkpoints from another year or too long ago
+        data = safe_read_json(self.checkpoint_path) if os.path.exists(self.checkpoint_path) else None
+        if not data:
+            return None
+        try:
+            updated_at = datetime.fromisoformat(data['updated_at'])
+            if data['year'] != year or datetime.now() - updated_at > self.max_age:
+                logger.info(f"Discarding scan checkpoint {data['id']} from {data['updated_at']}")
+                self.clear()
+                return None
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Discarding unreadable scan checkpoint")
+            self.clear()
+            return None
+        return data
+
+    def begin(self, year: int, full_scan: bool, storage_scan_id: Optional[int], resumed: Optional[Dict[str, Any]] = None) -> None:
+        with self.lock:
+            self.state = resumed or {
+                'id': uuid.uuid4().hex,
+                'year': year,
+                'full_scan': full_scan,
+                'storage_scan_id': storage_scan_id,
+                'started_at': datetime.now().isoformat()
+            }
+            self.done = set(self.state.get('done', []))
+            self.saved_at = time.monotonic()
+
+    def is_done(self, artist: Dict[str, Any]) -> bool:
+        return artist_key(artist) in self.done
+
+    def due(self) -> bool:
+        return time.monotonic() - self.saved_at >= self.interval
+
+    def save(self, checked: List[str]) -> bool:
+        with self.lock:
+            if self.state is None:
+                return False
+            self.done.update(checked)
+            self.state['done'] = sorted(self.done)
+            self.state['cursor'] = len(self.done)
+            self.state['updated_at'] = datetime.now().isoformat()
+            self.saved_at = time.monotonic()
+            return safe_write_json(self.checkpoint_path, self.state)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.state = None
+            self.done = set()
+            try:
+                os.remove(self.checkpoint_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Failed to remove scan checkpoint: {str(e)}")
+
+_checkpoint: Optional[ScanCheckpoint] = None
+_checkpoint_lock = threading.Lock()
+
+def get_scan_checkpoint() -> ScanCheckpoint:
+    global _checkpoint
+    with _checkpoint_lock:
+        if _checkpoint is None:
+            _checkpoint = ScanCheckpoint()
+        return _checkpoint
@@ -0,0 +1,91 @@
+import os
+import json
+import time
+import logging
+from typing import Dict, Any, Optional
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.getenv('TRACKLY_DATA_DIR', "/data")
+MUSIC_DIR = os.getenv('TRACKLY_MUSIC_DIR', "/music")
+
+def get_env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    if value is None or value.strip() == '':
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"Invalid integer for {name}: {value!r}, using default {default}")
+        return default
+
+def get_env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if value is None or value.strip() == '':
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning(f"Invalid number for {name}: {value!r}, using default {default}")
+        return default
+
+def get_env_bool(name: str, default: bool = False) -> bool:
+    return os.getenv(name, 'true' if default else 'false').lower() == 'true'
+
+def record_json_io(operation: str, file_path: str, size: int, seconds: float) -> None:
+    # Imported here because metrics and tracing themselves depend on this module
+    from python.metrics import get_metrics
+    from python.tracing import record_span
+    metrics = get_metrics()
+    file_name = os.path.basename(file_path)
+    metrics.inc(f"trackly_json_{operation}_bytes_total", size, file=file_name)
+    metrics.observe(f"trackly_json_{operation}_duration_seconds", seconds, file=file_name)
+    record_span(f"json.{operation}", 'json', seconds, file=file_name, bytes=size)
+
+def safe_read_json(file_path: str) -> Optional[Dict[str, Any]]:
+    try:
+        if not os.path.exists(file_path):
+            logger.info(f"File not found: {file_path}")
+            return None
+
+        started = time.perf_counter()
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        data = json.loads(raw)
+        record_json_io('read', file_path, len(raw), time.perf_counter() - started)
+        return data
+    except json.JSONDecodeError as e:
+        logger.error(f"Invalid JSON in {file_path}: {str(e)}")
+        return None
+    except Exception as e:
+        logger.error(f"Error reading {file_path}: {str(e)}")
+        return None
+
+def safe_write_json(file_path: str, data: Dict[str, Any]) -> bool:
+    try:
+        temp_path = f"{file_path}.tmp"
+        started = time.perf_counter()
+        raw = json.dumps(data, indent=2).encode('utf-8')
+        with open(temp_path, 'wb') as f:
+            f.write(raw)
+
+        with open(temp_path, 'r') as f:
+            json.load(f)
+
+        os.replace(temp_path, file_path)
+        record_json_io('write', file_path, len(raw), time.perf_counter() - started)
+        logger.info(f"Successfully wrote to {file_path}")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to write to {file_path}: {str(e)}")
+        if os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except:
+                pass
+        return False
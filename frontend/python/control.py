@@ -0,0 +1,193 @@
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+from python.common import DATA_DIR, safe_read_json
+
+logger = logging.getLogger(__name__)
+
+CONTROL_DIR: str = os.path.join(DATA_DIR, "control")
+SCAN_STATUS_PATH: str = os.path.join(DATA_DIR, "scan_status.json")
+# Actions in the order the scheduler runs them when several are queued
+ACTIONS: List[str] = ['refresh', 'scan']
+REQUEST_POLL_SECONDS: float = 1.0
+HEARTBEAT_SECONDS: float = 30.0
+PROGRESS_WRITE_SECONDS: float = 2.0
+
+def request_action(action: str) -> Dict[str, Any]:
+    if action not in ACTIONS:
+        raise ValueError(f"Unknown action {action!r}, expected one of {', '.join(ACTIONS)}")
+    for pending in pending_requests():
+        if pending['action'] == action:
+            return pending
+
+    os.makedirs(CONTROL_DIR, exist_ok=True)
+    request = {
+        'id': uuid.uuid4().hex,
+        'action': action,
+        'requested_at': datetime.now().isoformat()
+    }
+    # Names sort by request time; the scheduler only picks up complete .json files
+    file_name = f"{time.time_ns()}-{request['id']}.json"
+    temp_path = os.path.join(CONTROL_DIR, f".{file_name}.tmp")
+    with open(temp_path, 'w') as f:
+        json.dump(request, f)
+    os.replace(temp_path, os.path.join(CONTROL_DIR, file_name))
+    logger.info(f"Queued {action} request {request['id']}")
+    return request
+
+def request_files() -> List[str]:
+    try:
+        return sorted(name for name in os.listdir(CONTROL_DIR) if name.endswith('.json'))
+    except FileNotFoundError:
+        return []
+
+def pending_requests() -> List[Dict[str, Any]]:
+    requests = []
+    for name in request_files():
+        try:
+            with open(os.path.join(CONTROL_DIR, name), 'r') as f:
+                requests.append(json.load(f))
+        except (OSError, json.JSONDecodeError):
+            continue
+    return requests
+
+def take_requests() -> List[str]:
+    actions = set()
+    for name in request_files():
+        path = os.path.join(CONTROL_DIR, name)
+        try:
+            with open(path, 'r') as f:
+                actions.add(json.load(f).get('action'))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Discarding unreadable scan request {name}: {str(e)}")
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    return [action for action in ACTIONS if action in actions]
+
+class ScanStatus:
+    def __init__(self, status_path: str = SCAN_STATUS_PATH):
+        self.status_path: str = status_path
+        self.status: Dict[str, Any] = {
+            'state': 'idle',
+            'pid': os.getpid(),
+            'current': None,
+            'last_run': {},
+            'next_run': None
+        }
+        self.written_at: float = 0.0
+        self.thread: Optional[threading.Thread] = None
+        self.lock = threading.Lock()
+
+    def start(self) -> None:
+        # Keeps heartbeat_at fresh through long scans so the API can tell a busy scheduler from a dead one
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name='scan-status-heartbeat', daemon=True)
+            self.thread.start()
+
+    def run(self) -> None:
+        while True:
+            self.heartbeat()
+            time.sleep(HEARTBEAT_SECONDS / 3)
+
+    def write(self) -> None:
+        self.status['heartbeat_at'] = datetime.now().isoformat()
+        self.status['pid'] = os.getpid()
+        self.written_at = time.monotonic()
+        # Written often during a scan, so skip safe_write_json's per-write logging
+        temp_path = f"{self.status_path}.tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(self.status, f, indent=2)
+            os.replace(temp_path, self.status_path)
+        except OSError as e:
+            logger.warning(f"Failed to write scan status: {str(e)}")
+
+    def begin(self, action: str, total: int = 0) -> None:
+        with self.lock:
+            self.status['state'] = 'running'
+            self.status['current'] = {
+                'action': action,
+                'started_at': datetime.now().isoformat(),
+                'total': total,
+                'done': 0
+            }
+            self.write()
+
+    def set_total(self, total: int) -> None:
+        with self.lock:
+            if self.status['current']:
+                self.status['current']['total'] = total
+                self.write()
+
+    def advance(self, count: int = 1) -> None:
+        with self.lock:
+            current = self.status['current']
+            if not current:
+                return
+            current['done'] += count
+            if current['total']:
+                current['done'] = min(current['done'], current['total'])
+            if time.monotonic() - self.written_at >= PROGRESS_WRITE_SECONDS:
+                self.write()
+
+    def finish(self, result: str = 'completed') -> None:
+        with self.lock:
+            current = self.status['current']
+            if current:
+                current['finished_at'] = datetime.now().isoformat()
+                current['result'] = result
+                self.status['last_run'][current['action']] = current
+            self.status['state'] = 'idle'
+            self.status['current'] = None
+            self.write()
+
+    def set_next_run(self, next_run: datetime) -> None:
+        with self.lock:
+            self.status['next_run'] = next_run.isoformat()
+            self.write()
+
+    def heartbeat(self) -> None:
+        with self.lock:
+            if time.monotonic() - self.written_at >= HEARTBEAT_SECONDS:
+                self.write()
+
+def load_scan_status() -> Optional[Dict[str, Any]]:
+    return safe_read_json(SCAN_STATUS_PATH) if os.path.exists(SCAN_STATUS_PATH) else None
+
+def wait_for_trigger(deadline: datetime) -> List[str]:
+    # Returns queued actions as soon as any arrive, or an empty list once the deadline passes
+    while True:
+        actions = take_requests()
+        if actions:
+            return actions
+        remaining = (deadline - datetime.now()).total_seconds()
+        if remaining <= 0:
+            return []
+        time.sleep(min(REQUEST_POLL_SECONDS, remaining))
+
+def wait_for_request(seconds: float) -> bool:
+    # Like wait_for_trigger, but leaves requests queued for the scheduler loop; True as soon as one is pending
+    deadline = time.monotonic() + seconds
+    while not request_files():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(REQUEST_POLL_SECONDS, remaining))
+    return True
+
+_scan_status: Optional[ScanStatus] = None
+_scan_status_lock = threading.Lock()
+
+def get_scan_status() -> ScanStatus:
+    global _scan_status
+    with _scan_status_lock:
+        if _scan_status is None:
+            _scan_status = ScanStatus()
+        return _scan_status
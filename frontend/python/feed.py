@@ -0,0 +1,140 @@
+import os
+import json
+import fcntl
+import bisect
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+from python.common import DATA_DIR, get_env_int
+
+logger = logging.getLogger(__name__)
+
+FEED_PATH: str = os.path.join(DATA_DIR, "feed.jsonl")
+FEED_MAX_ENTRIES: int = 10000
+COMPACT_EVERY: int = 500
+TAIL_BYTES: int = 64 * 1024
+ARTIST_FIELDS: List[str] = ['name', 'color', 'cover', 'backdrop', 'cover_thumbnails', 'backdrop_thumbnails']
+
+def artist_changes(previous: List[Dict[str, Any]], current: List[Dict[str, Any]]) -> Dict[str, Any]:
+    before = {artist['name']: {field: artist.get(field) for field in ARTIST_FIELDS} for artist in previous}
+    after = {artist['name']: {field: artist.get(field) for field in ARTIST_FIELDS} for artist in current}
+    return {
+        'added': [after[name] for name in after if name not in before],
+        'updated': [after[name] for name in after if name in before and before[name] != after[name]],
+        'removed': [name for name in before if name not in after]
+    }
+
+class ReleaseFeed:
+    def __init__(self, feed_path: str = FEED_PATH):
+        self.feed_path: str = feed_path
+        self.max_entries: int = get_env_int('FEED_MAX_ENTRIES', FEED_MAX_ENTRIES)
+        # Reader state: entries parsed so far and where the file was last read up to
+        self.entries: List[Dict[str, Any]] = []
+        self.cursors: List[int] = []
+        self.inode: Optional[int] = None
+        self.offset: int = 0
+        self.lock = threading.Lock()
+
+    def last_cursor(self, f) -> int:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(0, size - TAIL_BYTES))
+        for line in reversed(f.read().splitlines()):
+            try:
+                return json.loads(line)['cursor']
+            except (ValueError, KeyError, TypeError):
+                continue
+        return 0
+
+    def append(self, kind: str, data: Dict[str, Any]) -> Optional[int]:
+        # Any process may append; the file lock keeps cursors unique and in order
+        try:
+            os.makedirs(os.path.dirname(self.feed_path), exist_ok=True)
+            while True:
+                f = open(self.feed_path, 'a+b')
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                # Compaction swaps the file out; start over if we locked the old one
+                try:
+                    if os.fstat(f.fileno()).st_ino == os.stat(self.feed_path).st_ino:
+                        break
+                except FileNotFoundError:
+                    pass
+                f.close()
+
+            with f:
+                cursor = self.last_cursor(f) + 1
+                entry = {'cursor': cursor, 'type': kind, 'at': datetime.now().isoformat(), 'data': data}
+                f.write((json.dumps(entry, separators=(',', ':')) + '\n').encode('utf-8'))
+                f.flush()
+                if cursor % COMPACT_EVERY == 0:
+                    self.compact()
+            return cursor
+        except Exception as e:
+            logger.error(f"Failed to append {kind} to the feed: {str(e)}")
+            return None
+
+    def compact(self) -> None:
+        # Called with the feed locked
+        with open(self.feed_path, 'rb') as f:
+            lines = f.read().splitlines()
+        if len(lines) <= self.max_entries:
+            return
+        temp_path = f"{self.feed_path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(b'\n'.join(lines[-self.max_entries:]) + b'\n')
+        os.replace(temp_path, self.feed_path)
+        logger.info(f"Compacted the feed to its last {self.max_entries} entries")
+
+    def refresh(self) -> None:
+        # Reads only what was appended since the last call, unless the file was replaced
+        try:
+            stat = os.stat(self.feed_path)
+        except FileNotFoundError:
+            self.entries, self.cursors, self.inode, self.offset = [], [], None, 0
+            return
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            self.entries, self.cursors, self.inode, self.offset = [], [], stat.st_ino, 0
+        if stat.st_size == self.offset:
+            return
+
+        with open(self.feed_path, 'rb') as f:
+            f.seek(self.offset)
+            chunk = f.read(stat.st_size - self.offset)
+        # A line still being written has no newline yet; pick it up next time
+        complete = chunk[:chunk.rfind(b'\n') + 1]
+        self.offset += len(complete)
+        for line in complete.splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if self.cursors and entry['cursor'] <= self.cursors[-1]:
+                continue
+            self.entries.append(entry)
+            self.cursors.append(entry['cursor'])
+        if len(self.entries) > self.max_entries:
+            self.entries = self.entries[-self.max_entries:]
+            self.cursors = self.cursors[-self.max_entries:]
+
+    def since(self, cursor: int, limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int, bool]:
+        # Returns (entries after cursor, latest cursor, whether the client has to start over)
+        with self.lock:
+            self.refresh()
+            latest = self.cursors[-1] if self.cursors else 0
+            # Entries before the oldest one kept were compacted away, and a cursor ahead of
+            # the feed means it was recreated
+            reset = cursor > latest or (bool(self.cursors) and cursor < self.cursors[0] - 1)
+            start = 0 if reset else bisect.bisect_right(self.cursors, cursor)
+            end = len(self.entries) if limit is None else start + limit
+            return self.entries[start:end], latest, reset
+
+_feed: Optional[ReleaseFeed] = None
+_feed_lock = threading.Lock()
+
+def get_feed() -> ReleaseFeed:
+    global _feed
+    with _feed_lock:
+        if _feed is None:
+            _feed = ReleaseFeed()
+        return _feed
@@ -0,0 +1,108 @@
+import time
+import logging
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from python.common import get_env_float
+from python.metrics import get_metrics
+from python.tracing import span
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT: str = "Trackly/1.0.0 ( https://github.com/7eventy7/trackly )"
+CONNECT_TIMEOUT: float = 5.0
+READ_TIMEOUT: float = 30.0
+DEFAULT_TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+MUSICBRAINZ_RATE_LIMIT: float = 1.0
+MAX_FAILURE_BACKOFF: float = 30.0
+POOL_SIZE: int = 4
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+def get_session(url: str) -> requests.Session:
+    parts = urlsplit(url)
+    host = f"{parts.scheme}://{parts.netloc}"
+    with _sessions_lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+            session.mount(f"{parts.scheme}://", adapter)
+            session.headers.update({
+                'User-Agent': USER_AGENT,
+                'Accept-Encoding': 'gzip, deflate'
+            })
+            _sessions[host] = session
+        return session
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+class RateLimiter:
+    def __init__(self, rate: float = MUSICBRAINZ_RATE_LIMIT, capacity: float = 1.0, name: str = 'default'):
+        self.name: str = name
+        self.rate: float = rate
+        self.capacity: float = capacity
+        self.tokens: float = capacity
+        self.updated: float = time.monotonic()
+        self.consecutive_failures: int = 0
+        self.sleep_seconds: float = 0.0
+        self.requests: int = 0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait(self) -> float:
+        # Reserve a token under the lock; a negative balance is the queue of callers ahead of us
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            delay = max(0.0, -self.tokens / self.rate)
+            self.requests += 1
+            self.sleep_seconds += delay
+        metrics = get_metrics()
+        metrics.inc('trackly_rate_limiter_requests_total', limiter=self.name)
+        if delay > 0:
+            metrics.inc('trackly_rate_limiter_blocked_seconds_total', delay, limiter=self.name)
+            with span('rate_limiter.wait', 'sleep', limiter=self.name):
+                time.sleep(delay)
+        return delay
+
+    def pause(self, seconds: float) -> None:
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+    def success(self) -> None:
+        self.consecutive_failures = 0
+
+    def failure(self, retry_after: Optional[float] = None) -> None:
+        self.consecutive_failures += 1
+        if retry_after is None:
+            retry_after = min(2 ** self.consecutive_failures, MAX_FAILURE_BACKOFF)
+        self.pause(retry_after)
+
+_musicbrainz_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+def get_musicbrainz_limiter() -> RateLimiter:
+    global _musicbrainz_limiter
+    with _limiter_lock:
+        if _musicbrainz_limiter is None:
+            rate = get_env_float('MUSICBRAINZ_RATE_LIMIT', MUSICBRAINZ_RATE_LIMIT)
+            if rate <= 0:
+                logger.warning(f"Invalid MUSICBRAINZ_RATE_LIMIT {rate}, using {MUSICBRAINZ_RATE_LIMIT}")
+                rate = MUSICBRAINZ_RATE_LIMIT
+            _musicbrainz_limiter = RateLimiter(rate, name='musicbrainz')
+        return _musicbrainz_limiter
@@ -0,0 +1,101 @@
+import gzip
+import json
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional, Any, Tuple
+from python.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+MAX_CACHED_RESPONSES: int = 64
+GZIP_LEVEL: int = 6
+
+class LibraryIndex:
+    def __init__(self):
+        self.version: Optional[str] = None
+        self.last_updated: Optional[str] = None
+        self.artists: List[Dict[str, Any]] = []
+        self.years: List[int] = []
+        # (year, offset, limit) -> (etag, body, gzipped body)
+        self.responses: Dict[Tuple[Optional[int], int, Optional[int]], Tuple[str, bytes, bytes]] = {}
+        self.lock = threading.Lock()
+
+    def refresh(self) -> None:
+        storage = get_storage()
+        version = storage.state_version()
+        if version == self.version:
+            return
+
+        data = storage.load_artists() or {}
+        years = storage.notified_years()
+        releases_by_artist: Dict[str, Dict[str, Dict[str, str]]] = {}
+        for year in years:
+            for album in storage.load_notified(year):
+                artist_releases = releases_by_artist.setdefault(album.get('artist'), {})
+                artist_releases.setdefault(album.get('album'), {
+                    'title': album.get('album'),
+                    'releaseDate': album.get('release_date') or ''
+                })
+
+        artists = []
+        for artist in data.get('artists', []):
+            releases = sorted(releases_by_artist.get(artist['name'], {}).values(),
+                              key=lambda release: release['releaseDate'], reverse=True)
+            artists.append({
+                'name': artist['name'],
+                'color': artist.get('color'),
+                'cover': artist.get('cover'),
+                'backdrop': artist.get('backdrop'),
+                'cover_thumbnails': artist.get('cover_thumbnails', []),
+                'backdrop_thumbnails': artist.get('backdrop_thumbnails', []),
+                'releases': releases
+            })
+
+        self.artists = artists
+        self.years = years
+        self.last_updated = data.get('last_updated')
+        self.responses = {}
+        self.version = version
+        logger.info(f"Rebuilt library index with {len(artists)} artists and {sum(len(a['releases']) for a in artists)} releases")
+
+    def render(self, year: Optional[int] = None, offset: int = 0, limit: Optional[int] = None) -> Tuple[str, bytes, bytes]:
+        with self.lock:
+            self.refresh()
+            key = (year, offset, limit)
+            cached = self.responses.get(key)
+            if cached is not None:
+                return cached
+
+            artists = self.artists
+            if year is not None:
+                prefix = str(year)
+                artists = [
+                    {**artist, 'releases': [r for r in artist['releases'] if r['releaseDate'].startswith(prefix)]}
+                    for artist in artists
+                ]
+            page = artists[offset:offset + limit] if limit is not None else artists[offset:]
+            body = json.dumps({
+                'artists': page,
+                'total': len(artists),
+                'offset': offset,
+                'years': self.years,
+                'last_updated': self.last_updated
+            }, separators=(',', ':')).encode('utf-8')
+            etag = '"' + hashlib.sha1(f"{self.version}|{key}".encode('utf-8')).hexdigest()[:20] + '"'
+            rendered = (etag, body, gzip.compress(body, GZIP_LEVEL))
+
+            if len(self.responses) >= MAX_CACHED_RESPONSES:
+                self.responses.pop(next(iter(self.responses)))
+            self.responses[key] = rendered
+            return rendered
+
+_library_index: Optional[LibraryIndex] = None
+_library_lock = threading.Lock()
+
+def get_library_index() -> LibraryIndex:
+    global _library_index
+    with _library_lock:
+        if _library_index is None:
+            _library_index = LibraryIndex()
+        return _library_index
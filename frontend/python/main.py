@@ -1,43 +1,60 @@
 import os
-import json
+import math
 import time
 from datetime import datetime
 import requests
 from dotenv import load_dotenv
 import logging
-import random
-import colorsys
-import glob
-from typing import Dict, List, Optional, Any, Tuple
+import threading
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from pathlib import Path
 from croniter import croniter, CroniterNotAlphaError, CroniterBadCronError
+from python.common import DATA_DIR, MUSIC_DIR, get_env_bool, get_env_float, get_env_int
+from python.activity import get_artist_activity
+from python.checkpoint import ScanCheckpoint, artist_key, get_scan_checkpoint
+from python.control import get_scan_status, wait_for_request, wait_for_trigger
+from python.album_index import get_album_index
+from python.artist_cache import ArtistIdCache, normalize_artist_name
+from python.scanner import LibraryScan, manifest_scanned_at, rescan_artists, scan_library, save_manifest
+from python.notified_store import get_notified_store
+from python.http_client import DEFAULT_TIMEOUT, RateLimiter, get_musicbrainz_limiter, get_session, parse_retry_after
+from python.offline_index import OfflineIndex, get_offline_index
+from python.outbox import get_outbox
+from python.metrics import get_metrics
+from python.response_cache import endpoint_name, get_response_cache
+from python.pipeline import Stage
+from python.feed import artist_changes, get_feed
+from python.jellyfin import get_jellyfin_client
+from python.tracing import finish_trace, span, start_trace
+from python.watcher import library_watch_mode, start_library_watcher
+from python.thumbnails import get_thumbnailer
+from python.palette import get_palette, name_color
+from python.storage import get_storage
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
 logger = logging.getLogger(__name__)
 
-DATA_DIR = "/data"
-MUSIC_DIR = "/music"
-ARTISTS_FILE_PATH: str = os.path.join(DATA_DIR, "artists.json")
-STARTUP_FILE_PATH: str = os.path.join(DATA_DIR, "startup.json")
-MUSICBRAINZ_BASE_URL: str = "https://musicbrainz.org/ws/2"
-USER_AGENT: str = "Trackly/1.0.0 ( https://github.com/7eventy7/trackly )"
-FILE_CHECK_INTERVAL: int = 480
+MUSICBRAINZ_BASE_URL: str = os.getenv('MUSICBRAINZ_BASE_URL', "https://musicbrainz.org/ws/2")
 MAX_RETRIES: int = 3
 STALE_FILE_DAYS: int = 7
+# Full refreshes and watcher updates both rewrite the artist store
+artist_update_lock = threading.RLock()
+_refresh_thread: Optional[threading.Thread] = None
+_refresh_lock = threading.Lock()
+ARTIST_BATCH_SIZE: int = 25
+ARTIST_SEARCH_LIMIT: int = 100
+RELEASE_BATCH_SIZE: int = 40
+RELEASE_SEARCH_LIMIT: int = 100
+RELEASE_BROWSE_LIMIT: int = 100
+ACTIVITY_PROBES_PER_TICK: int = 100
+SCAN_SPREAD_FRACTION: float = 0.5
 
-def get_notified_file_path(year: Optional[int] = None) -> str:
-    target_year = year if year is not None else datetime.now().year
-    return os.path.join(DATA_DIR, f"notified_{target_year}.json")
+ReleaseSink = Callable[[List[Dict[str, Any]], List[Dict[str, Any]]], None]
 
 def ensure_notified_file(year: Optional[int] = None) -> None:
-    file_path = get_notified_file_path(year)
-    if not os.path.exists(file_path):
-        logger.info(f"Creating new notified file for year {year or datetime.now().year}")
-        safe_write_json(file_path, {'notified_albums': []})
+    target_year = year if year is not None else datetime.now().year
+    if not get_storage().has_notified(target_year):
+        logger.info(f"Creating new notified file for year {target_year}")
+        get_notified_store(target_year).compact()
 
 def check_year_change() -> None:
     current_year = datetime.now().year
@@ -88,11 +105,11 @@ def load_config() -> Tuple[str, str, str, Optional[str], bool]:
     )
 
 def is_first_startup() -> bool:
-    startup_data = safe_read_json(STARTUP_FILE_PATH)
+    startup_data = get_storage().load_startup()
     return startup_data is None or not startup_data.get('initial_startup_complete', False)
 
 def mark_startup_complete() -> None:
-    safe_write_json(STARTUP_FILE_PATH, {
+    get_storage().save_startup({
         'initial_startup_complete': True,
         'first_startup_time': datetime.now().isoformat()
     })
@@ -117,121 +134,87 @@ def send_startup_notification(webhook_url: str, discord_role: Optional[str]) ->
     }
     
     try:
-        response = requests.post(webhook_url, json=payload)
+        response = get_session(webhook_url).post(webhook_url, json=payload, timeout=DEFAULT_TIMEOUT)
         response.raise_for_status()
         logger.info("Startup notification sent successfully")
     except requests.exceptions.RequestException as e:
         logger.error(f"Failed to send startup notification: {str(e)}")
 
-def safe_read_json(file_path: str) -> Optional[Dict[str, Any]]:
-    try:
-        if not os.path.exists(file_path):
-            logger.info(f"File not found: {file_path}")
-            return None
-
-        with open(file_path, 'r') as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
-        logger.error(f"Invalid JSON in {file_path}: {str(e)}")
-        return None
-    except Exception as e:
-        logger.error(f"Error reading {file_path}: {str(e)}")
-        return None
-
-def safe_write_json(file_path: str, data: Dict[str, Any]) -> bool:
-    try:
-        temp_path = f"{file_path}.tmp"
-        with open(temp_path, 'w') as f:
-            json.dump(data, f, indent=2)
-
-        with open(temp_path, 'r') as f:
-            json.load(f)
-
-        os.replace(temp_path, file_path)
-        logger.info(f"Successfully wrote to {file_path}")
-        return True
-    except Exception as e:
-        logger.error(f"Failed to write to {file_path}: {str(e)}")
-        if os.path.exists(temp_path):
-            try:
-                os.remove(temp_path)
-            except:
-                pass
-        return False
-
 def artists_file_exists() -> bool:
-    return os.path.exists(ARTISTS_FILE_PATH)
-
-class RateLimiter:
-    def __init__(self, min_delay: float = 1.0, max_delay: float = 2.0):
-        self.min_delay: float = min_delay
-        self.max_delay: float = max_delay
-        self.last_request_time: float = 0
-        self.consecutive_failures: int = 0
-        self.requests_this_second: int = 0
-        self.last_second: int = 0
-
-    def wait(self) -> None:
-        current_time = time.time()
-        current_second = int(current_time)
-
-        if current_second != self.last_second:
-            self.requests_this_second = 0
-            self.last_second = current_second
-
-        if self.requests_this_second >= 50:
-            sleep_time = 1.0 - (current_time - current_second)
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-            self.requests_this_second = 0
-            self.last_second = int(time.time())
-
-        delay = self.min_delay + random.random() * (self.max_delay - self.min_delay)
-        
-        if self.consecutive_failures > 0:
-            delay *= (2 ** self.consecutive_failures)
-            delay = min(delay, 30)
-        
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < delay:
-            time.sleep(delay - time_since_last)
-        
-        self.last_request_time = time.time()
-        self.requests_this_second += 1
-
-    def success(self) -> None:
-        self.consecutive_failures = 0
-
-    def failure(self) -> None:
-        self.consecutive_failures += 1
+    return get_storage().has_artists()
 
 def make_musicbrainz_request(url: str, params: Dict[str, Any], rate_limiter: RateLimiter) -> Optional[Dict[str, Any]]:
+    cache = get_response_cache()
+    cached_entry = None
+    if cache is not None:
+        cached_entry, fresh = cache.lookup(url, params)
+        if fresh:
+            return cached_entry['body']
+
     headers = {
-        'User-Agent': USER_AGENT,
         'Accept': 'application/json'
     }
+    if cache is not None:
+        headers.update(cache.conditional_headers(cached_entry))
+    session = get_session(url)
+    metrics = get_metrics()
+    endpoint = endpoint_name(url)
     
     for attempt in range(MAX_RETRIES):
         rate_limiter.wait()
+        started = time.perf_counter()
         try:
-            response = requests.get(url, params=params, headers=headers)
+            with span('musicbrainz', 'network', endpoint=endpoint) as request_span:
+                response = session.get(url, params=params, headers=headers, timeout=DEFAULT_TIMEOUT)
+                request_span.set(status=response.status_code, bytes=len(response.content))
+            metrics.observe('trackly_musicbrainz_request_duration_seconds', time.perf_counter() - started, endpoint=endpoint)
+            metrics.inc('trackly_musicbrainz_responses_total', endpoint=endpoint, status=response.status_code)
+
+            if response.status_code == 304 and cached_entry is not None:
+                rate_limiter.success()
+                return cache.revalidated(url, params, cached_entry)
             
-            if response.status_code == 503:
-                logger.warning("Rate limited by MusicBrainz API, backing off...")
-                rate_limiter.failure()
+            if response.status_code in (429, 503):
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                logger.warning(f"Rate limited by MusicBrainz API, backing off{f' for {retry_after}s' if retry_after else ''}...")
+                rate_limiter.failure(retry_after)
                 continue
-                
+
+            if 400 <= response.status_code < 500:
+                # Bad queries and missing entities fail the same way every time; retrying only slows the limiter
+                rate_limiter.success()
+                response.raise_for_status()
+
             response.raise_for_status()
             rate_limiter.success()
-            return response.json()
+            data = response.json()
+            if cache is not None:
+                cache.store(url, params, data, response.headers)
+            return data
         except requests.exceptions.RequestException as e:
+            if isinstance(e, requests.exceptions.HTTPError) and e.response is not None and 400 <= e.response.status_code < 500:
+                raise
+            if not isinstance(e, requests.exceptions.HTTPError):
+                metrics.inc('trackly_musicbrainz_responses_total', endpoint=endpoint, status='error')
             rate_limiter.failure()
             logger.warning(f"Request failed (attempt {attempt + 1}/{MAX_RETRIES}): {str(e)}")
             if attempt == MAX_RETRIES - 1:
                 raise
     return None
 
-def get_artist_id(artist_name: str, rate_limiter: RateLimiter) -> Optional[str]:
+def get_artist_id(artist_name: str, rate_limiter: RateLimiter, id_cache: Optional[ArtistIdCache] = None) -> Optional[str]:
+    if id_cache is not None:
+        cached, artist_id = id_cache.lookup(artist_name)
+        if cached:
+            return artist_id
+
+    offline_index = get_offline_index()
+    if offline_index is not None:
+        artist_id = offline_index.lookup_artist_id(artist_name)
+        if id_cache is not None:
+            id_cache.store(artist_name, artist_id)
+        return artist_id
+
     url = f"{MUSICBRAINZ_BASE_URL}/artist"
     params = {
         'query': artist_name,
@@ -241,80 +224,257 @@ def get_artist_id(artist_name: str, rate_limiter: RateLimiter) -> Optional[str]:
     
     try:
         data = make_musicbrainz_request(url, params, rate_limiter)
-        if data and data.get('artists'):
-            return data['artists'][0]['id']
-        return None
+        if data is None:
+            return None
+
+        artist_id = data['artists'][0]['id'] if data.get('artists') else None
+        if id_cache is not None:
+            id_cache.store(artist_name, artist_id)
+        return artist_id
     except Exception as e:
         logger.error(f"Error getting MusicBrainz ID for {artist_name}: {str(e)}")
         return None
 
-def generate_vibrant_color() -> int:
-    hue = random.random()
-    saturation = random.uniform(0.7, 1.0)
-    value = random.uniform(0.8, 1.0)
-    rgb = colorsys.hsv_to_rgb(hue, saturation, value)
-    return int(rgb[0] * 255) << 16 | int(rgb[1] * 255) << 8 | int(rgb[2] * 255)
-
-def find_image(artist_path: str, base_name: str, extensions: List[str]) -> Optional[str]:
-    for ext in extensions:
-        for case in [ext.lower(), ext.upper()]:
-            path = os.path.join(artist_path, f'{base_name}{case}')
-            if os.path.exists(path):
-                return path
-    return None
+def quote_lucene_phrase(value: str) -> str:
+    escaped = value.replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{escaped}"'
+
+def match_artist_results(artist_names: List[str], results: List[Dict[str, Any]]) -> Dict[str, str]:
+    by_name: Dict[str, set] = {}
+    by_alias: Dict[str, set] = {}
+    for result in results:
+        by_name.setdefault(normalize_artist_name(result.get('name', '')), set()).add(result['id'])
+        for alias in result.get('aliases') or []:
+            by_alias.setdefault(normalize_artist_name(alias.get('name', '')), set()).add(result['id'])
+
+    matches = {}
+    for artist_name in artist_names:
+        key = normalize_artist_name(artist_name)
+        candidates = by_name.get(key) or by_alias.get(key) or set()
+        # Several distinct artists share this name; leave it to the single-name lookup
+        if len(candidates) == 1:
+            matches[artist_name] = next(iter(candidates))
+    return matches
+
+def get_artist_ids_bulk(
+    artist_names: List[str],
+    rate_limiter: RateLimiter,
+    id_cache: Optional[ArtistIdCache] = None
+) -> Dict[str, Optional[str]]:
+    resolved: Dict[str, Optional[str]] = {}
+    pending = []
+    for artist_name in artist_names:
+        if id_cache is not None:
+            cached, artist_id = id_cache.lookup(artist_name)
+            if cached:
+                resolved[artist_name] = artist_id
+                continue
+        pending.append(artist_name)
+
+    if get_offline_index() is not None:
+        for artist_name in pending:
+            resolved[artist_name] = get_artist_id(artist_name, rate_limiter, id_cache)
+        return resolved
+
+    batch_size = get_env_int('ARTIST_BATCH_SIZE', ARTIST_BATCH_SIZE)
+    url = f"{MUSICBRAINZ_BASE_URL}/artist"
+    unmatched = []
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+        params = {
+            'query': ' OR '.join(f"artist:{quote_lucene_phrase(name)}" for name in batch),
+            'limit': ARTIST_SEARCH_LIMIT,
+            'fmt': 'json'
+        }
+        try:
+            data = make_musicbrainz_request(url, params, rate_limiter)
+        except Exception as e:
+            logger.error(f"Error resolving MusicBrainz IDs for batch of {len(batch)} artists: {str(e)}")
+            data = None
+
+        matches = match_artist_results(batch, data.get('artists', [])) if data else {}
+        for artist_name in batch:
+            if artist_name in matches:
+                resolved[artist_name] = matches[artist_name]
+                if id_cache is not None:
+                    id_cache.store(artist_name, matches[artist_name])
+            else:
+                unmatched.append(artist_name)
+
+    if pending:
+        logger.info(f"Bulk resolved {len(pending) - len(unmatched)}/{len(pending)} artists, "
+                    f"falling back to single lookups for {len(unmatched)}")
+    for artist_name in unmatched:
+        resolved[artist_name] = get_artist_id(artist_name, rate_limiter, id_cache)
+    return resolved
+
+def update_artist_images(artists: List[Dict[str, Any]]) -> None:
+    thumbnailer = get_thumbnailer()
+    if thumbnailer is not None:
+        try:
+            thumbnailer.update(artists)
+        except Exception as e:
+            logger.warning(f"Failed to update artist thumbnails: {str(e)}")
+    # Colors come from the artwork, so an unchanged library always gets the same ones
+    palette = get_palette()
+    if palette is not None:
+        try:
+            palette.update(artists)
+        except Exception as e:
+            logger.warning(f"Failed to update artist colors: {str(e)}")
+
+def record_artist_changes(previous: List[Dict[str, Any]], artists: List[Dict[str, Any]]) -> None:
+    changes = artist_changes(previous, artists)
+    if changes['added'] or changes['updated'] or changes['removed']:
+        get_feed().append('artists', changes)
 
 def update_artist_list() -> bool:
-    logger.info("Updating artist list...")
-    rate_limiter = RateLimiter()
+    with artist_update_lock:
+        logger.info("Updating artist list...")
+        rate_limiter = get_musicbrainz_limiter()
+        id_cache = ArtistIdCache()
+        id_cache.load()
+        update_started = time.monotonic()
 
-    try:
-        artists = []
-        image_extensions = ['.png', '.jpg', '.jpeg', '.webp']  # Supported image formats
-        for artist_name in [d for d in os.listdir(MUSIC_DIR) 
-                          if os.path.isdir(os.path.join(MUSIC_DIR, d))]:
-            artist_path = os.path.join(MUSIC_DIR, artist_name)
-            backdrop = None
-            cover = None
-            # Check for backdrop with pattern backdrop*.{ext}
-            for ext in image_extensions:
-                backdrop_matches = glob.glob(os.path.join(artist_path, f'backdrop*{ext}'))
-                if backdrop_matches:
-                    backdrop = backdrop_matches[0]  # Use the first match
-                    break
-            # Check for cover, prioritizing 'cover' but falling back to 'folder'
-            for ext in image_extensions:
-                cover_path = os.path.join(artist_path, f'cover{ext}')
-                folder_path = os.path.join(artist_path, f'folder{ext}')
-                if cover is None and os.path.exists(cover_path):
-                    cover = cover_path
-                elif cover is None and os.path.exists(folder_path):
-                    cover = folder_path
-            # Include artist regardless of images
-            artist_id = get_artist_id(artist_name, rate_limiter)
-            artists.append({
-                'name': artist_name,
-                'id': artist_id,
-                'color': generate_vibrant_color(),
-                'backdrop': backdrop,
-                'cover': cover
-            })
-            if not artist_id:
-                logger.warning(f"Could not find MusicBrainz ID for {artist_name}")
-            if not backdrop or not cover:
-                logger.info(f"Including {artist_name} with missing images: backdrop={backdrop}, cover={cover}")
-
-        logger.info(f"Found {len(artists)} artists in music directory")
+        try:
+            jellyfin = get_jellyfin_client()
+            scan = jellyfin.scan() if jellyfin is not None else scan_library()
+            previous_data = get_storage().load_artists() if artists_file_exists() else None
+            previous_ids = {
+                artist['name']: artist.get('id')
+                for artist in (previous_data or {}).get('artists', [])
+            }
+            # Previous IDs are only reused for artists the ID cache knows nothing about
+            artist_ids = {name: previous_ids[name] for name in scan.existing
+                          if previous_ids.get(name) and not id_cache.has_entry(name)}
+            # Jellyfin reads MBIDs from file tags; only overrides take precedence over them
+            artist_ids.update({name: entry['mbid'] for name, entry in scan.artists.items()
+                               if entry.get('mbid') and not id_cache.has_override(name)})
+            unresolved = [name for name in scan.artists if name not in artist_ids]
+            artist_ids.update(get_artist_ids_bulk(unresolved, rate_limiter, id_cache))
+
+            artists = []
+            for artist_name in sorted(scan.artists):
+                # Include artist regardless of images
+                artist_id = artist_ids.get(artist_name)
+                backdrop = scan.artists[artist_name].get('backdrop')
+                cover = scan.artists[artist_name].get('cover')
+                artist = {
+                    'name': artist_name,
+                    'id': artist_id,
+                    'color': name_color(artist_name),
+                    'backdrop': backdrop,
+                    'cover': cover
+                }
+                # Jellyfin serves its own resized images
+                for key in ('cover_thumbnails', 'backdrop_thumbnails'):
+                    if scan.artists[artist_name].get(key):
+                        artist[key] = scan.artists[artist_name][key]
+                artists.append(artist)
+                if not artist_id:
+                    logger.warning(f"Could not find MusicBrainz ID for {artist_name}")
+                if not backdrop or not cover:
+                    logger.info(f"Including {artist_name} with missing images: backdrop={backdrop}, cover={cover}")
+
+            update_artist_images(artists)
+
+            logger.info(f"Found {len(artists)} artists in music directory")
+            logger.info(f"Artist IDs: {id_cache.hits} from cache, {id_cache.resolved} resolved from MusicBrainz")
+            id_cache.save()
         
-        return safe_write_json(ARTISTS_FILE_PATH, {
-            'artists': artists,
-            'last_updated': datetime.now().isoformat()
-        })
-    except Exception as e:
-        logger.error(f"Error updating artist list: {str(e)}")
-        return False
+            # An unchanged library leaves artists.json byte-identical; the manifest records the refresh
+            if artists == (previous_data or {}).get('artists'):
+                logger.info("Artist list is unchanged")
+            elif not get_storage().save_artists(artists, datetime.now().isoformat()):
+                return False
+            record_artist_changes((previous_data or {}).get('artists', []), artists)
+            save_manifest(scan.artists)
+            get_metrics().observe('trackly_artist_update_duration_seconds', time.monotonic() - update_started)
+            return True
+        except Exception as e:
+            logger.error(f"Error updating artist list: {str(e)}")
+            id_cache.save()
+            return False
+
+def apply_library_scan(scan: LibraryScan) -> bool:
+    # Applies only what changed in the library, keeping every other artist's ID and color
+    with artist_update_lock:
+        data = get_storage().load_artists()
+        if not data or not isinstance(data.get('artists'), list):
+            return update_artist_list()
+
+        try:
+            artists_by_name = {artist['name']: dict(artist) for artist in data['artists']}
+            removed = [name for name in artists_by_name if name not in scan.artists]
+            for old_name, new_name in scan.renamed:
+                artist = artists_by_name.pop(old_name, None)
+                if artist is not None and old_name in removed:
+                    removed.remove(old_name)
+                # The folder name is what MusicBrainz is searched with, so look the ID up again
+                artists_by_name[new_name] = {**(artist or {}), 'name': new_name, 'id': None}
+            for name in removed:
+                artists_by_name.pop(name, None)
+
+            changed = set(scan.updated) | set(scan.changed_names())
+            touched = [name for name in scan.artists if name not in artists_by_name or name in changed]
+
+            id_cache = ArtistIdCache()
+            id_cache.load()
+            # The ID cache decides for every artist it knows, so override edits and expired IDs
+            # apply to unchanged folders too; stored IDs only stand in for artists it has never seen
+            unresolved = [name for name in scan.artists if id_cache.has_entry(name)
+                          or (name in touched and not artists_by_name.get(name, {}).get('id'))]
+            artist_ids = get_artist_ids_bulk(unresolved, get_musicbrainz_limiter(), id_cache) if unresolved else {}
+            id_cache.save()
+            relinked = [name for name, artist_id in artist_ids.items()
+                        if name in artists_by_name and name not in touched and artists_by_name[name].get('id') != artist_id]
+            if not touched and not relinked and not removed and not scan.renamed:
+                return True
+
+            for name in relinked:
+                artists_by_name[name]['id'] = artist_ids[name]
+            for name in touched:
+                artist = artists_by_name.setdefault(name, {'name': name, 'id': None, 'color': name_color(name)})
+                artist['id'] = artist_ids[name] if name in artist_ids else artist.get('id')
+                artist['backdrop'] = scan.artists[name].get('backdrop')
+                artist['cover'] = scan.artists[name].get('cover')
+                if not artist['id']:
+                    logger.warning(f"Could not find MusicBrainz ID for {name}")
 
-def is_valid_artists_file() -> bool:
-    data = safe_read_json(ARTISTS_FILE_PATH)
+            artists = [artists_by_name[name] for name in sorted(artists_by_name)]
+            update_artist_images(artists)
+
+            if not get_storage().save_artists(artists, datetime.now().isoformat()):
+                return False
+            record_artist_changes(data['artists'], artists)
+            save_manifest(scan.artists)
+            logger.info(f"Applied library changes: {len(touched)} artists added or updated, "
+                        f"{len(removed)} removed, {len(scan.renamed)} renamed, {len(relinked)} IDs changed")
+            return True
+        except Exception as e:
+            logger.error(f"Error applying library changes: {str(e)}")
+            return False
+
+def apply_library_changes(names: Optional[List[str]]) -> None:
+    # None means the watcher lost track of events and the whole library needs a look
+    apply_library_scan(scan_library() if names is None else rescan_artists(names))
+
+def watching_library() -> bool:
+    # With Jellyfin discovery the music directory is not walked, so there is nothing to watch
+    return library_watch_mode() != 'off' and get_jellyfin_client() is None
+
+def last_refreshed(data: Dict[str, Any]) -> datetime:
+    # last_updated only moves when the artists change, so an unchanged refresh is found in the manifest
+    last_updated = datetime.fromisoformat(data['last_updated'])
+    scanned_at = manifest_scanned_at()
+    return max(last_updated, scanned_at) if scanned_at else last_updated
+
+def is_stale(last_updated: datetime) -> bool:
+    # The library watcher keeps artists.json current, so it never goes stale
+    return not watching_library() and (datetime.now() - last_updated).days > STALE_FILE_DAYS
+
+def is_valid_artists_file(allow_stale: bool = False) -> bool:
+    data = get_storage().load_artists()
     if not data:
         return False
 
@@ -329,8 +489,8 @@ def is_valid_artists_file() -> bool:
             return False
             
         try:
-            last_updated = datetime.fromisoformat(data['last_updated'])
-            if (datetime.now() - last_updated).days > STALE_FILE_DAYS:
+            last_updated = last_refreshed(data)
+            if not allow_stale and is_stale(last_updated):
                 logger.info(f"artists.json is stale (>{STALE_FILE_DAYS} days old)")
                 return False
         except ValueError:
@@ -343,6 +503,29 @@ def is_valid_artists_file() -> bool:
         logger.error(f"Error validating artists.json: {str(e)}")
         return False
 
+def is_stale_artists_file() -> bool:
+    data = get_storage().load_artists()
+    try:
+        return is_stale(last_refreshed(data))
+    except (TypeError, KeyError, ValueError):
+        return False
+
+def run_background_refresh() -> None:
+    logger.info("Refreshing the stale artist list in the background; scans continue with the current list")
+    if update_artist_list():
+        logger.info("Background artist list refresh complete")
+    else:
+        logger.error("Background artist list refresh failed; keeping the current list until the next scan retries")
+
+def start_background_refresh() -> bool:
+    global _refresh_thread
+    with _refresh_lock:
+        if _refresh_thread is not None and _refresh_thread.is_alive():
+            return False
+        _refresh_thread = threading.Thread(target=run_background_refresh, name='artist-refresh', daemon=True)
+        _refresh_thread.start()
+        return True
+
 def format_release_date(date_str: str) -> str:
     try:
         date_obj = datetime.strptime(date_str, '%Y-%m-%d')
@@ -352,41 +535,36 @@ def format_release_date(date_str: str) -> str:
 
 def is_album_notified(artist: str, album: str) -> bool:
     try:
-        release_year = datetime.now().year
-        notified_file = get_notified_file_path(release_year)
-        ensure_notified_file(release_year)
-        
-        data = safe_read_json(notified_file)
-        if not data:
-            return False
-        
-        return any(n['artist'] == artist and n['album'] == album 
-                  for n in data.get('notified_albums', []))
+        return get_notified_store(datetime.now().year).contains(artist, album)
     except Exception as e:
         logger.error(f"Error checking notified album: {str(e)}")
         return False
 
 def add_notified_album(artist: str, album: str, release_date: str) -> bool:
     try:
-        release_year = datetime.now().year
-        notified_file = get_notified_file_path(release_year)
-        ensure_notified_file(release_year)
-        
-        data = safe_read_json(notified_file) or {'notified_albums': []}
-        
-        data['notified_albums'].append({
-            'artist': artist,
-            'album': album,
-            'release_date': release_date,
-            'notified_at': datetime.now().isoformat()
-        })
-        
-        return safe_write_json(notified_file, data)
+        return get_notified_store(datetime.now().year).add(artist, album, release_date)
     except Exception as e:
         logger.error(f"Error adding notified album: {str(e)}")
         return False
 
-def send_discord_notification(release_info: Dict[str, str], artist_color: Optional[int], is_scan_notification: bool = False) -> None:
+def build_release_embed(release_info: Dict[str, str], artist_color: Optional[int]) -> Dict[str, Any]:
+    try:
+        color = int(artist_color) if artist_color is not None else 0x9B59B6
+    except (ValueError, TypeError):
+        color = 0x9B59B6
+    
+    formatted_date = format_release_date(release_info['release_date'])
+    
+    return {
+        "title": "New Album Release!",
+        "description": f"{release_info['artist']}\n> {release_info['title']}",
+        "color": color,
+        "footer": {
+            "text": f"Release Date: {formatted_date}"
+        }
+    }
+
+def send_discord_notification(release_info: Dict[str, str], artist_color: Optional[int], is_scan_notification: bool = False) -> bool:
     webhook_url = os.getenv('DISCORD_WEBHOOK')
     discord_role = os.getenv('DISCORD_ROLE')
     
@@ -402,21 +580,7 @@ def send_discord_notification(release_info: Dict[str, str], artist_color: Option
         }
     else:
         logger.info(f"Sending Discord notification for {release_info['artist']} - {release_info['title']}")
-        try:
-            color = int(artist_color) if artist_color is not None else 0x9B59B6
-        except (ValueError, TypeError):
-            color = 0x9B59B6
-        
-        formatted_date = format_release_date(release_info['release_date'])
-        
-        embed = {
-            "title": "New Album Release!",
-            "description": f"{release_info['artist']}\n> {release_info['title']}",
-            "color": color,
-            "footer": {
-                "text": f"Release Date: {formatted_date}"
-            }
-        }
+        embed = build_release_embed(release_info, artist_color)
     
     role_mention = f"<@&{discord_role}>" if discord_role else ""
     
@@ -426,13 +590,13 @@ def send_discord_notification(release_info: Dict[str, str], artist_color: Option
     }
     
     try:
-        response = requests.post(webhook_url, json=payload)
+        response = get_session(webhook_url).post(webhook_url, json=payload, timeout=DEFAULT_TIMEOUT)
         response.raise_for_status()
         logger.info("Discord notification sent successfully")
-        if not is_scan_notification:
-            time.sleep(FILE_CHECK_INTERVAL)
+        return True
     except requests.exceptions.RequestException as e:
         logger.error(f"Failed to send Discord notification: {str(e)}")
+        return False
 
 def process_release_group(
     release_group: Dict[str, Any],
@@ -445,10 +609,10 @@ def process_release_group(
         return
 
     album_title = release_group['title']
-    artist_folder = os.path.join(MUSIC_DIR, artist_name)
-    album_folder = os.path.join(artist_folder, album_title)
 
-    if not os.path.exists(album_folder) and not is_album_notified(artist_name, album_title):
+    outbox = get_outbox()
+    if (not get_album_index().owns(artist_name, album_title) and not is_album_notified(artist_name, album_title)
+            and not outbox.contains(artist_name, album_title)):
         logger.info(f"Found new album for {artist_name}: {album_title}")
         release_info = {
             'artist': artist_name,
@@ -456,83 +620,350 @@ def process_release_group(
             'release_date': release_date
         }
 
-        if add_notified_album(artist_name, album_title, release_date):
-            send_discord_notification(release_info, artist_color)
+        # The album is recorded as notified by the outbox once Discord accepts it
+        outbox.enqueue(artist_name, album_title, release_date, build_release_embed(release_info, artist_color))
+
+def process_release_groups(artists: List[Dict[str, Any]], release_groups: List[Dict[str, Any]], current_year: int) -> None:
+    for release_group in release_groups:
+        for artist in artists:
+            try:
+                process_release_group(release_group, artist['name'], artist.get('color'), current_year)
+            except Exception as e:
+                logger.error(f"Error processing release for {artist['name']}: {str(e)}")
 
-def check_artist_releases(artist: Dict[str, Any], rate_limiter: RateLimiter, current_year: int) -> None:
+def check_artist_releases(
+    artist: Dict[str, Any],
+    rate_limiter: RateLimiter,
+    current_year: int,
+    release_sink: Optional[ReleaseSink] = None
+) -> bool:
+    # True once the artist's releases were fetched and handed on; failures stay due for the next scan
     if not artist['id']:
         logger.warning(f"Skipping {artist['name']} - no MusicBrainz ID")
-        return
+        return False
 
     logger.info(f"Checking releases for artist: {artist['name']}")
-    try:
-        url = f"{MUSICBRAINZ_BASE_URL}/release-group"
+    with span('artist', 'artist', artist=artist['name']):
+        try:
+            url = f"{MUSICBRAINZ_BASE_URL}/release-group"
+            params = {
+                'artist': artist['id'],
+                'type': 'album',
+                'limit': RELEASE_BROWSE_LIMIT,
+                'offset': 0,
+                'fmt': 'json'
+            }
+
+            release_data = make_musicbrainz_request(url, params, rate_limiter)
+            if not release_data:
+                return False
+
+            release_groups = release_data.get('release-groups', [])
+            get_storage().record_release_groups(artist['id'], release_groups)
+            complete_history = release_data.get('release-group-count', 0) <= len(release_groups)
+            get_artist_activity().observe(artist['id'], release_groups, complete_history)
+            if release_sink is not None:
+                release_sink([artist], release_groups)
+            else:
+                process_release_groups([artist], release_groups, current_year)
+            return True
+        except Exception as e:
+            logger.error(f"Error checking releases for {artist['name']}: {str(e)}")
+            return False
+
+def search_release_groups(artist_ids: List[str], rate_limiter: RateLimiter, current_year: int) -> Optional[List[Dict[str, Any]]]:
+    url = f"{MUSICBRAINZ_BASE_URL}/release-group"
+    query = f"arid:({' OR '.join(artist_ids)}) AND firstreleasedate:[{current_year} TO *] AND primarytype:album"
+    release_groups = []
+    offset = 0
+
+    while True:
         params = {
-            'artist': artist['id'],
-            'type': 'album',
-            'limit': 25,
-            'offset': 0,
+            'query': query,
+            'limit': RELEASE_SEARCH_LIMIT,
+            'offset': offset,
             'fmt': 'json'
         }
-
         release_data = make_musicbrainz_request(url, params, rate_limiter)
-        if not release_data:
-            return
+        if release_data is None:
+            return None
 
-        for release_group in release_data.get('release-groups', []):
-            try:
-                process_release_group(release_group, artist['name'], artist.get('color'), current_year)
-            except Exception as e:
-                logger.error(f"Error processing release for {artist['name']}: {str(e)}")
-    except Exception as e:
-        logger.error(f"Error checking releases for {artist['name']}: {str(e)}")
+        page = release_data.get('release-groups', [])
+        release_groups.extend(page)
+        offset += len(page)
+        if not page or offset >= release_data.get('count', 0):
+            return release_groups
 
-def check_new_releases(notify_on_scan: bool = False) -> None:
+def check_artist_releases_bulk(
+    artists: List[Dict[str, Any]],
+    rate_limiter: RateLimiter,
+    current_year: int,
+    release_sink: Optional[ReleaseSink] = None
+) -> List[Dict[str, Any]]:
+    artists_by_id: Dict[str, List[Dict[str, Any]]] = {}
+    for artist in artists:
+        if not artist['id']:
+            logger.warning(f"Skipping {artist['name']} - no MusicBrainz ID")
+            continue
+        artists_by_id.setdefault(artist['id'], []).append(artist)
+
+    artist_ids = list(artists_by_id)
+    scan_status = get_scan_status()
+    scan_status.advance(len(artists) - sum(len(batch_artists) for batch_artists in artists_by_id.values()))
+    batch_size = get_env_int('RELEASE_BATCH_SIZE', RELEASE_BATCH_SIZE)
+    checked: List[Dict[str, Any]] = []
+    for start in range(0, len(artist_ids), batch_size):
+        batch = artist_ids[start:start + batch_size]
+        batch_artists = sum(len(artists_by_id[artist_id]) for artist_id in batch)
+        logger.info(f"Checking releases for artists {start + 1}-{start + len(batch)} of {len(artist_ids)}")
+        try:
+            with span('batch', 'artist', artists=len(batch)):
+                release_groups = search_release_groups(batch, rate_limiter, current_year)
+        except Exception as e:
+            logger.error(f"Error searching releases for batch of {len(batch)} artists: {str(e)}")
+            release_groups = None
+
+        if release_groups is None:
+            logger.warning("Bulk release search failed, falling back to per-artist checks for this batch")
+            for artist_id in batch:
+                for artist in artists_by_id[artist_id]:
+                    if check_artist_releases(artist, rate_limiter, current_year, release_sink):
+                        checked.append(artist)
+            scan_status.advance(batch_artists)
+            continue
+
+        batch_ids = set(batch)
+        groups_by_artist: Dict[str, List[Dict[str, Any]]] = {}
+        for release_group in release_groups:
+            credited_ids = [
+                credit['artist']['id']
+                for credit in release_group.get('artist-credit', [])
+                if isinstance(credit, dict) and 'artist' in credit
+            ]
+            for artist_id in dict.fromkeys(credited_ids):
+                if artist_id not in batch_ids:
+                    continue
+                groups_by_artist.setdefault(artist_id, []).append(release_group)
+
+        for artist_id, artist_groups in groups_by_artist.items():
+            get_storage().record_release_groups(artist_id, artist_groups)
+            get_artist_activity().observe(artist_id, artist_groups)
+            if release_sink is not None:
+                release_sink(artists_by_id[artist_id], artist_groups)
+            else:
+                process_release_groups(artists_by_id[artist_id], artist_groups, current_year)
+        for artist_id in batch:
+            checked.extend(artists_by_id[artist_id])
+        scan_status.advance(batch_artists)
+    return checked
+
+def check_artist_releases_offline(
+    artists: List[Dict[str, Any]],
+    offline_index: OfflineIndex,
+    current_year: int,
+    release_sink: ReleaseSink
+) -> List[Dict[str, Any]]:
+    artists_by_id: Dict[str, List[Dict[str, Any]]] = {}
+    for artist in artists:
+        if artist['id']:
+            artists_by_id.setdefault(artist['id'], []).append(artist)
+
+    groups_by_artist: Dict[str, List[Dict[str, Any]]] = {}
+    for release_group in offline_index.release_groups_for(list(artists_by_id), current_year):
+        if release_group.get('primary-type') != 'Album':
+            continue
+        for credit in release_group['artist-credit']:
+            groups_by_artist.setdefault(credit['artist']['id'], []).append(release_group)
+
+    logger.info(f"Offline index returned releases for {len(groups_by_artist)} of {len(artists_by_id)} artists")
+    for artist_id, artist_groups in groups_by_artist.items():
+        release_sink(artists_by_id[artist_id], artist_groups)
+    get_scan_status().advance(len(artists))
+    return [artist for artist in artists if artist['id']]
+
+def check_artists(
+    artists: List[Dict[str, Any]],
+    rate_limiter: RateLimiter,
+    current_year: int,
+    release_sink: ReleaseSink,
+    offline_index: Optional[OfflineIndex],
+    bulk: bool
+) -> List[Dict[str, Any]]:
+    # Returns the artists that were actually checked
+    if offline_index is not None:
+        return check_artist_releases_offline(artists, offline_index, current_year, release_sink)
+    if bulk:
+        return check_artist_releases_bulk(artists, rate_limiter, current_year, release_sink)
+    checked = []
+    for artist in artists:
+        if check_artist_releases(artist, rate_limiter, current_year, release_sink):
+            checked.append(artist)
+        get_scan_status().advance()
+    return checked
+
+def save_scan_checkpoint(checkpoint: ScanCheckpoint, filter_stage: Stage, checked: List[Dict[str, Any]]) -> None:
+    # Only artists whose releases were fetched and made it through the filter stage count as checked;
+    # the rest are left out of the checkpoint so a resumed or later scan tries them again
+    filter_stage.drain()
+    get_artist_activity().mark_checked([artist['id'] for artist in checked if artist.get('id')])
+    get_artist_activity().save()
+    checkpoint.save([artist_key(artist) for artist in checked])
+
+def check_new_releases(notify_on_scan: bool = False, full_scan: bool = True, spread_seconds: float = 0.0) -> None:
     logger.info("Starting the scheduled scan...")
     
-    if not artists_file_exists():
-        logger.info("artists.json not found, creating it...")
-        if not update_artist_list():
-            logger.error("Failed to create artists.json")
-            return
-    elif not is_valid_artists_file():
-        logger.info("artists.json exists but is invalid, updating it...")
-        if not update_artist_list():
-            logger.error("Failed to update artists.json")
-            return
+    with span('validate', 'phase'):
+        if not artists_file_exists():
+            logger.info("artists.json not found, creating it...")
+            if not update_artist_list():
+                logger.error("Failed to create artists.json")
+                return
+        elif not is_valid_artists_file(allow_stale=get_env_bool('WARM_START', True)):
+            logger.info("artists.json exists but is invalid, updating it...")
+            if not update_artist_list():
+                logger.error("Failed to update artists.json")
+                return
+        elif get_env_bool('WARM_START', True) and is_stale_artists_file():
+            start_background_refresh()
     
     check_year_change()
     
     logger.info("Checking for new releases...")
-    rate_limiter = RateLimiter()
-    data = safe_read_json(ARTISTS_FILE_PATH)
+    with span('load', 'phase'):
+        rate_limiter = get_musicbrainz_limiter()
+        data = get_storage().load_artists()
     
-    if not data:
-        logger.error("Could not read artists config, skipping release check")
-        return
+        if not data:
+            logger.error("Could not read artists config, skipping release check")
+            return
 
-    artists = data['artists']
-    current_year = datetime.now().year
-    logger.info(f"Checking releases for {len(artists)} artists")
+        artists = data['artists']
+        current_year = datetime.now().year
+        scan_started = time.monotonic()
+        notified_store = get_notified_store(current_year)
+        notified_store.load()
+        get_album_index().reset()
+        jellyfin = get_jellyfin_client()
+        if jellyfin is not None:
+            # Owned albums come from Jellyfin too; without them every release would look new
+            try:
+                albums = jellyfin.fetch_albums()
+            except Exception as e:
+                logger.error(f"Could not load albums from Jellyfin, skipping release check: {str(e)}")
+                return
+            for artist in artists:
+                get_album_index().set_albums(artist['name'], albums.get(artist['name'], []))
+        offline_index = get_offline_index()
+        bulk = offline_index is None and get_env_bool('BULK_RELEASE_POLLING', True)
+        batch_size = get_env_int('RELEASE_BATCH_SIZE', RELEASE_BATCH_SIZE)
+
+    with span('plan', 'phase'):
+        # An interrupted scan picks up where it stopped instead of starting over
+        checkpoint = get_scan_checkpoint()
+        resumed = checkpoint.load(current_year)
+        if resumed:
+            full_scan = resumed.get('full_scan', full_scan)
+            logger.info(f"Resuming scan {resumed['id']} from {resumed['started_at']} "
+                        f"with {resumed.get('cursor', 0)} artists already checked")
+
+        # Scheduled scans only check artists whose activity tier makes them due this tick;
+        # full scans start with whoever has gone longest without a check
+        activity = get_artist_activity()
+        scan_artists, probes = sorted(artists, key=lambda artist: activity.last_checked(artist.get('id'))), []
+        if not full_scan and offline_index is None and get_env_bool('ADAPTIVE_SCHEDULING', True):
+            cost = (lambda count: math.ceil(count / batch_size)) if bulk else (lambda count: count)
+            max_probes = get_env_int('ACTIVITY_PROBES_PER_TICK', ACTIVITY_PROBES_PER_TICK) if bulk else 0
+            scan_artists, probes = activity.plan(artists, get_env_int('SCAN_REQUEST_BUDGET', 0), cost, max_probes)
+
+        scan_id = resumed.get('storage_scan_id') if resumed else get_storage().start_scan()
+        checkpoint.begin(current_year, full_scan, scan_id, resumed)
+        total = len(scan_artists) + len(probes)
+        scan_artists = [artist for artist in scan_artists if not checkpoint.is_done(artist)]
+        probes = [artist for artist in probes if not checkpoint.is_done(artist)]
+        scan_status = get_scan_status()
+        scan_status.set_total(total)
+        scan_status.advance(total - len(scan_artists) - len(probes))
+    logger.info(f"Checking releases for {len(scan_artists) + len(probes)} of {len(artists)} artists")
     
+    # MusicBrainz fetching runs on this thread while a filter stage checks the
+    # filesystem and notified store; delivery happens on the outbox dispatcher
+    filter_stage = Stage('release-filter', lambda item: process_release_groups(item[0], item[1], current_year)).start()
+    release_sink = lambda scan_artists, release_groups: filter_stage.put((scan_artists, release_groups))
+
+    # Probes use the per-artist browse so the full release history is learned once
+    slice_size = batch_size if bulk else 1
+    slices = [(scan_artists[start:start + slice_size], bulk) for start in range(0, len(scan_artists), slice_size)]
+    slices += [([probe], False) for probe in probes]
+    if spread_seconds > 0 and len(slices) > 1:
+        logger.info(f"Spreading {len(slices)} checks over {spread_seconds / 60:.0f} minutes")
+
     new_releases_found = False
-    for artist in artists:
-        check_artist_releases(artist, rate_limiter, current_year)
-        if new_releases_found:
-            break
+    checked: List[Dict[str, Any]] = []
+    with span('check', 'phase', artists=len(scan_artists) + len(probes)):
+        try:
+            for index, (slice_artists, slice_bulk) in enumerate(slices):
+                if spread_seconds > 0:
+                    delay = scan_started + index * spread_seconds / len(slices) - time.monotonic()
+                    if delay > 0:
+                        with span('spread.wait', 'sleep'):
+                            requested = wait_for_request(delay)
+                        if requested:
+                            # An API request is waiting behind this scan, so finish the due artists at full speed
+                            logger.info("Request queued, checking the remaining artists without spreading")
+                            spread_seconds = 0.0
+                checked.extend(check_artists(slice_artists, rate_limiter, current_year, release_sink,
+                                             offline_index, slice_bulk))
+                if checkpoint.due():
+                    save_scan_checkpoint(checkpoint, filter_stage, checked)
+                    checked = []
+        finally:
+            save_scan_checkpoint(checkpoint, filter_stage, checked)
+            filter_stage.close()
     
+    with span('finish', 'phase'):
+        checkpoint.clear()
+        notified_store.compact()
+        get_storage().finish_scan(scan_id, total)
+        scan_seconds = time.monotonic() - scan_started
+        metrics = get_metrics()
+        metrics.observe('trackly_scan_duration_seconds', scan_seconds)
+        metrics.set('trackly_scan_last_duration_seconds', round(scan_seconds, 3))
+        metrics.set('trackly_scan_artists_checked', total)
+        metrics.set('trackly_scan_last_completed_timestamp_seconds', round(time.time(), 3))
+        metrics.inc('trackly_scans_total')
+        metrics.flush()
+    if get_response_cache() is not None:
+        logger.info(get_response_cache().report())
+
     if notify_on_scan and not new_releases_found:
         send_discord_notification({}, None, True)
     
     logger.info("Completed the scheduled scan")
 
+def run_action(action: str, notify_on_scan: bool = False, full_scan: bool = True, spread_seconds: float = 0.0) -> bool:
+    scan_status = get_scan_status()
+    scan_status.begin(action)
+    start_trace(action)
+    succeeded = False
+    try:
+        if action == 'refresh':
+            succeeded = update_artist_list()
+        else:
+            check_new_releases(notify_on_scan, full_scan, spread_seconds)
+            succeeded = True
+    except Exception as e:
+        logger.error(f"Error running {action}: {str(e)}")
+    finally:
+        scan_status.finish('completed' if succeeded else 'failed')
+        finish_trace('completed' if succeeded else 'failed')
+    return succeeded
+
 def should_perform_release_scan(initial_scan: bool) -> bool:
     current_year = datetime.now().year
-    notified_file_path = get_notified_file_path(current_year)
     
     if initial_scan:
         logger.info("Checking if release scan is needed during initial scan...")
-        if not os.path.exists(notified_file_path):
+        if not get_storage().has_notified(current_year):
             logger.info(f"notified_{current_year}.json not found during initial scan - will perform release scan")
             return True
         else:
@@ -547,47 +978,83 @@ def main() -> None:
         ensure_config_directory()
         music_path, cron_schedule, webhook_url, discord_role, notify_on_scan = load_config()
         
+        get_metrics().enable_snapshot()
+        get_scan_status().start()
+        get_outbox().start()
+
         initial_scan = is_first_startup()
         if initial_scan:
             send_startup_notification(webhook_url, discord_role)
             mark_startup_complete()
         
+        # Warm starts scan with the existing artist list and refresh it in the background
+        warm_start = get_env_bool('WARM_START', True)
         artists_update_needed = False
         if not artists_file_exists():
             logger.info("artists.json not found, performing initial scan...")
             artists_update_needed = True
             if not update_artist_list():
-                raise RuntimeError("Failed to perform initial artist list update")
-        elif not is_valid_artists_file():
+                if not warm_start:
+                    raise RuntimeError("Failed to perform initial artist list update")
+                logger.error("Initial artist list update failed; the next scan will retry it")
+        elif not is_valid_artists_file(allow_stale=warm_start):
             logger.info("artists.json exists but is invalid, updating it...")
             artists_update_needed = True
             if not update_artist_list():
-                raise RuntimeError("Failed to update artists.json")
+                if not warm_start:
+                    raise RuntimeError("Failed to update artists.json")
+                logger.error("Artist list update failed; the next scan will retry it")
         else:
             logger.info("Valid artists.json found, proceeding with normal operation")
+            if warm_start and is_stale_artists_file():
+                start_background_refresh()
+            if watching_library():
+                # Catch up on anything that changed while the watcher was not running
+                apply_library_scan(scan_library())
         
         if artists_update_needed:
             if should_perform_release_scan(True):
                 logger.info("Performing initial release scan...")
-                check_new_releases(notify_on_scan)
+                run_action('scan', notify_on_scan)
                 ensure_notified_file()
             else:
                 logger.info("Skipping initial release scan as notified file exists")
         
+        if watching_library():
+            start_library_watcher(apply_library_changes)
+        elif library_watch_mode() != 'off':
+            logger.warning("LIBRARY_WATCH is ignored while the library is discovered from Jellyfin")
         logger.info("Trackly startup complete - configuration validated")
+
+        if get_scan_checkpoint().load(datetime.now().year) and get_env_bool('SCAN_RESUME_ON_START', True):
+            logger.info("Resuming the scan that was interrupted by the last shutdown")
+            run_action('scan', notify_on_scan)
         
         cron = croniter(cron_schedule, datetime.now())
+        next_run = cron.get_next(datetime)
         
         while True:
-            next_run = cron.get_next(datetime)
-            now = datetime.now()
-            
-            sleep_seconds = (next_run - now).total_seconds()
-            if sleep_seconds > 0:
-                logger.info(f"Sleeping until next scheduled run at {next_run}")
-                time.sleep(sleep_seconds)
+            metrics = get_metrics()
+            metrics.set('trackly_next_scan_timestamp_seconds', next_run.timestamp())
+            metrics.set('trackly_scan_interval_seconds',
+                        (croniter(cron_schedule, next_run).get_next(datetime) - next_run).total_seconds())
+            metrics.flush()
+            get_scan_status().set_next_run(next_run)
             
-            check_new_releases(notify_on_scan)
+            logger.info(f"Sleeping until next scheduled run at {next_run}")
+            # Requests from the API run immediately as full scans without consuming the scheduled run
+            actions = wait_for_trigger(next_run)
+            if actions:
+                logger.info(f"Running requested {', '.join(actions)}")
+                for action in actions:
+                    run_action(action, notify_on_scan)
+                continue
+
+            following_run = cron.get_next(datetime)
+            spread_seconds = max(0.0, (following_run - datetime.now()).total_seconds()) * \
+                get_env_float('SCAN_SPREAD_FRACTION', SCAN_SPREAD_FRACTION)
+            next_run = following_run
+            run_action('scan', notify_on_scan, full_scan=False, spread_seconds=spread_seconds)
             
     except Exception as e:
         logger.error(f"Critical error during startup: {str(e)}")
@@ -0,0 +1,164 @@
+import os
+import json
+import time
+import logging
+import threading
+from typing import Dict, List, Optional, Any, Tuple
+from python.common import DATA_DIR, get_env_float
+
+logger = logging.getLogger(__name__)
+
+METRICS_SNAPSHOT_PATH: str = os.path.join(DATA_DIR, "metrics.json")
+METRICS_FLUSH_SECONDS: float = 15.0
+LATENCY_BUCKETS: List[float] = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+SCAN_BUCKETS: List[float] = [10.0, 30.0, 60.0, 300.0, 600.0, 1800.0, 3600.0, 7200.0, 21600.0, 86400.0]
+
+# name -> (type, help, histogram buckets)
+METRICS: Dict[str, Tuple[str, str, Optional[List[float]]]] = {
+    'trackly_scan_duration_seconds': ('histogram', "Duration of release scans", SCAN_BUCKETS),
+    'trackly_scan_last_duration_seconds': ('gauge', "Duration of the most recent release scan", None),
+    'trackly_scan_last_completed_timestamp_seconds': ('gauge', "Unix time the most recent release scan finished", None),
+    'trackly_scan_artists_checked': ('gauge', "Artists checked by the most recent release scan", None),
+    'trackly_scans_total': ('counter', "Release scans completed", None),
+    'trackly_artist_update_duration_seconds': ('histogram', "Duration of artist list rebuilds", SCAN_BUCKETS),
+    'trackly_next_scan_timestamp_seconds': ('gauge', "Unix time of the next scheduled scan", None),
+    'trackly_scan_interval_seconds': ('gauge', "Seconds between scheduled scans at the next run", None),
+    'trackly_musicbrainz_request_duration_seconds': ('histogram', "MusicBrainz request latency", LATENCY_BUCKETS),
+    'trackly_musicbrainz_responses_total': ('counter', "MusicBrainz responses by status code", None),
+    'trackly_rate_limiter_blocked_seconds_total': ('counter', "Seconds spent blocked waiting for a rate limiter token", None),
+    'trackly_rate_limiter_requests_total': ('counter', "Rate limiter tokens taken", None),
+    'trackly_discord_request_duration_seconds': ('histogram', "Discord webhook request latency", LATENCY_BUCKETS),
+    'trackly_discord_deliveries_total': ('counter', "Discord webhook deliveries by result", None),
+    'trackly_outbox_pending': ('gauge', "Notifications waiting in the Discord outbox", None),
+    'trackly_json_read_bytes_total': ('counter', "Bytes read from JSON state files", None),
+    'trackly_json_write_bytes_total': ('counter', "Bytes written to JSON state files", None),
+    'trackly_json_read_duration_seconds': ('histogram', "JSON state file read duration", LATENCY_BUCKETS),
+    'trackly_json_write_duration_seconds': ('histogram', "JSON state file write duration", LATENCY_BUCKETS),
+    'trackly_metrics_snapshot_age_seconds': ('gauge', "Seconds since the tracker last wrote its metrics snapshot", None)
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+def label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+class Metrics:
+    def __init__(self, snapshot_path: str = METRICS_SNAPSHOT_PATH):
+        self.snapshot_path: str = snapshot_path
+        self.flush_seconds: float = get_env_float('METRICS_FLUSH_SECONDS', METRICS_FLUSH_SECONDS)
+        self.values: Dict[str, Dict[LabelKey, Any]] = {}
+        self.thread: Optional[threading.Thread] = None
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        key = label_key(labels)
+        with self.lock:
+            series = self.values.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels: Any) -> None:
+        with self.lock:
+            self.values.setdefault(name, {})[label_key(labels)] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        buckets = METRICS[name][2]
+        key = label_key(labels)
+        with self.lock:
+            histogram = self.values.setdefault(name, {}).setdefault(
+                key, {'buckets': [0] * len(buckets), 'sum': 0.0, 'count': 0})
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    histogram['buckets'][i] += 1
+                    break
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'generated_at': time.time(),
+                'pid': os.getpid(),
+                'metrics': {
+                    name: [{'labels': dict(key), 'value': value} for key, value in series.items()]
+                    for name, series in self.values.items()
+                }
+            }
+
+    def enable_snapshot(self) -> None:
+        # Only the tracker process persists; other uWSGI workers just render its snapshot
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name='metrics-snapshot', daemon=True)
+            self.thread.start()
+
+    def run(self) -> None:
+        while True:
+            self.flush()
+            time.sleep(self.flush_seconds)
+
+    def flush(self) -> None:
+        if self.thread is None:
+            return
+        # Written directly rather than through safe_write_json so the write is not itself measured
+        temp_path = f"{self.snapshot_path}.tmp"
+        with self.flush_lock:
+            try:
+                with open(temp_path, 'w') as f:
+                    json.dump(self.snapshot(), f, separators=(',', ':'))
+                os.replace(temp_path, self.snapshot_path)
+            except OSError as e:
+                logger.warning(f"Failed to write metrics snapshot: {str(e)}")
+
+def load_snapshot(snapshot_path: str = METRICS_SNAPSHOT_PATH) -> Optional[Dict[str, Any]]:
+    try:
+        with open(snapshot_path, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def format_labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for value in labels.values())
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(labels.keys(), escaped)) + '}'
+
+def format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+def render_prometheus(snapshot: Optional[Dict[str, Any]]) -> str:
+    metrics = dict(snapshot.get('metrics', {})) if snapshot else {}
+    if snapshot:
+        metrics['trackly_metrics_snapshot_age_seconds'] = [
+            {'labels': {}, 'value': round(time.time() - snapshot.get('generated_at', 0), 3)}]
+
+    lines = []
+    for name, (metric_type, help_text, buckets) in METRICS.items():
+        series = metrics.get(name)
+        if not series:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for sample in series:
+            labels = sample['labels']
+            value = sample['value']
+            if metric_type != 'histogram':
+                lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets, value['buckets']):
+                cumulative += count
+                lines.append(f"{name}_bucket{format_labels({**labels, 'le': format_value(bound)})} {cumulative}")
+            lines.append(f"{name}_bucket{format_labels({**labels, 'le': '+Inf'})} {value['count']}")
+            lines.append(f"{name}_sum{format_labels(labels)} {format_value(round(value['sum'], 6))}")
+            lines.append(f"{name}_count{format_labels(labels)} {value['count']}")
+    return '\n'.join(lines) + '\n'
+
+_metrics: Optional[Metrics] = None
+_metrics_lock = threading.Lock()
+
+def get_metrics() -> Metrics:
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = Metrics()
+        return _metrics
@@ -0,0 +1,92 @@
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Set, Tuple
+from python.common import get_env_int
+from python.feed import get_feed
+from python.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+NOTIFIED_COMPACT_EVERY: int = 20
+
+class NotifiedStore:
+    def __init__(self, year: int):
+        self.year: int = year
+        self.compact_every: int = get_env_int('NOTIFIED_COMPACT_EVERY', NOTIFIED_COMPACT_EVERY)
+        self.albums: List[Dict[str, Any]] = []
+        self.index: Set[Tuple[str, str]] = set()
+        self.unexported: int = 0
+        self.loaded: bool = False
+        self.lock = threading.RLock()
+
+    def _index_album(self, album: Dict[str, Any]) -> bool:
+        key = (album.get('artist'), album.get('album'))
+        if key in self.index:
+            return False
+        self.index.add(key)
+        self.albums.append(album)
+        return True
+
+    def load(self) -> None:
+        with self.lock:
+            storage = get_storage()
+            self.albums = []
+            self.index = set()
+            for album in storage.load_notified(self.year):
+                self._index_album(album)
+            self.unexported = 1 if storage.needs_export(self.year) else 0
+            self.loaded = True
+            logger.info(f"Loaded {len(self.albums)} notified albums for {self.year}")
+
+    def ensure_loaded(self) -> None:
+        if not self.loaded:
+            self.load()
+
+    def contains(self, artist: str, album: str) -> bool:
+        with self.lock:
+            self.ensure_loaded()
+            return (artist, album) in self.index
+
+    def add(self, artist: str, album: str, release_date: str) -> bool:
+        with self.lock:
+            self.ensure_loaded()
+            entry = {
+                'artist': artist,
+                'album': album,
+                'release_date': release_date,
+                'notified_at': datetime.now().isoformat()
+            }
+            if not self._index_album(entry):
+                return True
+
+            if not get_storage().append_notified(self.year, entry):
+                self.index.discard((artist, album))
+                self.albums.pop()
+                return False
+
+            get_feed().append('release', {'year': self.year, **entry})
+            self.unexported += 1
+            if self.unexported >= self.compact_every:
+                self.compact()
+            return True
+
+    def compact(self) -> bool:
+        with self.lock:
+            self.ensure_loaded()
+            if self.unexported == 0:
+                return True
+            if not get_storage().export_notified(self.year, self.albums):
+                return False
+            self.unexported = 0
+            return True
+
+_stores: Dict[int, NotifiedStore] = {}
+_stores_lock = threading.Lock()
+
+def get_notified_store(year: Optional[int] = None) -> NotifiedStore:
+    target_year = year if year is not None else datetime.now().year
+    with _stores_lock:
+        if target_year not in _stores:
+            _stores[target_year] = NotifiedStore(target_year)
+        return _stores[target_year]
@@ -0,0 +1,264 @@
+import os
+import json
+import argparse
+import logging
+import sqlite3
+import tarfile
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Any
+from python.common import DATA_DIR, get_env_bool
+from python.artist_cache import normalize_artist_name
+
+logger = logging.getLogger(__name__)
+
+OFFLINE_INDEX_PATH: str = os.path.join(DATA_DIR, "musicbrainz_offline.db")
+IMPORT_BATCH_SIZE: int = 5000
+# Stays under SQLite's host parameter limit, which is 999 on older builds
+QUERY_BATCH_SIZE: int = 900
+DUMP_ENTITIES: List[str] = ['artist', 'release-group']
+
+def parse_year(date: Optional[str]) -> Optional[int]:
+    if not date or len(date) < 4 or not date[:4].isdigit():
+        return None
+    return int(date[:4])
+
+class OfflineIndex:
+    def __init__(self, db_path: str = OFFLINE_INDEX_PATH):
+        self.db_path: str = db_path
+        self.local = threading.local()
+        self.create_schema()
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            self.local.conn = conn
+        return conn
+
+    def create_schema(self) -> None:
+        conn = self.connection()
+        with conn:
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS artists (
+                    mbid TEXT PRIMARY KEY,
+                    name TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS artist_names (
+                    normalized TEXT NOT NULL,
+                    mbid TEXT NOT NULL,
+                    is_alias INTEGER NOT NULL,
+                    PRIMARY KEY (normalized, mbid)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_artist_names_mbid ON artist_names (mbid);
+                CREATE TABLE IF NOT EXISTS release_groups (
+                    mbid TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    primary_type TEXT,
+                    first_release_date TEXT
+                );
+                CREATE TABLE IF NOT EXISTS release_group_artists (
+                    artist_mbid TEXT NOT NULL,
+                    year INTEGER NOT NULL,
+                    release_group_mbid TEXT NOT NULL,
+                    PRIMARY KEY (artist_mbid, year, release_group_mbid)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_release_group_artists_rg ON release_group_artists (release_group_mbid);
+                CREATE TABLE IF NOT EXISTS dumps (
+                    entity TEXT PRIMARY KEY,
+                    dump_timestamp TEXT,
+                    imported_at TEXT NOT NULL,
+                    entities INTEGER NOT NULL
+                );
+            ''')
+
+    def dump_timestamp(self, entity: str) -> Optional[str]:
+        row = self.connection().execute('SELECT dump_timestamp FROM dumps WHERE entity = ?', (entity,)).fetchone()
+        return row['dump_timestamp'] if row else None
+
+    def upsert_artists(self, conn: sqlite3.Connection, artists: List[Dict[str, Any]]) -> None:
+        mbids = [(artist['id'],) for artist in artists]
+        conn.executemany('DELETE FROM artist_names WHERE mbid = ?', mbids)
+        conn.executemany('INSERT OR REPLACE INTO artists (mbid, name) VALUES (?, ?)',
+                         [(artist['id'], artist.get('name', '')) for artist in artists])
+        names = set()
+        for artist in artists:
+            names.add((normalize_artist_name(artist.get('name', '')), artist['id'], 0))
+            for alias in artist.get('aliases') or []:
+                if alias.get('name'):
+                    names.add((normalize_artist_name(alias['name']), artist['id'], 1))
+        conn.executemany('INSERT OR REPLACE INTO artist_names (normalized, mbid, is_alias) VALUES (?, ?, ?)',
+                         sorted(names))
+
+    def upsert_release_groups(self, conn: sqlite3.Connection, release_groups: List[Dict[str, Any]]) -> None:
+        mbids = [(rg['id'],) for rg in release_groups]
+        conn.executemany('DELETE FROM release_group_artists WHERE release_group_mbid = ?', mbids)
+        conn.executemany(
+            'INSERT OR REPLACE INTO release_groups (mbid, title, primary_type, first_release_date) VALUES (?, ?, ?, ?)',
+            [(rg['id'], rg.get('title', ''), rg.get('primary-type'), rg.get('first-release-date')) for rg in release_groups]
+        )
+        links = set()
+        for rg in release_groups:
+            year = parse_year(rg.get('first-release-date')) or 0
+            for credit in rg.get('artist-credit') or []:
+                if isinstance(credit, dict) and credit.get('artist', {}).get('id'):
+                    links.add((credit['artist']['id'], year, rg['id']))
+        conn.executemany(
+            'INSERT OR REPLACE INTO release_group_artists (artist_mbid, year, release_group_mbid) VALUES (?, ?, ?)',
+            sorted(links)
+        )
+
+    def import_entities(self, entity: str, lines: Iterator[bytes], dump_timestamp: Optional[str]) -> int:
+        previous = self.dump_timestamp(entity)
+        if previous and dump_timestamp and dump_timestamp <= previous:
+            logger.info(f"Skipping {entity} dump {dump_timestamp}; index already has {previous}")
+            return 0
+
+        upsert = self.upsert_artists if entity == 'artist' else self.upsert_release_groups
+        conn = self.connection()
+        # Dumps are full snapshots; whatever this one does not mention was removed or merged upstream
+        conn.execute('CREATE TEMP TABLE IF NOT EXISTS imported_mbids (mbid TEXT PRIMARY KEY) WITHOUT ROWID')
+        with conn:
+            conn.execute('DELETE FROM imported_mbids')
+        count = 0
+        batch: List[Dict[str, Any]] = []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                batch.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping malformed {entity} line in dump")
+                continue
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                with conn:
+                    upsert(conn, batch)
+                    conn.executemany('INSERT OR IGNORE INTO imported_mbids (mbid) VALUES (?)', [(item['id'],) for item in batch])
+                count += len(batch)
+                batch = []
+                logger.info(f"Imported {count} {entity} entities")
+        with conn:
+            if batch:
+                upsert(conn, batch)
+                conn.executemany('INSERT OR IGNORE INTO imported_mbids (mbid) VALUES (?)', [(item['id'],) for item in batch])
+                count += len(batch)
+            if count:
+                self.remove_missing(conn, entity)
+            else:
+                logger.warning(f"The {entity} dump is empty; keeping the existing {entity} index")
+            conn.execute(
+                'INSERT OR REPLACE INTO dumps (entity, dump_timestamp, imported_at, entities) VALUES (?, ?, ?, ?)',
+                (entity, dump_timestamp, datetime.now().isoformat(), count)
+            )
+        logger.info(f"Imported {count} {entity} entities from dump {dump_timestamp or '(unversioned)'}")
+        return count
+
+    def remove_missing(self, conn: sqlite3.Connection, entity: str) -> int:
+        if entity == 'artist':
+            conn.execute('DELETE FROM artist_names WHERE mbid NOT IN (SELECT mbid FROM imported_mbids)')
+            removed = conn.execute('DELETE FROM artists WHERE mbid NOT IN (SELECT mbid FROM imported_mbids)').rowcount
+        else:
+            conn.execute('DELETE FROM release_group_artists WHERE release_group_mbid NOT IN (SELECT mbid FROM imported_mbids)')
+            removed = conn.execute('DELETE FROM release_groups WHERE mbid NOT IN (SELECT mbid FROM imported_mbids)').rowcount
+        if removed:
+            logger.info(f"Removed {removed} {entity} entities that are no longer in the dump")
+        return removed
+
+    def import_dump(self, path: str) -> Dict[str, int]:
+        # Accepts an official mbdump .tar.xz, an extracted dump directory or a single JSON lines file
+        results: Dict[str, int] = {}
+        if os.path.isdir(path):
+            mbdump = os.path.join(path, 'mbdump') if os.path.isdir(os.path.join(path, 'mbdump')) else path
+            dump_timestamp = read_dump_timestamp(path)
+            for entity in DUMP_ENTITIES:
+                entity_path = os.path.join(mbdump, entity)
+                if os.path.exists(entity_path):
+                    with open(entity_path, 'rb') as f:
+                        results[entity] = self.import_entities(entity, iter(f), dump_timestamp)
+        elif tarfile.is_tarfile(path):
+            dump_timestamp = None
+            with tarfile.open(path, 'r|*') as archive:
+                for member in archive:
+                    name = member.name.split('/')[-1]
+                    if name in ('TIMESTAMP', 'JSON_DUMPS_SEQUENCE') and dump_timestamp is None:
+                        dump_timestamp = archive.extractfile(member).read().decode('utf-8').strip()
+                    elif name in DUMP_ENTITIES and member.isfile():
+                        results[name] = self.import_entities(name, iter(archive.extractfile(member)), dump_timestamp)
+        else:
+            entity = os.path.basename(path).split('.')[0]
+            if entity not in DUMP_ENTITIES:
+                raise ValueError(f"Cannot tell which entity {path} contains; name it artist or release-group")
+            with open(path, 'rb') as f:
+                results[entity] = self.import_entities(entity, iter(f), read_dump_timestamp(os.path.dirname(path)))
+        return results
+
+    def lookup_artist_id(self, artist_name: str) -> Optional[str]:
+        rows = self.connection().execute('''
+            SELECT n.mbid, n.is_alias, COUNT(rga.release_group_mbid) AS release_groups
+            FROM artist_names n
+            LEFT JOIN release_group_artists rga ON rga.artist_mbid = n.mbid
+            WHERE n.normalized = ?
+            GROUP BY n.mbid, n.is_alias
+            ORDER BY n.is_alias, release_groups DESC, n.mbid
+            LIMIT 1
+        ''', (normalize_artist_name(artist_name),)).fetchall()
+        return rows[0]['mbid'] if rows else None
+
+    def release_groups_for(self, artist_ids: List[str], min_year: int) -> List[Dict[str, Any]]:
+        rows = []
+        for start in range(0, len(artist_ids), QUERY_BATCH_SIZE):
+            batch = artist_ids[start:start + QUERY_BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch))
+            rows.extend(self.connection().execute(f'''
+                SELECT rga.artist_mbid, rg.mbid, rg.title, rg.primary_type, rg.first_release_date
+                FROM release_group_artists rga
+                JOIN release_groups rg ON rg.mbid = rga.release_group_mbid
+                WHERE rga.artist_mbid IN ({placeholders}) AND rga.year >= ?
+            ''', (*batch, min_year)).fetchall())
+
+        # Shape rows like web service release groups so process_release_group() can consume them
+        release_groups: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            rg = release_groups.setdefault(row['mbid'], {
+                'id': row['mbid'],
+                'title': row['title'],
+                'primary-type': row['primary_type'],
+                'first-release-date': row['first_release_date'] or '',
+                'artist-credit': []
+            })
+            rg['artist-credit'].append({'artist': {'id': row['artist_mbid']}})
+        return list(release_groups.values())
+
+def read_dump_timestamp(directory: str) -> Optional[str]:
+    for name in ('TIMESTAMP', 'JSON_DUMPS_SEQUENCE'):
+        path = os.path.join(directory, name)
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                return f.read().strip()
+    return None
+
+_offline_index: Optional[OfflineIndex] = None
+_offline_lock = threading.Lock()
+
+def get_offline_index() -> Optional[OfflineIndex]:
+    global _offline_index
+    if not get_env_bool('MUSICBRAINZ_OFFLINE', False):
+        return None
+    with _offline_lock:
+        if _offline_index is None:
+            if not os.path.exists(OFFLINE_INDEX_PATH):
+                logger.warning(f"MUSICBRAINZ_OFFLINE is set but {OFFLINE_INDEX_PATH} does not exist; using the web service")
+                return None
+            _offline_index = OfflineIndex()
+        return _offline_index
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog='python -m python.offline_index', description="Import MusicBrainz JSON dumps into the offline index")
+    parser.add_argument('dumps', nargs='+', metavar='DUMP', help="Dump .tar.xz, extracted dump directory or artist/release-group file")
+    args = parser.parse_args()
+    index = OfflineIndex()
+    for dump_path in args.dumps:
+        logger.info(f"Importing {dump_path}: {index.import_dump(dump_path)}")
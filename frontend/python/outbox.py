@@ -0,0 +1,207 @@
+import os
+import time
+import uuid
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+import requests
+from python.common import DATA_DIR, get_env_float, safe_read_json, safe_write_json
+from python.http_client import DEFAULT_TIMEOUT, get_session, parse_retry_after
+from python.metrics import get_metrics
+from python.notified_store import get_notified_store
+from python.tracing import span
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_FILE_PATH: str = os.path.join(DATA_DIR, "outbox.json")
+MAX_EMBEDS_PER_MESSAGE: int = 10
+OUTBOX_COALESCE_SECONDS: float = 5.0
+MAX_BACKOFF_SECONDS: float = 600.0
+MAX_CLIENT_ERROR_ATTEMPTS: int = 5
+
+class DiscordOutbox:
+    def __init__(self, file_path: str = OUTBOX_FILE_PATH):
+        self.file_path: str = file_path
+        self.coalesce_seconds: float = get_env_float('OUTBOX_COALESCE_SECONDS', OUTBOX_COALESCE_SECONDS)
+        self.items: List[Dict[str, Any]] = []
+        self.lock = threading.RLock()
+        self.wakeup = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.blocked_until: float = 0.0
+        self.failures: int = 0
+        self.load()
+
+    def load(self) -> None:
+        data = safe_read_json(self.file_path) if os.path.exists(self.file_path) else None
+        items = (data or {}).get('pending', [])
+        self.items = items if isinstance(items, list) else []
+        if self.items:
+            logger.info(f"Loaded {len(self.items)} undelivered notifications from outbox")
+
+    def save(self) -> bool:
+        get_metrics().set('trackly_outbox_pending', len(self.items))
+        return safe_write_json(self.file_path, {
+            'pending': self.items,
+            'last_updated': datetime.now().isoformat()
+        })
+
+    def contains(self, artist: str, album: str) -> bool:
+        with self.lock:
+            return any(item['artist'] == artist and item['album'] == album for item in self.items)
+
+    def enqueue(self, artist: str, album: str, release_date: str, embed: Dict[str, Any]) -> bool:
+        with self.lock:
+            if self.contains(artist, album):
+                return True
+            self.items.append({
+                'id': uuid.uuid4().hex,
+                'artist': artist,
+                'album': album,
+                'release_date': release_date,
+                'year': datetime.now().year,
+                'embed': embed,
+                'queued_at': datetime.now().isoformat(),
+                'attempts': 0
+            })
+            if not self.save():
+                self.items.pop()
+                return False
+        self.start()
+        self.wakeup.set()
+        return True
+
+    def pending(self) -> int:
+        with self.lock:
+            return len(self.items)
+
+    def start(self) -> None:
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name='discord-outbox', daemon=True)
+                self.thread.start()
+
+    def run(self) -> None:
+        while True:
+            if not self.pending():
+                self.wakeup.wait()
+                self.wakeup.clear()
+                # Give a burst of releases a moment to arrive so they share a message
+                with span('outbox.coalesce', 'sleep'):
+                    time.sleep(self.coalesce_seconds)
+
+            delay = self.blocked_until - time.time()
+            if delay > 0:
+                time.sleep(delay)
+
+            try:
+                self.dispatch_batch()
+            except Exception as e:
+                logger.error(f"Error dispatching Discord outbox: {str(e)}")
+                self.back_off()
+
+    def back_off(self, retry_after: Optional[float] = None) -> None:
+        self.failures += 1
+        delay = retry_after if retry_after is not None else min(2 ** self.failures, MAX_BACKOFF_SECONDS)
+        self.blocked_until = max(self.blocked_until, time.time() + delay)
+
+    def dispatch_batch(self) -> None:
+        with self.lock:
+            batch = list(self.items[:MAX_EMBEDS_PER_MESSAGE])
+        if not batch:
+            return
+
+        webhook_url = os.getenv('DISCORD_WEBHOOK')
+        discord_role = os.getenv('DISCORD_ROLE')
+        payload = {
+            "content": f"<@&{discord_role}>" if discord_role else "",
+            "embeds": [item['embed'] for item in batch]
+        }
+
+        metrics = get_metrics()
+        started = time.perf_counter()
+        try:
+            with span('discord.webhook', 'network', embeds=len(batch)) as request_span:
+                response = get_session(webhook_url).post(webhook_url, json=payload, timeout=DEFAULT_TIMEOUT)
+                request_span.set(status=response.status_code)
+        except requests.exceptions.RequestException as e:
+            metrics.inc('trackly_discord_deliveries_total', result='error')
+            logger.error(f"Failed to send Discord notification batch: {str(e)}")
+            self.record_attempt(batch)
+            self.back_off()
+            return
+
+        metrics.observe('trackly_discord_request_duration_seconds', time.perf_counter() - started)
+        self.apply_rate_limit_headers(response)
+
+        if response.status_code == 429:
+            metrics.inc('trackly_discord_deliveries_total', result='rate_limited')
+            retry_after = parse_retry_after(response.headers.get('Retry-After') or response.headers.get('X-RateLimit-Reset-After'))
+            logger.warning(f"Rate limited by Discord, retrying in {retry_after}s")
+            self.back_off(retry_after)
+            return
+
+        if 200 <= response.status_code < 300:
+            self.failures = 0
+            metrics.inc('trackly_discord_deliveries_total', result='success')
+            self.complete(batch)
+            logger.info(f"Delivered {len(batch)} release notifications to Discord")
+            return
+
+        metrics.inc('trackly_discord_deliveries_total', result='rejected')
+        logger.error(f"Discord rejected notification batch with status {response.status_code}: {response.text[:200]}")
+        self.record_attempt(batch, drop_client_errors=400 <= response.status_code < 500)
+        self.back_off()
+
+    def apply_rate_limit_headers(self, response: requests.Response) -> None:
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset_after = response.headers.get('X-RateLimit-Reset-After')
+        if remaining == '0' and reset_after:
+            try:
+                self.blocked_until = max(self.blocked_until, time.time() + float(reset_after))
+            except ValueError:
+                pass
+
+    def record_attempt(self, batch: List[Dict[str, Any]], drop_client_errors: bool = False) -> None:
+        batch_ids = {item['id'] for item in batch}
+        dropped: List[Tuple[str, str]] = []
+        with self.lock:
+            remaining = []
+            for item in self.items:
+                if item['id'] in batch_ids:
+                    item['attempts'] = item.get('attempts', 0) + 1
+                    if drop_client_errors and item['attempts'] >= MAX_CLIENT_ERROR_ATTEMPTS:
+                        dropped.append((item['artist'], item['album']))
+                        continue
+                remaining.append(item)
+            self.items = remaining
+            self.save()
+        for artist, album in dropped:
+            logger.error(f"Dropping notification for {artist} - {album} after {MAX_CLIENT_ERROR_ATTEMPTS} rejected attempts")
+
+    def complete(self, batch: List[Dict[str, Any]]) -> None:
+        # Record the delivery before dropping it from the outbox, so a crash in between cannot
+        # lead the next scan to queue the same release again
+        years = set()
+        for item in batch:
+            if not get_notified_store(item['year']).add(item['artist'], item['album'], item['release_date']):
+                logger.error(f"Failed to record delivered notification for {item['artist']} - {item['album']}")
+            years.add(item['year'])
+        # The frontend reads the exported notified file, which otherwise lags until the next scan ends
+        for year in years:
+            get_notified_store(year).compact()
+
+        batch_ids = {item['id'] for item in batch}
+        with self.lock:
+            self.items = [item for item in self.items if item['id'] not in batch_ids]
+            self.save()
+
+_outbox: Optional[DiscordOutbox] = None
+_outbox_lock = threading.Lock()
+
+def get_outbox() -> DiscordOutbox:
+    global _outbox
+    with _outbox_lock:
+        if _outbox is None:
+            _outbox = DiscordOutbox()
+        return _outbox
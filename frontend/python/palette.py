@@ -0,0 +1,200 @@
+import os
+import colorsys
+import hashlib
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+from python.common import DATA_DIR, get_env_bool, get_env_int, safe_read_json, safe_write_json
+from python.thumbnails import hash_file, is_remote
+from python.tracing import span
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+COLOR_INDEX_PATH: str = os.path.join(DATA_DIR, "artist_colors.json")
+# Bump when the extraction changes so cached colors are recomputed
+COLOR_ALGORITHM: int = 1
+SAMPLE_SIZE: int = 64
+# 4 bits per channel: 4096 buckets
+QUANTIZE_SHIFT: int = 4
+MIN_VALUE: float = 0.12
+# Weight of a fully grey pixel; a vivid area wins once it covers about 5% of the image
+GREY_WEIGHT: float = 0.05
+MIN_EMBED_VALUE: float = 0.45
+IMAGE_KINDS: List[str] = ['cover', 'backdrop']
+
+def name_color(name: str) -> int:
+    # Vibrant, and seeded by the name so it never changes between rebuilds
+    digest = hashlib.sha1(name.encode('utf-8')).digest()
+    hue = int.from_bytes(digest[:2], 'big') / 65536
+    saturation = 0.7 + 0.3 * digest[2] / 255
+    value = 0.8 + 0.2 * digest[3] / 255
+    rgb = colorsys.hsv_to_rgb(hue, saturation, value)
+    return int(rgb[0] * 255) << 16 | int(rgb[1] * 255) << 8 | int(rgb[2] * 255)
+
+def dominant_color(pixels: 'np.ndarray') -> Optional[int]:
+    # pixels: (n, 3) uint8. Buckets are weighted by saturation so a small vivid area beats a large grey one
+    if not len(pixels):
+        return None
+    rgb = pixels.astype(np.float32) / 255.0
+    value = rgb.max(axis=1)
+    saturation = np.where(value > 0, (value - rgb.min(axis=1)) / np.maximum(value, 1e-6), 0.0)
+    weights = np.where(value >= MIN_VALUE, GREY_WEIGHT + saturation, 0.0)
+
+    shifted = pixels.astype(np.int32) >> QUANTIZE_SHIFT
+    buckets = (shifted[:, 0] << 8) | (shifted[:, 1] << 4) | shifted[:, 2]
+    size = 1 << (3 * (8 - QUANTIZE_SHIFT))
+    counts = np.bincount(buckets, minlength=size)
+    scores = np.bincount(buckets, weights=weights, minlength=size)
+    # Nearly black artwork still gets its own color rather than the name fallback
+    best = int(np.argmax(scores if scores.max() > 0 else counts))
+    members = buckets == best
+    mean = pixels[members].mean(axis=0) / 255.0
+
+    hue, saturation, value = colorsys.rgb_to_hsv(*(float(channel) for channel in mean))
+    r, g, b = colorsys.hsv_to_rgb(hue, saturation, max(value, MIN_EMBED_VALUE))
+    return int(round(r * 255)) << 16 | int(round(g * 255)) << 8 | int(round(b * 255))
+
+def extract_color(source: str) -> Optional[int]:
+    # Runs in a worker process
+    with Image.open(source) as image:
+        # JPEGs decode straight to a reduced size, which is most of the saving on large artwork
+        image.draft('RGB', (SAMPLE_SIZE * 2, SAMPLE_SIZE * 2))
+        image = image.convert('RGBA')
+        image.thumbnail((SAMPLE_SIZE, SAMPLE_SIZE), Image.BILINEAR)
+        pixels = np.asarray(image, dtype=np.uint8).reshape(-1, 4)
+    return dominant_color(pixels[pixels[:, 3] >= 128, :3])
+
+class ArtistPalette:
+    def __init__(self, index_path: str = COLOR_INDEX_PATH):
+        self.index_path: str = index_path
+        self.workers: int = max(1, get_env_int('ARTWORK_COLOR_WORKERS', min(4, os.cpu_count() or 1)))
+        self.enabled: bool = np is not None and Image is not None
+        # source path -> {mtime_ns, size, hash, color}
+        self.index: Dict[str, Dict[str, Any]] = {}
+        # content hash -> color, so moved or renamed images are not decoded again
+        self.hashes: Dict[str, Optional[int]] = {}
+        self.lock = threading.Lock()
+
+    def load(self) -> None:
+        data = safe_read_json(self.index_path) if os.path.exists(self.index_path) else None
+        sources = (data or {}).get('sources')
+        if not isinstance(sources, dict) or data.get('algorithm') != COLOR_ALGORITHM:
+            sources = {}
+        self.index = sources
+        self.hashes = {entry['hash']: entry.get('color') for entry in sources.values() if entry.get('hash')}
+
+    def save(self) -> bool:
+        return safe_write_json(self.index_path, {
+            'algorithm': COLOR_ALGORITHM,
+            'sources': self.index,
+            'last_updated': datetime.now().isoformat()
+        })
+
+    def update(self, artists: List[Dict[str, Any]]) -> None:
+        if not self.enabled:
+            for artist in artists:
+                artist['color'] = name_color(artist['name'])
+            return
+        with self.lock:
+            self.load()
+            # Entries are replaced rather than mutated, so a shallow copy tells whether anything changed
+            loaded = dict(self.index)
+            live_sources = set()
+            candidates: Dict[str, List[str]] = {}
+            for artist in artists:
+                sources = []
+                for kind in IMAGE_KINDS:
+                    source = artist.get(kind)
+                    if source and not is_remote(source) and os.path.exists(source):
+                        sources.append(source)
+                candidates[artist['name']] = sources
+
+            # Covers first; a backdrop is only decoded when the cover yields nothing
+            colors: Dict[str, Optional[int]] = {}
+            for position in range(len(IMAGE_KINDS)):
+                needed = [sources[position] for name, sources in candidates.items()
+                          if colors.get(name) is None and len(sources) > position]
+                live_sources.update(needed)
+                self.extract(needed)
+                for name, sources in candidates.items():
+                    if colors.get(name) is None and len(sources) > position:
+                        colors[name] = (self.index.get(sources[position]) or {}).get('color')
+
+            for source in list(self.index):
+                if source not in live_sources:
+                    del self.index[source]
+            if self.index != loaded:
+                self.save()
+
+            for artist in artists:
+                color = colors.get(artist['name'])
+                artist['color'] = color if color is not None else name_color(artist['name'])
+
+    def extract(self, sources: List[str]) -> None:
+        # The content hash is computed here once; workers only decode
+        pending: Dict[str, Tuple[os.stat_result, str]] = {}
+        for source in sources:
+            try:
+                stat = os.stat(source)
+            except OSError:
+                continue
+            entry = self.index.get(source)
+            if entry and entry.get('mtime_ns') == stat.st_mtime_ns and entry.get('size') == stat.st_size:
+                continue
+            try:
+                digest = hash_file(source)
+            except OSError:
+                continue
+            if digest in self.hashes:
+                self.index[source] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size,
+                                      'hash': digest, 'color': self.hashes[digest]}
+            else:
+                pending[source] = (stat, digest)
+        if not pending:
+            return
+
+        logger.info(f"Extracting artist colors from {len(pending)} images with {self.workers} workers")
+        failed = 0
+        with span('artwork.colors', 'image', images=len(pending)), \
+                ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = {source: pool.submit(extract_color, source) for source in pending}
+            for source, future in futures.items():
+                stat, digest = pending[source]
+                try:
+                    color = future.result()
+                except Exception as e:
+                    # Cached as colorless so a broken image is not decoded on every rebuild
+                    failed += 1
+                    logger.warning(f"Could not extract a color from {source}: {str(e)}")
+                    color, digest = None, None
+                self.index[source] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'hash': digest, 'color': color}
+                if digest:
+                    self.hashes[digest] = color
+        logger.info(f"Extracted artist colors from {len(pending) - failed} images ({failed} failed)")
+
+_palette: Optional[ArtistPalette] = None
+_palette_lock = threading.Lock()
+
+def get_palette() -> Optional[ArtistPalette]:
+    global _palette
+    if not get_env_bool('ARTWORK_COLORS', True):
+        return None
+    with _palette_lock:
+        if _palette is None:
+            _palette = ArtistPalette()
+            if not _palette.enabled:
+                logger.warning("NumPy or Pillow is not installed; artist colors are derived from their names")
+        return _palette
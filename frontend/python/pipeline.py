@@ -0,0 +1,51 @@
+import queue
+import logging
+import threading
+from typing import Any, Callable, Optional
+from python.tracing import span
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+class Stage:
+    def __init__(self, name: str, handler: Callable[[Any], None], maxsize: int = 0):
+        self.name: str = name
+        self.handler: Callable[[Any], None] = handler
+        self.queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self.thread: Optional[threading.Thread] = None
+        self.processed: int = 0
+
+    def start(self) -> 'Stage':
+        self.thread = threading.Thread(target=self.run, name=self.name, daemon=True)
+        self.thread.start()
+        return self
+
+    def run(self) -> None:
+        while True:
+            item = self.queue.get()
+            try:
+                if item is _STOP:
+                    return
+                with span(self.name, 'stage'):
+                    self.handler(item)
+                self.processed += 1
+            except Exception as e:
+                logger.error(f"Error in {self.name} stage: {str(e)}")
+            finally:
+                self.queue.task_done()
+
+    def put(self, item: Any) -> None:
+        self.queue.put(item)
+
+    def drain(self) -> None:
+        # Blocks until everything put so far has been handled
+        self.queue.join()
+
+    def pending(self) -> int:
+        return self.queue.qsize()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        self.queue.put(_STOP)
+        if self.thread is not None:
+            self.thread.join(timeout)
@@ -0,0 +1,172 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Dict, Optional, Any, Tuple
+from urllib.parse import urlsplit
+from python.common import DATA_DIR, get_env_bool, get_env_int
+
+logger = logging.getLogger(__name__)
+
+HTTP_CACHE_DIR: str = os.path.join(DATA_DIR, "http_cache")
+HTTP_CACHE_MAX_MB: int = 100
+# Default freshness per MusicBrainz endpoint, in seconds. Release-group responses are always
+# revalidated, since a fresh hit would hold back new releases until it expired
+DEFAULT_TTLS: Dict[str, int] = {
+    'artist': 7 * 24 * 3600,
+    'release-group': 0
+}
+DEFAULT_TTL: int = 3600
+
+def endpoint_name(url: str) -> str:
+    path = urlsplit(url).path.rstrip('/')
+    return path.rsplit('/', 1)[-1]
+
+def cache_key(url: str, params: Dict[str, Any]) -> str:
+    canonical = json.dumps([url, sorted((str(k), str(v)) for k, v in params.items())])
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+class ResponseCache:
+    def __init__(self, cache_dir: str = HTTP_CACHE_DIR):
+        self.cache_dir: str = cache_dir
+        self.max_bytes: int = get_env_int('HTTP_CACHE_MAX_MB', HTTP_CACHE_MAX_MB) * 1024 * 1024
+        self.ttls: Dict[str, int] = {
+            endpoint: get_env_int(f"HTTP_CACHE_TTL_{endpoint.upper().replace('-', '_')}", ttl)
+            for endpoint, ttl in DEFAULT_TTLS.items()
+        }
+        # key -> (size, last access); doubles as the LRU order
+        self.index: Optional[Dict[str, Tuple[int, float]]] = None
+        self.total_bytes: int = 0
+        self.stats: Dict[str, int] = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stores': 0, 'evictions': 0}
+        self.lock = threading.Lock()
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def ttl_for(self, url: str) -> int:
+        return self.ttls.get(endpoint_name(url), DEFAULT_TTL)
+
+    def _load_index(self) -> Dict[str, Tuple[int, float]]:
+        if self.index is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self.index = {}
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.json'):
+                        stat = entry.stat()
+                        self.index[entry.name[:-5]] = (stat.st_size, stat.st_mtime)
+            self.total_bytes = sum(size for size, _ in self.index.values())
+        return self.index
+
+    def lookup(self, url: str, params: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], bool]:
+        key = cache_key(url, params)
+        with self.lock:
+            index = self._load_index()
+            if key not in index:
+                self.stats['misses'] += 1
+                return None, False
+            try:
+                with open(self.path_for(key), 'r') as f:
+                    entry = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self._remove(key)
+                self.stats['misses'] += 1
+                return None, False
+
+            index[key] = (index[key][0], time.time())
+            fresh = entry.get('expires_at', 0) > time.time()
+            if fresh:
+                self.stats['hits'] += 1
+                try:
+                    os.utime(self.path_for(key))
+                except OSError:
+                    pass
+            else:
+                self.stats['misses'] += 1
+            return entry, fresh
+
+    def conditional_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url: str, params: Dict[str, Any], body: Dict[str, Any], headers: Any) -> None:
+        entry = {
+            'url': url,
+            'params': params,
+            'fetched_at': time.time(),
+            'expires_at': time.time() + self.ttl_for(url),
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'body': body
+        }
+        with self.lock:
+            self.stats['stores'] += 1
+            self._write(cache_key(url, params), entry)
+
+    def revalidated(self, url: str, params: Dict[str, Any], entry: Dict[str, Any]) -> Dict[str, Any]:
+        entry['expires_at'] = time.time() + self.ttl_for(url)
+        with self.lock:
+            self.stats['revalidated'] += 1
+            self._write(cache_key(url, params), entry)
+        return entry['body']
+
+    def _write(self, key: str, entry: Dict[str, Any]) -> None:
+        index = self._load_index()
+        path = self.path_for(key)
+        temp_path = f"{path}.tmp"
+        try:
+            data = json.dumps(entry, separators=(',', ':'))
+            with open(temp_path, 'w') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write HTTP cache entry: {str(e)}")
+            return
+
+        size = len(data.encode('utf-8'))
+        self.total_bytes += size - index.get(key, (0, 0))[0]
+        index[key] = (size, time.time())
+        self._evict()
+
+    def _remove(self, key: str) -> None:
+        size, _ = self.index.pop(key, (0, 0))
+        self.total_bytes -= size
+        try:
+            os.remove(self.path_for(key))
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        if self.total_bytes <= self.max_bytes:
+            return
+        for key, _ in sorted(self.index.items(), key=lambda item: item[1][1]):
+            if self.total_bytes <= self.max_bytes:
+                break
+            self._remove(key)
+            self.stats['evictions'] += 1
+
+    def report(self) -> str:
+        lookups = self.stats['hits'] + self.stats['misses']
+        ratio = (self.stats['hits'] / lookups * 100) if lookups else 0.0
+        return (f"HTTP cache: {self.stats['hits']} hits, {self.stats['misses']} misses ({ratio:.0f}% hit rate), "
+                f"{self.stats['revalidated']} revalidated, {self.stats['evictions']} evicted, "
+                f"{self.total_bytes / (1024 * 1024):.1f} MB")
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+def get_response_cache() -> Optional[ResponseCache]:
+    global _cache
+    if not get_env_bool('HTTP_CACHE_ENABLED', True):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
@@ -0,0 +1,168 @@
+import os
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+from python.common import DATA_DIR, MUSIC_DIR, safe_read_json, safe_write_json
+
+logger = logging.getLogger(__name__)
+
+LIBRARY_MANIFEST_PATH: str = os.path.join(DATA_DIR, "library_manifest.json")
+IMAGE_EXTENSIONS: List[str] = ['.png', '.jpg', '.jpeg', '.webp']
+
+class LibraryScan:
+    def __init__(self):
+        self.artists: Dict[str, Dict[str, Any]] = {}
+        self.added: List[str] = []
+        self.removed: List[str] = []
+        self.renamed: List[Tuple[str, str]] = []
+        self.existing: List[str] = []
+        # Existing folders whose contents were rescanned
+        self.updated: List[str] = []
+
+    def changed_names(self) -> List[str]:
+        return self.added + [new_name for _, new_name in self.renamed]
+
+def pick_images(artist_path: str, file_names: List[str]) -> Tuple[Optional[str], Optional[str]]:
+    by_name = {name.lower(): name for name in sorted(file_names)}
+    backdrop = None
+    cover = None
+    for ext in IMAGE_EXTENSIONS:
+        backdrop_matches = [by_name[name] for name in sorted(by_name)
+                            if name.startswith('backdrop') and name.endswith(ext)]
+        if backdrop_matches:
+            backdrop = os.path.join(artist_path, backdrop_matches[0])
+            break
+    # Prefer 'cover' over 'folder' for each extension in priority order
+    for ext in IMAGE_EXTENSIONS:
+        for base_name in ('cover', 'folder'):
+            match = by_name.get(f'{base_name}{ext}')
+            if match:
+                cover = os.path.join(artist_path, match)
+                break
+        if cover:
+            break
+    return backdrop, cover
+
+def scan_artist_dir(artist_path: str) -> Dict[str, Any]:
+    file_names = []
+    albums = []
+    with os.scandir(artist_path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                albums.append(entry.name)
+            elif os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS:
+                file_names.append(entry.name)
+
+    backdrop, cover = pick_images(artist_path, file_names)
+    return {
+        'backdrop': backdrop,
+        'cover': cover,
+        'albums': sorted(albums)
+    }
+
+def load_manifest(manifest_path: str = LIBRARY_MANIFEST_PATH) -> Dict[str, Dict[str, Any]]:
+    data = safe_read_json(manifest_path) if os.path.exists(manifest_path) else None
+    artists = data.get('artists') if data else None
+    return artists if isinstance(artists, dict) else {}
+
+def manifest_scanned_at(manifest_path: str = LIBRARY_MANIFEST_PATH) -> Optional[datetime]:
+    data = safe_read_json(manifest_path) if os.path.exists(manifest_path) else None
+    try:
+        return datetime.fromisoformat(data['last_scanned'])
+    except (TypeError, KeyError, ValueError):
+        return None
+
+def save_manifest(artists: Dict[str, Dict[str, Any]], manifest_path: str = LIBRARY_MANIFEST_PATH) -> bool:
+    return safe_write_json(manifest_path, {
+        'artists': artists,
+        'last_scanned': datetime.now().isoformat()
+    })
+
+def match_renames(scan: LibraryScan, previous: Dict[str, Dict[str, Any]], removed: List[str]) -> None:
+    # A folder that disappeared and one that appeared with the same inode is a rename
+    removed_by_inode = {previous[name].get('inode'): name for name in removed}
+    for new_name in list(scan.added):
+        old_name = removed_by_inode.pop(scan.artists[new_name]['inode'], None)
+        if old_name is not None:
+            scan.renamed.append((old_name, new_name))
+            scan.added.remove(new_name)
+            removed.remove(old_name)
+    scan.removed = removed
+
+def scan_library(music_dir: str = MUSIC_DIR, manifest_path: str = LIBRARY_MANIFEST_PATH) -> LibraryScan:
+    previous = load_manifest(manifest_path)
+    scan = LibraryScan()
+    rescanned = 0
+
+    with os.scandir(music_dir) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            stat = entry.stat()
+            cached = previous.get(entry.name)
+            # A directory's mtime only moves when entries are added, removed or renamed in it
+            if cached and cached.get('mtime_ns') == stat.st_mtime_ns and cached.get('inode') == stat.st_ino:
+                scan.artists[entry.name] = cached
+                scan.existing.append(entry.name)
+                continue
+
+            try:
+                artist_entry = scan_artist_dir(entry.path)
+            except OSError as e:
+                logger.error(f"Error scanning {entry.path}: {str(e)}")
+                if cached:
+                    scan.artists[entry.name] = cached
+                    scan.existing.append(entry.name)
+                continue
+            artist_entry['mtime_ns'] = stat.st_mtime_ns
+            artist_entry['inode'] = stat.st_ino
+            scan.artists[entry.name] = artist_entry
+            rescanned += 1
+            if cached:
+                scan.existing.append(entry.name)
+                scan.updated.append(entry.name)
+            else:
+                scan.added.append(entry.name)
+
+    match_renames(scan, previous, [name for name in previous if name not in scan.artists])
+    logger.info(f"Library scan: {len(scan.artists)} artists, {rescanned} folders rescanned, "
+                f"{len(scan.added)} added, {len(scan.removed)} removed, {len(scan.renamed)} renamed")
+    return scan
+
+def rescan_artists(names: List[str], music_dir: str = MUSIC_DIR, manifest_path: str = LIBRARY_MANIFEST_PATH) -> LibraryScan:
+    # Rescans only the named folders; everything else is carried over from the manifest
+    previous = load_manifest(manifest_path)
+    scan = LibraryScan()
+    scan.artists = dict(previous)
+    requested = set(names)
+    removed = []
+
+    for name in sorted(requested):
+        path = os.path.join(music_dir, name)
+        try:
+            stat = os.stat(path)
+            if not os.path.isdir(path):
+                raise FileNotFoundError(path)
+            artist_entry = scan_artist_dir(path)
+        except FileNotFoundError:
+            if scan.artists.pop(name, None) is not None:
+                removed.append(name)
+            continue
+        except OSError as e:
+            logger.error(f"Error scanning {path}: {str(e)}")
+            continue
+
+        artist_entry['mtime_ns'] = stat.st_mtime_ns
+        artist_entry['inode'] = stat.st_ino
+        scan.artists[name] = artist_entry
+        if name in previous:
+            scan.existing.append(name)
+            scan.updated.append(name)
+        else:
+            scan.added.append(name)
+
+    scan.existing.extend(name for name in scan.artists if name not in requested)
+    match_renames(scan, previous, removed)
+    logger.info(f"Library rescan of {len(requested)} folders: {len(scan.added)} added, {len(scan.removed)} removed, "
+                f"{len(scan.renamed)} renamed, {len(scan.updated)} updated")
+    return scan
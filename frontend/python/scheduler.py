@@ -0,0 +1,51 @@
+import os
+import sys
+import time
+import signal
+import fcntl
+import logging
+from typing import IO
+from python.common import DATA_DIR, get_env_float
+from python.main import main as tracker_main
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_LOCK_PATH: str = os.path.join(DATA_DIR, "scheduler.lock")
+LEADER_RETRY_SECONDS: float = 15.0
+
+def acquire_leadership(lock_path: str = SCHEDULER_LOCK_PATH) -> IO[str]:
+    # The kernel drops the flock when this process exits, so a standby takes over after a crash
+    retry_seconds = get_env_float('SCHEDULER_LEADER_RETRY_SECONDS', LEADER_RETRY_SECONDS)
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    lock_file = open(lock_path, 'a+')
+    waiting = False
+    while True:
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            break
+        except BlockingIOError:
+            if not waiting:
+                lock_file.seek(0)
+                leader = lock_file.read().strip() or 'unknown'
+                logger.info(f"Another scheduler (pid {leader}) holds {lock_path}, standing by")
+                waiting = True
+            time.sleep(retry_seconds)
+
+    lock_file.seek(0)
+    lock_file.truncate()
+    lock_file.write(str(os.getpid()))
+    lock_file.flush()
+    logger.info(f"Scheduler {os.getpid()} acquired leadership")
+    return lock_file
+
+def main() -> None:
+    # uWSGI stops the daemon with SIGTERM; exiting normally lets a running scan save its checkpoint
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    lock_file = acquire_leadership()
+    try:
+        tracker_main()
+    finally:
+        lock_file.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+import os
+import json
+import glob
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+from python.common import DATA_DIR, safe_read_json, safe_write_json
+
+logger = logging.getLogger(__name__)
+
+ARTISTS_FILE_PATH: str = os.path.join(DATA_DIR, "artists.json")
+STARTUP_FILE_PATH: str = os.path.join(DATA_DIR, "startup.json")
+DATABASE_PATH: str = os.path.join(DATA_DIR, "trackly.db")
+ARTIST_COLUMNS: List[str] = ['name', 'id', 'color', 'backdrop', 'cover']
+
+def get_notified_file_path(year: Optional[int] = None) -> str:
+    target_year = year if year is not None else datetime.now().year
+    return os.path.join(DATA_DIR, f"notified_{target_year}.json")
+
+def get_notified_journal_path(year: Optional[int] = None) -> str:
+    target_year = year if year is not None else datetime.now().year
+    return os.path.join(DATA_DIR, f"notified_{target_year}.journal")
+
+class JsonStorage:
+    name: str = 'json'
+
+    def has_artists(self) -> bool:
+        return os.path.exists(ARTISTS_FILE_PATH)
+
+    def load_artists(self) -> Optional[Dict[str, Any]]:
+        return safe_read_json(ARTISTS_FILE_PATH)
+
+    def save_artists(self, artists: List[Dict[str, Any]], last_updated: str) -> bool:
+        return safe_write_json(ARTISTS_FILE_PATH, {
+            'artists': artists,
+            'last_updated': last_updated
+        })
+
+    def load_startup(self) -> Optional[Dict[str, Any]]:
+        return safe_read_json(STARTUP_FILE_PATH)
+
+    def save_startup(self, data: Dict[str, Any]) -> bool:
+        return safe_write_json(STARTUP_FILE_PATH, data)
+
+    def has_notified(self, year: int) -> bool:
+        return os.path.exists(get_notified_file_path(year))
+
+    def needs_export(self, year: int) -> bool:
+        return not self.has_notified(year) or os.path.exists(get_notified_journal_path(year))
+
+    def load_notified(self, year: int) -> List[Dict[str, Any]]:
+        file_path = get_notified_file_path(year)
+        data = safe_read_json(file_path) if os.path.exists(file_path) else None
+        albums = list((data or {}).get('notified_albums', []))
+
+        # Entries appended since the last export; duplicates mean we crashed mid-export
+        journal_path = get_notified_journal_path(year)
+        if os.path.exists(journal_path):
+            with open(journal_path, 'r') as f:
+                for line in f:
+                    try:
+                        albums.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping truncated line in {journal_path}")
+        return albums
+
+    def notified_years(self) -> List[int]:
+        years = set()
+        for file_path in glob.glob(os.path.join(DATA_DIR, 'notified_*.json')) + glob.glob(os.path.join(DATA_DIR, 'notified_*.journal')):
+            year = os.path.splitext(os.path.basename(file_path))[0][len('notified_'):]
+            if year.isdigit():
+                years.add(int(year))
+        return sorted(years, reverse=True)
+
+    def state_version(self) -> str:
+        # Changes whenever the artist list or any notified file is rewritten or appended to
+        parts = []
+        for file_path in [ARTISTS_FILE_PATH] + sorted(glob.glob(os.path.join(DATA_DIR, 'notified_*'))):
+            try:
+                stat = os.stat(file_path)
+                parts.append(f"{os.path.basename(file_path)}:{stat.st_mtime_ns}:{stat.st_size}")
+            except OSError:
+                continue
+        return '|'.join(parts)
+
+    def append_notified(self, year: int, album: Dict[str, Any]) -> bool:
+        journal_path = get_notified_journal_path(year)
+        try:
+            with open(journal_path, 'a') as f:
+                f.write(json.dumps(album) + '\n')
+            return True
+        except Exception as e:
+            logger.error(f"Failed to append to {journal_path}: {str(e)}")
+            return False
+
+    def export_notified(self, year: int, albums: List[Dict[str, Any]]) -> bool:
+        if not safe_write_json(get_notified_file_path(year), {'notified_albums': albums}):
+            return False
+        journal_path = get_notified_journal_path(year)
+        try:
+            if os.path.exists(journal_path):
+                os.remove(journal_path)
+        except OSError as e:
+            logger.warning(f"Failed to remove {journal_path}: {str(e)}")
+        return True
+
+    def record_release_groups(self, artist_id: str, release_groups: List[Dict[str, Any]]) -> None:
+        pass
+
+    def start_scan(self) -> Optional[int]:
+        return None
+
+    def finish_scan(self, scan_id: Optional[int], artists_checked: int, status: str = 'completed') -> None:
+        pass
+
+class SqliteStorage(JsonStorage):
+    name: str = 'sqlite'
+
+    def __init__(self, db_path: str = DATABASE_PATH):
+        self.db_path: str = db_path
+        self.local = threading.local()
+        self.create_schema()
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self.local.conn = conn
+        return conn
+
+    def create_schema(self) -> None:
+        conn = self.connection()
+        with conn:
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+                CREATE TABLE IF NOT EXISTS artists (
+                    name TEXT PRIMARY KEY,
+                    mbid TEXT,
+                    color INTEGER,
+                    backdrop TEXT,
+                    cover TEXT,
+                    extra TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_artists_mbid ON artists (mbid);
+                CREATE TABLE IF NOT EXISTS release_groups (
+                    mbid TEXT NOT NULL,
+                    artist_mbid TEXT NOT NULL,
+                    title TEXT,
+                    primary_type TEXT,
+                    first_release_date TEXT,
+                    first_seen_at TEXT,
+                    last_seen_at TEXT,
+                    PRIMARY KEY (mbid, artist_mbid)
+                );
+                CREATE INDEX IF NOT EXISTS idx_release_groups_artist ON release_groups (artist_mbid, first_release_date);
+                CREATE TABLE IF NOT EXISTS notifications (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    year INTEGER NOT NULL,
+                    artist TEXT NOT NULL,
+                    album TEXT NOT NULL,
+                    release_date TEXT,
+                    notified_at TEXT,
+                    UNIQUE (year, artist, album)
+                );
+                CREATE TABLE IF NOT EXISTS scan_runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    started_at TEXT NOT NULL,
+                    finished_at TEXT,
+                    artists_checked INTEGER,
+                    status TEXT
+                );
+            ''')
+        if self.get_meta('json_imported') is None:
+            self.import_json()
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self.connection().execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row['value'] if row else None
+
+    def set_meta(self, conn: sqlite3.Connection, key: str, value: str) -> None:
+        conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    def import_json(self) -> None:
+        logger.info("Importing existing JSON state into SQLite")
+        artists_data = super().load_artists()
+        if artists_data and isinstance(artists_data.get('artists'), list):
+            self.write_artists(artists_data['artists'], artists_data.get('last_updated', datetime.now().isoformat()))
+
+        startup_data = super().load_startup()
+        conn = self.connection()
+        with conn:
+            if startup_data is not None:
+                self.set_meta(conn, 'startup', json.dumps(startup_data))
+            for file_path in glob.glob(os.path.join(DATA_DIR, 'notified_*.json')):
+                try:
+                    year = int(os.path.basename(file_path)[len('notified_'):-len('.json')])
+                except ValueError:
+                    continue
+                conn.executemany(
+                    'INSERT OR IGNORE INTO notifications (year, artist, album, release_date, notified_at) VALUES (?, ?, ?, ?, ?)',
+                    [(year, a.get('artist'), a.get('album'), a.get('release_date'), a.get('notified_at'))
+                     for a in super().load_notified(year)]
+                )
+            self.set_meta(conn, 'json_imported', datetime.now().isoformat())
+
+    def has_artists(self) -> bool:
+        return self.get_meta('artists_last_updated') is not None
+
+    def load_artists(self) -> Optional[Dict[str, Any]]:
+        last_updated = self.get_meta('artists_last_updated')
+        if last_updated is None:
+            return None
+        artists = []
+        for row in self.connection().execute('SELECT * FROM artists ORDER BY name'):
+            artist = {
+                'name': row['name'],
+                'id': row['mbid'],
+                'color': row['color'],
+                'backdrop': row['backdrop'],
+                'cover': row['cover']
+            }
+            if row['extra']:
+                artist.update(json.loads(row['extra']))
+            artists.append(artist)
+        return {'artists': artists, 'last_updated': last_updated}
+
+    def write_artists(self, artists: List[Dict[str, Any]], last_updated: str) -> None:
+        rows = []
+        for artist in artists:
+            extra = {key: value for key, value in artist.items() if key not in ARTIST_COLUMNS}
+            rows.append((
+                artist['name'],
+                artist.get('id'),
+                artist.get('color'),
+                artist.get('backdrop'),
+                artist.get('cover'),
+                json.dumps(extra) if extra else None
+            ))
+
+        conn = self.connection()
+        with conn:
+            conn.execute('DELETE FROM artists')
+            conn.executemany(
+                'INSERT OR REPLACE INTO artists (name, mbid, color, backdrop, cover, extra) VALUES (?, ?, ?, ?, ?, ?)',
+                rows
+            )
+            self.set_meta(conn, 'artists_last_updated', last_updated)
+
+    def save_artists(self, artists: List[Dict[str, Any]], last_updated: str) -> bool:
+        try:
+            self.write_artists(artists, last_updated)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to save artists to SQLite: {str(e)}")
+            return False
+        # artists.json stays as a materialized export for the frontend
+        return super().save_artists(artists, last_updated)
+
+    def load_startup(self) -> Optional[Dict[str, Any]]:
+        value = self.get_meta('startup')
+        return json.loads(value) if value else None
+
+    def save_startup(self, data: Dict[str, Any]) -> bool:
+        try:
+            conn = self.connection()
+            with conn:
+                self.set_meta(conn, 'startup', json.dumps(data))
+        except sqlite3.Error as e:
+            logger.error(f"Failed to save startup state to SQLite: {str(e)}")
+            return False
+        return super().save_startup(data)
+
+    def load_notified(self, year: int) -> List[Dict[str, Any]]:
+        rows = self.connection().execute(
+            'SELECT artist, album, release_date, notified_at FROM notifications WHERE year = ? ORDER BY id',
+            (year,)
+        )
+        return [dict(row) for row in rows]
+
+    def notified_years(self) -> List[int]:
+        rows = self.connection().execute('SELECT DISTINCT year FROM notifications ORDER BY year DESC')
+        return [row['year'] for row in rows]
+
+    def state_version(self) -> str:
+        row = self.connection().execute('SELECT COUNT(*) AS count, MAX(id) AS last_id FROM notifications').fetchone()
+        return f"{self.get_meta('artists_last_updated')}|{row['count']}|{row['last_id']}"
+
+    def append_notified(self, year: int, album: Dict[str, Any]) -> bool:
+        try:
+            conn = self.connection()
+            with conn:
+                conn.execute(
+                    'INSERT OR IGNORE INTO notifications (year, artist, album, release_date, notified_at) VALUES (?, ?, ?, ?, ?)',
+                    (year, album['artist'], album['album'], album.get('release_date'), album.get('notified_at'))
+                )
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"Failed to record notification in SQLite: {str(e)}")
+            return False
+
+    def needs_export(self, year: int) -> bool:
+        # The database is authoritative, so re-export in case the last run stopped before exporting
+        return True
+
+    def export_notified(self, year: int, albums: List[Dict[str, Any]]) -> bool:
+        return safe_write_json(get_notified_file_path(year), {'notified_albums': self.load_notified(year)})
+
+    def record_release_groups(self, artist_id: str, release_groups: List[Dict[str, Any]]) -> None:
+        now = datetime.now().isoformat()
+        try:
+            conn = self.connection()
+            with conn:
+                conn.executemany('''
+                    INSERT INTO release_groups (mbid, artist_mbid, title, primary_type, first_release_date, first_seen_at, last_seen_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (mbid, artist_mbid) DO UPDATE SET
+                        title = excluded.title,
+                        first_release_date = excluded.first_release_date,
+                        last_seen_at = excluded.last_seen_at
+                ''', [(
+                    rg['id'], artist_id, rg.get('title'), rg.get('primary-type'),
+                    rg.get('first-release-date'), now, now
+                ) for rg in release_groups if rg.get('id')])
+        except sqlite3.Error as e:
+            logger.error(f"Failed to record release groups in SQLite: {str(e)}")
+
+    def start_scan(self) -> Optional[int]:
+        try:
+            conn = self.connection()
+            with conn:
+                cursor = conn.execute(
+                    'INSERT INTO scan_runs (started_at, status) VALUES (?, ?)',
+                    (datetime.now().isoformat(), 'running')
+                )
+            return cursor.lastrowid
+        except sqlite3.Error as e:
+            logger.error(f"Failed to record scan start in SQLite: {str(e)}")
+            return None
+
+    def finish_scan(self, scan_id: Optional[int], artists_checked: int, status: str = 'completed') -> None:
+        if scan_id is None:
+            return
+        try:
+            conn = self.connection()
+            with conn:
+                conn.execute(
+                    'UPDATE scan_runs SET finished_at = ?, artists_checked = ?, status = ? WHERE id = ?',
+                    (datetime.now().isoformat(), artists_checked, status, scan_id)
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Failed to record scan completion in SQLite: {str(e)}")
+
+_storage: Optional[JsonStorage] = None
+_storage_lock = threading.Lock()
+
+def get_storage() -> JsonStorage:
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            backend = os.getenv('STORAGE_BACKEND', 'json').lower()
+            if backend == 'sqlite':
+                try:
+                    _storage = SqliteStorage()
+                except sqlite3.Error as e:
+                    logger.error(f"Failed to open SQLite database, falling back to JSON files: {str(e)}")
+                    _storage = JsonStorage()
+            else:
+                if backend != 'json':
+                    logger.warning(f"Unknown STORAGE_BACKEND {backend!r}, using JSON files")
+                _storage = JsonStorage()
+            logger.info(f"Using {_storage.name} storage backend")
+        return _storage
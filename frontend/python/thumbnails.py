@@ -0,0 +1,246 @@
+import os
+import hashlib
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Set, Tuple
+from python.common import DATA_DIR, get_env_bool, get_env_int, safe_read_json, safe_write_json
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_DIR: str = os.path.join(DATA_DIR, "thumbnails")
+THUMBNAIL_INDEX_PATH: str = os.path.join(THUMBNAIL_DIR, "index.json")
+THUMBNAIL_URL_PREFIX: str = "/data/thumbnails"
+THUMBNAIL_CACHE_MAX_MB: int = 500
+THUMBNAIL_WIDTHS: Dict[str, List[int]] = {
+    'cover': [256, 512],
+    'backdrop': [960, 1920]
+}
+FORMAT_TYPES: Dict[str, Tuple[str, str, Dict[str, Any]]] = {
+    'avif': ('AVIF', 'image/avif', {'quality': 55}),
+    'webp': ('WEBP', 'image/webp', {'quality': 80, 'method': 4})
+}
+HASH_CHUNK_SIZE: int = 1024 * 1024
+
+def available_formats() -> List[str]:
+    if Image is None:
+        return []
+    Image.init()
+    return [name for name, (pil_format, _, _) in FORMAT_TYPES.items() if pil_format in Image.SAVE]
+
+def is_remote(source: str) -> bool:
+    # Images discovered from Jellyfin are URLs that Jellyfin resizes itself
+    return '://' in source
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:24]
+
+def render_variants(source: str, kind: str, formats: List[str], output_dir: str) -> Dict[str, Any]:
+    # Runs in a worker process; returns the content hash and the variants that now exist on disk
+    digest = hash_file(source)
+    variants = []
+    with Image.open(source) as image:
+        image.load()
+        if image.mode not in ('RGB', 'RGBA'):
+            has_alpha = image.mode in ('LA', 'PA') or 'transparency' in image.info
+            image = image.convert('RGBA' if has_alpha else 'RGB')
+        widths = sorted({min(width, image.width) for width in THUMBNAIL_WIDTHS[kind]})
+        for width in widths:
+            height = max(1, round(image.height * width / image.width))
+            resized = None
+            for format_name in formats:
+                pil_format, mime_type, options = FORMAT_TYPES[format_name]
+                file_name = f"{digest}-{width}.{format_name}"
+                path = os.path.join(output_dir, file_name)
+                if not os.path.exists(path):
+                    if resized is None:
+                        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+                    temp_path = f"{path}.tmp"
+                    resized.save(temp_path, pil_format, **options)
+                    os.replace(temp_path, path)
+                variants.append({'file': file_name, 'width': width, 'type': mime_type})
+    return {'hash': digest, 'variants': variants}
+
+class Thumbnailer:
+    def __init__(self, output_dir: str = THUMBNAIL_DIR, index_path: str = THUMBNAIL_INDEX_PATH):
+        self.output_dir: str = output_dir
+        self.index_path: str = index_path
+        self.max_bytes: int = get_env_int('THUMBNAIL_CACHE_MAX_MB', THUMBNAIL_CACHE_MAX_MB) * 1024 * 1024
+        self.workers: int = max(1, get_env_int('THUMBNAIL_WORKERS', min(4, os.cpu_count() or 1)))
+        self.formats: List[str] = available_formats()
+        # source path -> {mtime_ns, size, kind, hash, variants}
+        self.index: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+
+    def load(self) -> None:
+        data = safe_read_json(self.index_path) if os.path.exists(self.index_path) else None
+        sources = (data or {}).get('sources')
+        self.index = sources if isinstance(sources, dict) else {}
+
+    def save(self) -> bool:
+        return safe_write_json(self.index_path, {
+            'sources': self.index,
+            'last_updated': datetime.now().isoformat()
+        })
+
+    def is_current(self, source: str, stat: os.stat_result, kind: str) -> bool:
+        entry = self.index.get(source)
+        if not entry or entry.get('mtime_ns') != stat.st_mtime_ns or entry.get('size') != stat.st_size:
+            return False
+        if entry.get('kind') != kind or entry.get('formats') != self.formats:
+            return False
+        return all(os.path.exists(os.path.join(self.output_dir, v['file'])) for v in entry.get('variants', []))
+
+    def thumbnails_for(self, source: str) -> List[Dict[str, Any]]:
+        entry = self.index.get(source) or {}
+        return [{'url': f"{THUMBNAIL_URL_PREFIX}/{v['file']}", 'width': v['width'], 'type': v['type']}
+                for v in entry.get('variants', [])]
+
+    def update(self, artists: List[Dict[str, Any]]) -> None:
+        if not self.formats:
+            return
+        with self.lock:
+            os.makedirs(self.output_dir, exist_ok=True)
+            self.load()
+
+            pending: Dict[str, Tuple[str, os.stat_result]] = {}
+            live_sources = set()
+            for artist in artists:
+                for kind in THUMBNAIL_WIDTHS:
+                    source = artist.get(kind)
+                    if not source or is_remote(source):
+                        continue
+                    try:
+                        stat = os.stat(source)
+                    except OSError:
+                        continue
+                    live_sources.add(source)
+                    if not self.is_current(source, stat, kind):
+                        pending[source] = (kind, stat)
+
+            for source in list(self.index):
+                if source not in live_sources:
+                    del self.index[source]
+
+            if pending:
+                self.generate(pending)
+            self.evict(set(pending))
+            self.save()
+
+            for artist in artists:
+                for kind in THUMBNAIL_WIDTHS:
+                    if artist.get(kind) and is_remote(artist[kind]):
+                        continue
+                    thumbnails = self.thumbnails_for(artist.get(kind)) if artist.get(kind) else []
+                    if thumbnails:
+                        artist[f"{kind}_thumbnails"] = thumbnails
+                    else:
+                        artist.pop(f"{kind}_thumbnails", None)
+
+    def generate(self, pending: Dict[str, Tuple[str, os.stat_result]]) -> None:
+        logger.info(f"Generating thumbnails for {len(pending)} images with {self.workers} workers")
+        failed = 0
+        # Spawned, not forked: the scheduler and API threads may hold locks a forked child would inherit
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = {
+                source: pool.submit(render_variants, source, kind, self.formats, self.output_dir)
+                for source, (kind, _) in pending.items()
+            }
+            for source, future in futures.items():
+                kind, stat = pending[source]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failed += 1
+                    logger.warning(f"Could not generate thumbnails for {source}: {str(e)}")
+                    self.index.pop(source, None)
+                    continue
+                self.index[source] = {
+                    'mtime_ns': stat.st_mtime_ns,
+                    'size': stat.st_size,
+                    'kind': kind,
+                    'formats': self.formats,
+                    'hash': result['hash'],
+                    'variants': result['variants']
+                }
+        logger.info(f"Generated thumbnails for {len(pending) - failed} images ({failed} failed)")
+
+    def evict(self, protected: Set[str] = frozenset()) -> int:
+        # Variants are content-addressed, so anything no source references any more is an orphan
+        referenced = {v['file'] for entry in self.index.values() for v in entry.get('variants', [])}
+        files: Dict[str, os.stat_result] = {}
+        removed = 0
+        with os.scandir(self.output_dir) as entries:
+            for entry in entries:
+                if entry.name == os.path.basename(self.index_path) or not entry.is_file():
+                    continue
+                if entry.name in referenced:
+                    files[entry.name] = entry.stat()
+                    continue
+                try:
+                    os.remove(entry.path)
+                    removed += 1
+                except OSError as e:
+                    logger.warning(f"Failed to remove orphaned thumbnail {entry.name}: {str(e)}")
+        if removed:
+            logger.info(f"Removed {removed} orphaned thumbnails")
+
+        total_bytes = sum(stat.st_size for stat in files.values())
+        if total_bytes <= self.max_bytes:
+            return total_bytes
+
+        # Over budget: drop whole sources, least recently served first (nginx reads bump atime),
+        # keeping the ones generated in this pass until last
+        def last_used(source: str) -> Tuple[bool, float]:
+            stats = [files[v['file']] for v in self.index[source].get('variants', []) if v['file'] in files]
+            return source in protected, max((max(st.st_atime, st.st_mtime) for st in stats), default=0.0)
+
+        evicted = 0
+        shared = {}
+        for entry in self.index.values():
+            for v in entry.get('variants', []):
+                shared[v['file']] = shared.get(v['file'], 0) + 1
+        for source in sorted((s for s in self.index if self.index[s].get('variants')), key=last_used):
+            if total_bytes <= self.max_bytes:
+                break
+            entry = self.index[source]
+            for v in entry['variants']:
+                shared[v['file']] -= 1
+                if shared[v['file']] or v['file'] not in files:
+                    continue
+                try:
+                    os.remove(os.path.join(self.output_dir, v['file']))
+                    total_bytes -= files.pop(v['file']).st_size
+                except OSError as e:
+                    logger.warning(f"Failed to evict thumbnail {v['file']}: {str(e)}")
+            # Stays current for this mtime and size, so it is not rendered again until the image changes
+            entry['variants'] = []
+            entry['evicted'] = True
+            evicted += 1
+        logger.info(f"Evicted thumbnails for {evicted} least recently used images to stay under THUMBNAIL_CACHE_MAX_MB")
+        return total_bytes
+
+_thumbnailer: Optional[Thumbnailer] = None
+_thumbnailer_lock = threading.Lock()
+
+def get_thumbnailer() -> Optional[Thumbnailer]:
+    global _thumbnailer
+    if not get_env_bool('THUMBNAILS_ENABLED', True):
+        return None
+    with _thumbnailer_lock:
+        if _thumbnailer is None:
+            if Image is None:
+                logger.warning("Pillow is not installed; serving original artist images without thumbnails")
+            _thumbnailer = Thumbnailer()
+        return _thumbnailer
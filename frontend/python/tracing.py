@@ -0,0 +1,194 @@
+import os
+import json
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+from python.common import DATA_DIR, get_env_bool, get_env_int, safe_read_json, safe_write_json
+
+logger = logging.getLogger(__name__)
+
+TRACE_DIR: str = os.path.join(DATA_DIR, "traces")
+TRACE_INDEX_PATH: str = os.path.join(TRACE_DIR, "index.json")
+TRACE_RETENTION: int = 20
+TRACE_MAX_EVENTS: int = 200000
+TOP_SINKS: int = 10
+
+class NullSpan:
+    def __enter__(self) -> 'NullSpan':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    def set(self, **args: Any) -> None:
+        pass
+
+NULL_SPAN = NullSpan()
+
+class Span:
+    def __init__(self, trace: 'Trace', name: str, category: str, args: Dict[str, Any]):
+        self.trace = trace
+        self.name: str = name
+        self.category: str = category
+        self.args: Dict[str, Any] = args
+        self.started: float = 0.0
+        self.child_seconds: float = 0.0
+
+    def __enter__(self) -> 'Span':
+        self.started = time.perf_counter()
+        self.trace.stack().append(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        seconds = time.perf_counter() - self.started
+        stack = self.trace.stack()
+        stack.pop()
+        if stack:
+            stack[-1].child_seconds += seconds
+        self.trace.add(self.name, self.category, self.started, seconds, seconds - self.child_seconds, self.args)
+
+    def set(self, **args: Any) -> None:
+        self.args.update(args)
+
+class Trace:
+    def __init__(self, name: str):
+        self.name: str = name
+        self.started_at: datetime = datetime.now()
+        self.origin: float = time.perf_counter()
+        self.max_events: int = get_env_int('TRACE_MAX_EVENTS', TRACE_MAX_EVENTS)
+        self.events: List[Dict[str, Any]] = []
+        self.dropped: int = 0
+        # (category, name) -> [count, total seconds, self seconds, bytes]
+        self.totals: Dict[Tuple[str, str], List[float]] = {}
+        self.threads: Dict[int, str] = {}
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def stack(self) -> List[Span]:
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+
+    def add(self, name: str, category: str, started: float, seconds: float, self_seconds: float, args: Dict[str, Any]) -> None:
+        thread = threading.current_thread()
+        with self.lock:
+            totals = self.totals.setdefault((category, name), [0, 0.0, 0.0, 0])
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] += self_seconds
+            totals[3] += args.get('bytes', 0)
+            self.threads[thread.ident] = thread.name
+            if len(self.events) >= self.max_events:
+                self.dropped += 1
+                return
+            self.events.append({
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': round((started - self.origin) * 1e6, 1),
+                'dur': round(seconds * 1e6, 1),
+                'pid': os.getpid(),
+                'tid': thread.ident,
+                'args': args
+            })
+
+    def summary(self, duration: float, status: str, top: int = TOP_SINKS) -> Dict[str, Any]:
+        # Self time excludes nested spans, so the sinks add up to the time actually spent
+        with self.lock:
+            sinks = sorted(self.totals.items(), key=lambda item: item[1][2], reverse=True)
+            categories: Dict[str, float] = {}
+            for (category, _), (_, _, self_seconds, _) in self.totals.items():
+                categories[category] = categories.get(category, 0.0) + self_seconds
+            return {
+                'name': self.name,
+                'started_at': self.started_at.isoformat(),
+                'duration_ms': round(duration * 1000, 1),
+                'status': status,
+                'spans': len(self.events) + self.dropped,
+                'dropped_spans': self.dropped,
+                'categories': {category: round(seconds * 1000, 1) for category, seconds in
+                               sorted(categories.items(), key=lambda item: item[1], reverse=True)},
+                'top_sinks': [{
+                    'category': category,
+                    'name': name,
+                    'count': int(count),
+                    'total_ms': round(total * 1000, 1),
+                    'self_ms': round(self_seconds * 1000, 1),
+                    'bytes': int(size)
+                } for (category, name), (count, total, self_seconds, size) in sinks[:top]]
+            }
+
+    def chrome_events(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            names = [{'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': ident, 'args': {'name': name}}
+                     for ident, name in self.threads.items()]
+            return names + list(self.events)
+
+_active: Optional[Trace] = None
+_active_lock = threading.Lock()
+
+def tracing_enabled() -> bool:
+    return get_env_bool('TRACE_SCANS', False)
+
+def span(name: str, category: str, **args: Any):
+    trace = _active
+    return Span(trace, name, category, args) if trace is not None else NULL_SPAN
+
+def record_span(name: str, category: str, seconds: float, **args: Any) -> None:
+    # For work that was timed elsewhere, such as JSON I/O
+    trace = _active
+    if trace is None:
+        return
+    stack = trace.stack()
+    if stack:
+        stack[-1].child_seconds += seconds
+    trace.add(name, category, time.perf_counter() - seconds, seconds, seconds, args)
+
+def start_trace(name: str) -> Optional[Trace]:
+    global _active
+    if not tracing_enabled():
+        return None
+    with _active_lock:
+        _active = Trace(name)
+        return _active
+
+def finish_trace(status: str = 'completed') -> Optional[str]:
+    global _active
+    with _active_lock:
+        trace, _active = _active, None
+    if trace is None:
+        return None
+
+    duration = time.perf_counter() - trace.origin
+    summary = trace.summary(duration, status)
+    file_name = f"{trace.name}-{trace.started_at.strftime('%Y%m%dT%H%M%S')}.json"
+    try:
+        os.makedirs(TRACE_DIR, exist_ok=True)
+        temp_path = os.path.join(TRACE_DIR, f".{file_name}.tmp")
+        with open(temp_path, 'w') as f:
+            json.dump({'traceEvents': trace.chrome_events(), 'displayTimeUnit': 'ms', 'otherData': summary}, f)
+        os.replace(temp_path, os.path.join(TRACE_DIR, file_name))
+    except OSError as e:
+        logger.error(f"Failed to write trace {file_name}: {str(e)}")
+        return None
+
+    summary['file'] = file_name
+    traces = [summary] + load_trace_index()
+    retention = max(1, get_env_int('TRACE_RETENTION', TRACE_RETENTION))
+    for expired in traces[retention:]:
+        try:
+            os.remove(os.path.join(TRACE_DIR, expired['file']))
+        except OSError:
+            pass
+    safe_write_json(TRACE_INDEX_PATH, {'traces': traces[:retention]})
+    top = summary['top_sinks'][0] if summary['top_sinks'] else None
+    logger.info(f"Wrote trace {file_name}" + (f"; top sink {top['category']}/{top['name']} at {top['self_ms']}ms" if top else ""))
+    return file_name
+
+def load_trace_index() -> List[Dict[str, Any]]:
+    data = safe_read_json(TRACE_INDEX_PATH) if os.path.exists(TRACE_INDEX_PATH) else None
+    traces = (data or {}).get('traces')
+    return traces if isinstance(traces, list) else []
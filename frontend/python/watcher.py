@@ -0,0 +1,267 @@
+import os
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Any, Set
+from python.common import MUSIC_DIR, get_env_float
+from python.scanner import IMAGE_EXTENSIONS
+
+logger = logging.getLogger(__name__)
+
+WATCH_MODES: List[str] = ['off', 'auto', 'inotify', 'poll']
+DEBOUNCE_SECONDS: float = 5.0
+MAX_DELAY_SECONDS: float = 60.0
+POLL_SECONDS: float = 60.0
+
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ONLYDIR
+ROOT_MASK = WATCH_MASK | IN_DELETE_SELF | IN_MOVE_SELF
+EVENT_HEADER = struct.Struct('iIII')
+
+def library_watch_mode() -> str:
+    mode = os.getenv('LIBRARY_WATCH', 'off').strip().lower()
+    if mode not in WATCH_MODES:
+        logger.warning(f"Unknown LIBRARY_WATCH value {mode!r}, expected one of {', '.join(WATCH_MODES)}; watching is off")
+        return 'off'
+    return mode
+
+def is_relevant(name: str, is_dir: bool) -> bool:
+    # Album folders and artist images are all the artist store cares about
+    return is_dir or os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+
+class InotifyBackend:
+    name: str = 'inotify'
+
+    def __init__(self, music_dir: str = MUSIC_DIR):
+        self.music_dir: str = music_dir
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd: int = -1
+        self.root_wd: int = -1
+        # watch descriptor -> artist folder name
+        self.artist_wds: Dict[int, str] = {}
+
+    def add_watch(self, path: str, mask: int) -> int:
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error == errno.ENOSPC:
+                raise OSError(error, "inotify watch limit reached; raise fs.inotify.max_user_watches or use LIBRARY_WATCH=poll")
+            raise OSError(error, f"{os.strerror(error)}: {path}")
+        return wd
+
+    def watch_artist(self, name: str) -> None:
+        try:
+            self.artist_wds[self.add_watch(os.path.join(self.music_dir, name), WATCH_MASK)] = name
+        except OSError as e:
+            if e.errno == errno.ENOSPC:
+                raise
+            # The folder vanished or is not a directory; its own event will follow
+
+    def start(self) -> None:
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        try:
+            self.root_wd = self.add_watch(self.music_dir, ROOT_MASK)
+            with os.scandir(self.music_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        self.watch_artist(entry.name)
+        except OSError:
+            os.close(self.fd)
+            raise
+        logger.info(f"Watching {len(self.artist_wds)} artist folders in {self.music_dir} with inotify")
+
+    def poll(self, timeout: float) -> Optional[Set[str]]:
+        # Returns the artist folders that changed, or None when the whole library must be rescanned
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed: Set[str] = set()
+        rescan = False
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b'\0')
+            name = os.fsdecode(name)
+            offset += EVENT_HEADER.size + length
+            is_dir = bool(mask & IN_ISDIR)
+
+            if mask & IN_Q_OVERFLOW:
+                logger.warning("inotify queue overflowed, rescanning the whole library")
+                rescan = True
+            elif wd == self.root_wd:
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    logger.warning(f"{self.music_dir} itself was moved or deleted, rescanning the whole library")
+                    rescan = True
+                elif name and is_dir:
+                    # Re-adding a watch on a renamed folder returns its existing descriptor
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        self.watch_artist(name)
+                    changed.add(name)
+            elif mask & IN_IGNORED:
+                self.artist_wds.pop(wd, None)
+            elif wd in self.artist_wds and (not name or is_relevant(name, is_dir)):
+                changed.add(self.artist_wds[wd])
+        return None if rescan else changed
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+class PollingBackend:
+    name: str = 'poll'
+
+    def __init__(self, music_dir: str = MUSIC_DIR):
+        self.music_dir: str = music_dir
+        self.interval: float = get_env_float('LIBRARY_POLL_SECONDS', POLL_SECONDS)
+        self.next_poll: float = 0.0
+        # artist folder -> {mtime_ns, inode, images: {file name: (mtime_ns, size)}}
+        self.snapshot: Dict[str, Dict[str, Any]] = {}
+
+    def image_stats(self, path: str) -> Dict[str, Any]:
+        images = {}
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_file() and is_relevant(entry.name, False):
+                    stat = entry.stat()
+                    images[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return images
+
+    def take_snapshot(self) -> Set[str]:
+        changed = set()
+        current = {}
+        with os.scandir(self.music_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                stat = entry.stat()
+                previous = self.snapshot.get(entry.name)
+                try:
+                    if previous and previous['mtime_ns'] == stat.st_mtime_ns and previous['inode'] == stat.st_ino:
+                        # Images overwritten in place do not touch the folder mtime, so stat the known ones
+                        images = {}
+                        for file_name in previous['images']:
+                            try:
+                                image_stat = os.stat(os.path.join(entry.path, file_name))
+                                images[file_name] = (image_stat.st_mtime_ns, image_stat.st_size)
+                            except FileNotFoundError:
+                                pass
+                    else:
+                        images = self.image_stats(entry.path)
+                except OSError as e:
+                    logger.warning(f"Could not poll {entry.path}: {str(e)}")
+                    continue
+                current[entry.name] = {'mtime_ns': stat.st_mtime_ns, 'inode': stat.st_ino, 'images': images}
+                if previous != current[entry.name]:
+                    changed.add(entry.name)
+        changed.update(name for name in self.snapshot if name not in current)
+        self.snapshot = current
+        return changed
+
+    def start(self) -> None:
+        self.take_snapshot()
+        self.next_poll = time.monotonic() + self.interval
+        logger.info(f"Polling {len(self.snapshot)} artist folders in {self.music_dir} every {self.interval:.0f}s")
+
+    def poll(self, timeout: float) -> Optional[Set[str]]:
+        remaining = self.next_poll - time.monotonic()
+        if remaining > 0:
+            time.sleep(min(timeout, remaining))
+            return set()
+        self.next_poll = time.monotonic() + self.interval
+        return self.take_snapshot()
+
+    def close(self) -> None:
+        pass
+
+class LibraryWatcher:
+    def __init__(self, on_change: Callable[[Optional[List[str]]], None], music_dir: str = MUSIC_DIR, mode: str = 'auto'):
+        self.on_change = on_change
+        self.music_dir: str = music_dir
+        self.mode: str = mode
+        self.debounce: float = get_env_float('LIBRARY_WATCH_DEBOUNCE_SECONDS', DEBOUNCE_SECONDS)
+        self.max_delay: float = get_env_float('LIBRARY_WATCH_MAX_DELAY_SECONDS', MAX_DELAY_SECONDS)
+        self.backend = None
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self.mode in ('auto', 'inotify'):
+            try:
+                self.backend = InotifyBackend(self.music_dir)
+                self.backend.start()
+            except (OSError, AttributeError) as e:
+                # AttributeError: no inotify symbols in this libc
+                if self.mode == 'inotify':
+                    raise
+                logger.warning(f"inotify is unavailable ({str(e)}), falling back to polling")
+                self.backend = None
+        if self.backend is None:
+            self.backend = PollingBackend(self.music_dir)
+            self.backend.start()
+
+        self.thread = threading.Thread(target=self.run, name='library-watcher', daemon=True)
+        self.thread.start()
+
+    def run(self) -> None:
+        pending: Set[str] = set()
+        rescan = False
+        first_event = 0.0
+        last_event = 0.0
+        while True:
+            try:
+                changes = self.backend.poll(1.0)
+            except Exception as e:
+                logger.error(f"Library watcher failed: {str(e)}")
+                changes = None
+                time.sleep(self.debounce)
+
+            now = time.monotonic()
+            if changes is None or changes:
+                if not pending and not rescan:
+                    first_event = now
+                last_event = now
+                if changes is None:
+                    rescan = True
+                else:
+                    pending.update(changes)
+
+            # Library imports arrive as bursts; wait for them to settle, but not forever
+            if (pending or rescan) and (now - last_event >= self.debounce or now - first_event >= self.max_delay):
+                names = None if rescan else sorted(pending)
+                pending = set()
+                rescan = False
+                try:
+                    self.on_change(names)
+                except Exception as e:
+                    logger.error(f"Error applying library changes: {str(e)}")
+
+def start_library_watcher(on_change: Callable[[Optional[List[str]]], None]) -> Optional[LibraryWatcher]:
+    mode = library_watch_mode()
+    if mode == 'off':
+        return None
+    watcher = LibraryWatcher(on_change, MUSIC_DIR, mode)
+    watcher.start()
+    return watcher
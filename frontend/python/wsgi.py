@@ -1,21 +1,154 @@
 import sys
 import os
-from flask import Flask, send_from_directory
-from python.main import main as tracker_main, DATA_DIR, MUSIC_DIR
+import json
+import time
 import threading
-import multiprocessing
+from datetime import datetime
+from flask import Flask, Response, jsonify, request, send_from_directory, stream_with_context
+from python.common import DATA_DIR, MUSIC_DIR, get_env_float, get_env_int
+from python.control import ACTIONS, HEARTBEAT_SECONDS, load_scan_status, pending_requests, request_action
+from python.feed import get_feed
+from python.library import get_library_index
+from python.metrics import load_snapshot, render_prometheus
+from python.tracing import TRACE_DIR, load_trace_index
 
 if not sys.warnoptions:
     devnull = open(os.devnull, 'w')
     sys.stdout = devnull
     sys.stderr = devnull
 
-tracker_started = multiprocessing.Value('i', 0)
+FEED_PAGE_LIMIT = 500
+FEED_POLL_SECONDS = 1.0
+FEED_PING_SECONDS = 15.0
+# Streams must end before uWSGI's 120s harakiri; EventSource reconnects with Last-Event-ID
+FEED_STREAM_SECONDS = 90.0
+
+# Each stream holds a worker thread, so cap them per process to leave room for other requests
+feed_streams = threading.BoundedSemaphore(get_env_int('FEED_MAX_STREAMS', 1))
+
+def sse_event(event, data, event_id=None):
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines += [f"event: {event}", f"data: {json.dumps(data, separators=(',', ':'))}"]
+    return "\n".join(lines) + "\n\n"
+
+def scan_status_payload():
+    status = load_scan_status() or {'state': 'unknown'}
+    heartbeat = status.get('heartbeat_at')
+    age = (datetime.now() - datetime.fromisoformat(heartbeat)).total_seconds() if heartbeat else None
+    # Allow for a couple of missed heartbeats before reporting the scheduler as down
+    status['scheduler_alive'] = age is not None and age < HEARTBEAT_SECONDS * 3
+    status['pending'] = [pending['action'] for pending in pending_requests()]
+    return status
 
 def create_app():
     static_folder = os.path.join(os.path.dirname(os.path.dirname(__file__)), "dist")
     app = Flask(__name__, static_folder=static_folder)
 
+    @app.route("/metrics")
+    def serve_metrics():
+        # The tracker runs in the scheduler process, so every worker renders its snapshot file
+        return Response(render_prometheus(load_snapshot()), mimetype="text/plain; version=0.0.4")
+
+    @app.route("/library")
+    def serve_library():
+        try:
+            year = request.args.get("year")
+            year = int(year) if year is not None else None
+            offset = max(0, int(request.args.get("offset", 0)))
+            limit = request.args.get("limit")
+            limit = max(0, int(limit)) if limit is not None else None
+        except ValueError:
+            return Response('{"error": "year, offset and limit must be integers"}', status=400, mimetype="application/json")
+
+        etag, body, gzipped = get_library_index().render(year, offset, limit)
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        # Weak comparison, as If-None-Match requires; the tags themselves are stored quoted
+        if request.if_none_match.contains_weak(etag.strip('"')):
+            return Response(status=304, headers=headers)
+        if "gzip" in request.headers.get("Accept-Encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            body = gzipped
+        return Response(body, mimetype="application/json", headers=headers)
+
+    @app.route("/feed")
+    def serve_feed():
+        try:
+            cursor = int(request.args.get("cursor", 0))
+            limit = min(FEED_PAGE_LIMIT, max(1, int(request.args.get("limit", FEED_PAGE_LIMIT))))
+        except ValueError:
+            return jsonify({"error": "cursor and limit must be integers"}), 400
+
+        entries, latest, reset = get_feed().since(cursor, limit)
+        return jsonify({
+            "entries": entries,
+            "cursor": entries[-1]["cursor"] if entries else (latest if reset else cursor),
+            "latest": latest,
+            "reset": reset,
+            "more": bool(entries) and entries[-1]["cursor"] < latest
+        })
+
+    @app.route("/feed/stream")
+    def stream_feed():
+        try:
+            cursor = request.headers.get("Last-Event-ID") or request.args.get("cursor")
+            cursor = int(cursor) if cursor is not None else None
+        except ValueError:
+            return jsonify({"error": "cursor must be an integer"}), 400
+        if not feed_streams.acquire(blocking=False):
+            return jsonify({"error": "too many open feed streams, poll /api/feed instead"}), 503, {"Retry-After": "30"}
+
+        feed = get_feed()
+        stream_seconds = get_env_float('FEED_STREAM_SECONDS', FEED_STREAM_SECONDS)
+
+        def generate(cursor):
+            # Without a cursor the stream starts from now
+            if cursor is None:
+                cursor = feed.since(0, 0)[1]
+            yield f"retry: {int(FEED_POLL_SECONDS * 1000)}\n\n"
+            started = last_sent = time.monotonic()
+            while time.monotonic() - started < stream_seconds:
+                entries, latest, reset = feed.since(cursor, FEED_PAGE_LIMIT)
+                if reset:
+                    yield sse_event("reset", {"latest": latest})
+                    entries = []
+                    cursor = latest
+                for entry in entries:
+                    yield sse_event(entry["type"], entry, entry["cursor"])
+                    cursor = entry["cursor"]
+                if entries or reset:
+                    last_sent = time.monotonic()
+                elif time.monotonic() - last_sent >= FEED_PING_SECONDS:
+                    yield ": ping\n\n"
+                    last_sent = time.monotonic()
+                time.sleep(FEED_POLL_SECONDS)
+
+        headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        response = Response(stream_with_context(generate(cursor)), mimetype="text/event-stream", headers=headers)
+        # The server closes the response even when the client leaves before the generator starts
+        response.call_on_close(feed_streams.release)
+        return response
+
+    @app.route("/traces")
+    def list_traces():
+        # Newest first, each with its top time sinks; the files open in chrome://tracing or Perfetto
+        return jsonify({"traces": load_trace_index()})
+
+    @app.route("/traces/<path:filename>")
+    def serve_trace(filename):
+        return send_from_directory(TRACE_DIR, filename, as_attachment=True)
+
+    @app.route("/scan", methods=["GET"])
+    def get_scan():
+        return jsonify(scan_status_payload())
+
+    @app.route("/scan", methods=["POST"])
+    def post_scan():
+        action = request.args.get("action") or (request.get_json(silent=True) or {}).get("action") or "scan"
+        if action not in ACTIONS:
+            return jsonify({"error": f"action must be one of {', '.join(ACTIONS)}"}), 400
+        queued = request_action(action)
+        return jsonify({"request": queued, "status": scan_status_payload()}), 202
+
     @app.route("/data/<path:filename>")
     def serve_data(filename):
         return send_from_directory(DATA_DIR, filename)
@@ -38,12 +171,6 @@ def create_app():
             return send_from_directory(app.static_folder, path)
         return send_from_directory(app.static_folder, "index.html")
 
-    with tracker_started.get_lock():
-        if tracker_started.value == 0:
-            tracker_started.value = 1
-            tracker_thread = threading.Thread(target=tracker_main, daemon=True)
-            tracker_thread.start()
-
     return app
 
 app = create_app()
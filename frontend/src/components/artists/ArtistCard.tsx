@@ -1,10 +1,11 @@
 import { useState, CSSProperties } from "react";
 import { Link } from "react-router-dom";
-import { cn } from "../../lib/utils";
+import { cn, Thumbnail, thumbnailSrcSet } from "../../lib/utils";
 
 interface ArtistCardProps {
   name: string;
   cover: string;
+  coverThumbnails?: Thumbnail[];
   className?: string;
   color?: number;
 }
@@ -13,10 +14,11 @@ function numberToHex(num: number): string {
   return `#${num.toString(16).padStart(6, '0')}`;
 }
 
-export function ArtistCard({ name, cover, className, color }: ArtistCardProps) {
+export function ArtistCard({ name, cover, coverThumbnails, className, color }: ArtistCardProps) {
   const [imageError, setImageError] = useState(false);
 
   const imageSrc = imageError || !cover ? '/icons/trackly.png' : cover;
+  const thumbnails = imageError ? undefined : coverThumbnails;
 
   const colorHex = color ? numberToHex(color) : '#000000';
   
@@ -36,12 +38,17 @@ export function ArtistCard({ name, cover, className, color }: ArtistCardProps) {
       style={{ borderColor: colorHex }}
     >
       <div className="aspect-square w-full">
-        <img
-          src={imageSrc}
-          alt={`${name}'s cover`}
-          onError={() => setImageError(true)}
-          className="h-full w-full object-cover transition-transform duration-300"
-        />
+        <picture>
+          <source type="image/avif" srcSet={thumbnailSrcSet(thumbnails, 'image/avif')} sizes="256px" />
+          <source type="image/webp" srcSet={thumbnailSrcSet(thumbnails, 'image/webp')} sizes="256px" />
+          <img
+            src={imageSrc}
+            alt={`${name}'s cover`}
+            loading="lazy"
+            onError={() => setImageError(true)}
+            className="h-full w-full object-cover transition-transform duration-300"
+          />
+        </picture>
       </div>
       <div 
         className="absolute inset-x-0 bottom-0 px-4 pb-3 pt-12 transition-all duration-300 group-hover:pt-24"
@@ -1,7 +1,7 @@
 import { useMemo } from "react";
 import { Link } from "react-router-dom";
 import { ChevronLeft } from "lucide-react";
-import { Artist, formatDate } from "../../lib/utils";
+import { Artist, formatDate, thumbnailSrcSet } from "../../lib/utils";
 import { YearFilter, FilterPeriod } from "../ui/YearFilter";
 
 interface ArtistDetailProps {
@@ -44,11 +44,15 @@ export function ArtistDetail({
     <div className="min-h-screen">
       <div className="relative mx-auto" style={{ maxWidth: '622px' }}>
         <div className="h-[350px] overflow-hidden rounded-lg">
-          <img
-            src={artist.backdrop || '/icons/fallback_backdrop.jpg'}
-            alt={`${artist.name}'s backdrop`}
-            className="h-full w-full object-cover"
-          />
+          <picture>
+            <source type="image/avif" srcSet={thumbnailSrcSet(artist.backdropThumbnails, 'image/avif')} sizes="622px" />
+            <source type="image/webp" srcSet={thumbnailSrcSet(artist.backdropThumbnails, 'image/webp')} sizes="622px" />
+            <img
+              src={artist.backdrop || '/icons/fallback_backdrop.jpg'}
+              alt={`${artist.name}'s backdrop`}
+              className="h-full w-full object-cover"
+            />
+          </picture>
           <div 
             className="absolute inset-0"
             style={{
@@ -83,11 +87,15 @@ export function ArtistDetail({
             className="relative h-48 w-48 overflow-hidden rounded-full border-4 shadow-lg"
             style={{ borderColor: colorHex }}
           >
-            <img
-              src={artist.cover || '/icons/trackly.png'}
-              alt={`${artist.name}'s cover`}
-              className="h-full w-full object-cover"
-            />
+            <picture>
+              <source type="image/avif" srcSet={thumbnailSrcSet(artist.coverThumbnails, 'image/avif')} sizes="192px" />
+              <source type="image/webp" srcSet={thumbnailSrcSet(artist.coverThumbnails, 'image/webp')} sizes="192px" />
+              <img
+                src={artist.cover || '/icons/trackly.png'}
+                alt={`${artist.name}'s cover`}
+                className="h-full w-full object-cover"
+              />
+            </picture>
           </div>
         </div>
       </div>
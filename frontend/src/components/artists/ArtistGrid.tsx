@@ -43,6 +43,7 @@ export function ArtistGrid({
             key={artist.name}
             name={artist.name}
             cover={artist.cover || '/icons/trackly.png'}
+            coverThumbnails={artist.coverThumbnails}
             color={artist.color}
           />
         ))}
@@ -25,10 +25,23 @@ export function calculateGridColumns(itemsPerRow: number): string {
   return `repeat(${Math.max(4, Math.min(16, itemsPerRow))}, minmax(0, 1fr))`;
 }
 
+export interface Thumbnail {
+  url: string;
+  width: number;
+  type: string;
+}
+
+export function thumbnailSrcSet(thumbnails: Thumbnail[] | undefined, type: string): string | undefined {
+  const matches = (thumbnails || []).filter(thumbnail => thumbnail.type === type);
+  return matches.length ? matches.map(thumbnail => `${thumbnail.url} ${thumbnail.width}w`).join(', ') : undefined;
+}
+
 export interface Artist {
   name: string;
   cover?: string;
   backdrop?: string;
+  coverThumbnails?: Thumbnail[];
+  backdropThumbnails?: Thumbnail[];
   fallbackImage?: string;
   releases: Release[];
   color: number;
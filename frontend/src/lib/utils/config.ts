@@ -1,9 +1,13 @@
+import type { Thumbnail } from '../utils';
+
 interface ConfigArtist {
   name: string;
   id: string;
   color: number;
   backdrop?: string;
   cover?: string;
+  cover_thumbnails?: Thumbnail[];
+  backdrop_thumbnails?: Thumbnail[];
 }
 
 interface ArtistsConfig {
@@ -22,6 +26,23 @@ interface NotifiedConfig {
   notified_albums: NotifiedAlbum[];
 }
 
+interface LibraryArtist {
+  name: string;
+  color: number;
+  cover: string | null;
+  backdrop: string | null;
+  cover_thumbnails: Thumbnail[];
+  backdrop_thumbnails: Thumbnail[];
+  releases: { title: string; releaseDate: string }[];
+}
+
+interface LibraryResponse {
+  artists: LibraryArtist[];
+  total: number;
+  years: number[];
+  last_updated: string;
+}
+
 export const APP_VERSION = '1.1.0.5';
 
 async function findAvailableYears(): Promise<number[]> {
@@ -60,7 +81,37 @@ async function loadReleasesForYear(year: number): Promise<NotifiedAlbum[]> {
   }
 }
 
+async function loadLibrary() {
+  const response = await fetch('/api/library');
+  if (!response.ok) {
+    throw new Error(`Library API returned ${response.status}`);
+  }
+  const data: LibraryResponse = await response.json();
+
+  return data.artists.map(artist => ({
+    name: artist.name,
+    cover: artist.cover || null,
+    backdrop: artist.backdrop || null,
+    coverThumbnails: artist.cover_thumbnails,
+    backdropThumbnails: artist.backdrop_thumbnails,
+    fallbackImage: '/icons/trackly.png',
+    color: artist.color,
+    releases: artist.releases.map(release => ({
+      id: `${artist.name}-${release.title}`,
+      title: release.title,
+      artist: artist.name,
+      releaseDate: release.releaseDate
+    }))
+  }));
+}
+
 export async function loadArtistsConfig() {
+  try {
+    return await loadLibrary();
+  } catch (error) {
+    console.warn('Library API unavailable, loading data files directly:', error);
+  }
+
   try {
     const response = await fetch('/data/artists.json');
     if (!response.ok) {
@@ -78,6 +129,8 @@ export async function loadArtistsConfig() {
       name: artist.name,
       cover: artist.cover || null,
       backdrop: artist.backdrop || null,
+      coverThumbnails: artist.cover_thumbnails || [],
+      backdropThumbnails: artist.backdrop_thumbnails || [],
       fallbackImage: '/icons/trackly.png',
       color: artist.color,
       releases: allReleases
@@ -0,0 +1,11 @@
+import os
+import sys
+import tempfile
+
+# Paths under /data and /music are read at import time, so point them somewhere disposable first
+TEST_DATA_DIR = tempfile.mkdtemp(prefix='trackly-tests-')
+os.environ['TRACKLY_DATA_DIR'] = TEST_DATA_DIR
+os.environ['TRACKLY_MUSIC_DIR'] = os.path.join(TEST_DATA_DIR, 'music')
+os.makedirs(os.environ['TRACKLY_MUSIC_DIR'], exist_ok=True)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta
+from python.activity import ArtistActivity
+
+NOW = datetime(2026, 6, 1, 12, 0)
+
+def make_activity(tmp_path):
+    activity = ArtistActivity(str(tmp_path / 'artist_activity.json'))
+    # 'new' is never observed or checked, so its history is unknown
+    activity.observe('active', [{'first-release-date': '2026-03-01'}], complete_history=True)
+    activity.observe('dormant', [{'first-release-date': '2021-05-01'}], complete_history=True)
+    activity.observe('inactive', [{'first-release-date': '2005-05-01'}], complete_history=True)
+    activity.mark_checked(['active'], NOW - timedelta(hours=1))
+    activity.mark_checked(['dormant'], NOW - timedelta(days=1))
+    activity.mark_checked(['inactive'], NOW - timedelta(days=40))
+    return activity
+
+def artists(*ids):
+    return [{'name': artist_id.title(), 'id': artist_id} for artist_id in ids]
+
+def names(artists):
+    return [artist['id'] for artist in artists]
+
+def test_tiers_follow_the_latest_release(tmp_path):
+    activity = make_activity(tmp_path)
+    assert activity.tier('active', NOW.date()) == 'active'
+    assert activity.tier('dormant', NOW.date()) == 'dormant'
+    assert activity.tier('inactive', NOW.date()) == 'inactive'
+    assert activity.tier('new', NOW.date()) == 'active'
+
+def test_yearly_releases_move_an_artist_up_a_tier(tmp_path):
+    activity = ArtistActivity(str(tmp_path / 'artist_activity.json'))
+    activity.dormant_after = timedelta(days=90)
+    activity.observe('steady', [{'first-release-date': f'{year}-01-01'} for year in range(2018, 2027)])
+    activity.observe('sporadic', [{'first-release-date': f'{year}-01-01'} for year in (2018, 2022, 2026)])
+    assert activity.tier('steady', NOW.date()) == 'active'
+    assert activity.tier('sporadic', NOW.date()) == 'dormant'
+
+def test_plan_checks_only_due_artists(tmp_path):
+    activity = make_activity(tmp_path)
+    due, probes = activity.plan(artists('new', 'active', 'dormant', 'inactive') + [{'name': 'No ID', 'id': None}],
+                                budget=0, cost=lambda count: count, max_probes=1, now=NOW)
+
+    # The dormant artist was checked a day ago and is not due for a week
+    assert names(probes) == ['new']
+    assert names(due) == ['active', 'inactive']
+
+def test_plan_respects_the_request_budget(tmp_path):
+    activity = make_activity(tmp_path)
+    due, probes = activity.plan(artists('new', 'active', 'dormant', 'inactive'),
+                                budget=2, cost=lambda count: count, max_probes=1, now=NOW)
+
+    # The longest overdue artists come first, and there is nothing left over for a probe
+    assert names(due) == ['new', 'active']
+    assert probes == []
+
+def test_plan_without_probes_checks_unknown_artists_normally(tmp_path):
+    activity = make_activity(tmp_path)
+    due, probes = activity.plan(artists('new', 'inactive'), budget=0, cost=lambda count: count, max_probes=0, now=NOW)
+    assert names(due) == ['new', 'inactive']
+    assert probes == []
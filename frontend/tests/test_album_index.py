@@ -0,0 +1,24 @@
+import pytest
+from python.album_index import normalize_album_title
+
+@pytest.mark.parametrize('title, expected', [
+    ("OK Computer", "ok computer"),
+    ("OK Computer (Deluxe Edition)", "ok computer"),
+    ("Abbey Road [2019 Remaster]", "abbey road"),
+    ("Rumours - 35th Anniversary Edition", "rumours"),
+    ("In Rainbows (2007)", "in rainbows"),
+    ("In Rainbows (2007) [Deluxe]", "in rainbows"),
+    ("(1997) OK Computer", "ok computer"),
+    ("1997 - OK Computer", "ok computer"),
+    ("Simon & Garfunkel", "simon and garfunkel"),
+    ("ＡＢＣ", "abc"),
+])
+def test_normalize_album_title(title, expected):
+    assert normalize_album_title(title) == expected
+
+@pytest.mark.parametrize('title, expected', [("2020 Vision", "2020 vision"), ("1999", "1999")])
+def test_leading_year_that_is_the_title_is_kept(title, expected):
+    assert normalize_album_title(title) == expected
+
+def test_edition_words_inside_the_title_are_kept():
+    assert normalize_album_title("Special Herbs") == "special herbs"
@@ -0,0 +1,56 @@
+import json
+from datetime import datetime, timedelta
+from python.artist_cache import ArtistIdCache
+
+def make_cache(tmp_path, overrides=None):
+    overrides_path = tmp_path / 'artist_overrides.json'
+    if overrides is not None:
+        overrides_path.write_text(json.dumps(overrides))
+    cache = ArtistIdCache(str(tmp_path / 'artist_ids.json'), str(overrides_path))
+    cache.load()
+    return cache
+
+def age_entry(cache, name, days):
+    cache.entries[name]['resolved_at'] = (datetime.now() - timedelta(days=days)).isoformat()
+
+def test_stored_ids_expire_after_ttl(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.store("Radiohead", "mbid-radiohead")
+    assert cache.lookup("radiohead") == (True, "mbid-radiohead")
+
+    age_entry(cache, "radiohead", cache.ttl.days + 1)
+    assert cache.lookup("Radiohead") == (False, None)
+    # Expired entries still decide over IDs stored in artists.json
+    assert cache.has_entry("Radiohead")
+
+def test_negative_entries_use_the_shorter_ttl(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.store("Unknown Band", None)
+    assert cache.lookup("Unknown Band") == (True, None)
+
+    age_entry(cache, "unknown band", cache.negative_ttl.days + 1)
+    assert cache.lookup("Unknown Band") == (False, None)
+
+def test_names_are_normalized(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.store("  Sigur   Rós ", "mbid-sigur-ros")
+    assert cache.lookup("SIGUR RÓS") == (True, "mbid-sigur-ros")
+
+def test_overrides_win_over_cached_ids(tmp_path):
+    cache = make_cache(tmp_path, {"The  Band": "mbid-override", "Hidden": None})
+    cache.store("The Band", "mbid-cached")
+
+    assert cache.lookup("the band") == (True, "mbid-override")
+    assert cache.has_override("THE BAND")
+    # A null override keeps the artist unresolved without asking MusicBrainz
+    assert cache.lookup("Hidden") == (True, None)
+    assert not cache.has_override("Someone Else")
+
+def test_entries_survive_a_reload(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.store("Björk", "mbid-bjork")
+    assert cache.save()
+
+    reloaded = make_cache(tmp_path)
+    assert reloaded.lookup("björk") == (True, "mbid-bjork")
+    assert reloaded.lookup("Nobody") == (False, None)
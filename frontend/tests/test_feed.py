@@ -0,0 +1,62 @@
+import python.feed as feed_module
+from python.feed import ReleaseFeed, artist_changes
+
+def make_feed(tmp_path, entries=0):
+    feed = ReleaseFeed(str(tmp_path / 'feed.jsonl'))
+    for number in range(entries):
+        feed.append('release', {'number': number + 1})
+    return feed
+
+def cursors(entries):
+    return [entry['cursor'] for entry in entries]
+
+def test_since_returns_entries_after_the_cursor(tmp_path):
+    feed = make_feed(tmp_path, 3)
+
+    entries, latest, reset = feed.since(0)
+    assert (cursors(entries), latest, reset) == ([1, 2, 3], 3, False)
+    entries, latest, reset = feed.since(2)
+    assert (cursors(entries), latest, reset) == ([3], 3, False)
+    entries, latest, reset = feed.since(3)
+    assert (cursors(entries), latest, reset) == ([], 3, False)
+
+def test_since_pages_with_a_limit(tmp_path):
+    feed = make_feed(tmp_path, 3)
+    entries, latest, reset = feed.since(0, limit=2)
+    assert (cursors(entries), latest, reset) == ([1, 2], 3, False)
+
+def test_readers_pick_up_new_entries(tmp_path):
+    feed = make_feed(tmp_path, 1)
+    assert cursors(feed.since(0)[0]) == [1]
+
+    # Appended by another process
+    ReleaseFeed(feed.feed_path).append('release', {'number': 2})
+    assert cursors(feed.since(1)[0]) == [2]
+
+def test_cursor_ahead_of_the_feed_starts_over(tmp_path):
+    feed = make_feed(tmp_path, 2)
+    entries, latest, reset = feed.since(10)
+    assert (cursors(entries), latest, reset) == ([1, 2], 2, True)
+
+def test_cursor_before_compacted_entries_starts_over(tmp_path, monkeypatch):
+    monkeypatch.setattr(feed_module, 'COMPACT_EVERY', 2)
+    feed = ReleaseFeed(str(tmp_path / 'feed.jsonl'))
+    feed.max_entries = 2
+    assert cursors(feed.since(0)[0]) == []
+    for number in range(4):
+        feed.append('release', {'number': number + 1})
+
+    entries, latest, reset = feed.since(1)
+    assert (cursors(entries), latest, reset) == ([3, 4], 4, True)
+    entries, latest, reset = feed.since(2)
+    assert (cursors(entries), latest, reset) == ([3, 4], 4, False)
+
+def test_artist_changes():
+    previous = [{'name': 'Kept', 'color': 1}, {'name': 'Recolored', 'color': 1}, {'name': 'Removed', 'color': 1}]
+    current = [{'name': 'Kept', 'color': 1, 'id': 'ignored'}, {'name': 'Recolored', 'color': 2}, {'name': 'Added', 'color': 3}]
+
+    changes = artist_changes(previous, current)
+
+    assert [artist['name'] for artist in changes['added']] == ['Added']
+    assert [artist['name'] for artist in changes['updated']] == ['Recolored']
+    assert changes['removed'] == ['Removed']
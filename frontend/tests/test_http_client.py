@@ -0,0 +1,14 @@
+import pytest
+from python.http_client import parse_retry_after
+
+@pytest.mark.parametrize('value, expected', [
+    (None, None),
+    ('', None),
+    ('2', 2.0),
+    ('2.5', 2.5),
+    ('-3', 0.0),
+    ('soon', None),
+    ('Wed, 21 Oct 2026 07:28:00 GMT', None),
+])
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value) == expected
@@ -0,0 +1,74 @@
+import time
+import pytest
+import python.outbox as outbox_module
+from python.outbox import MAX_CLIENT_ERROR_ATTEMPTS, MAX_EMBEDS_PER_MESSAGE, DiscordOutbox
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = ''
+
+class FakeWebhook:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.payloads = []
+
+    def post(self, url, json, timeout):
+        self.payloads.append(json)
+        return self.responses.pop(0) if self.responses else FakeResponse(204)
+
+@pytest.fixture
+def outbox(tmp_path, monkeypatch):
+    monkeypatch.setenv('DISCORD_WEBHOOK', 'http://discord.test/webhook')
+    # Batches are dispatched by hand instead of on the background thread
+    monkeypatch.setattr(DiscordOutbox, 'start', lambda self: None)
+    return DiscordOutbox(str(tmp_path / 'outbox.json'))
+
+def use_webhook(monkeypatch, webhook):
+    monkeypatch.setattr(outbox_module, 'get_session', lambda url: webhook)
+    return webhook
+
+def enqueue(outbox, count, artist='Artist'):
+    for number in range(count):
+        assert outbox.enqueue(artist, f"Album {number}", '2026-01-01', {'title': f"Album {number}"})
+
+def test_duplicates_are_queued_once(outbox):
+    enqueue(outbox, 2)
+    enqueue(outbox, 2)
+    assert outbox.pending() == 2
+    assert outbox.contains('Artist', 'Album 1')
+
+def test_queued_releases_share_messages(outbox, monkeypatch):
+    webhook = use_webhook(monkeypatch, FakeWebhook())
+    enqueue(outbox, MAX_EMBEDS_PER_MESSAGE + 2)
+
+    outbox.dispatch_batch()
+    outbox.dispatch_batch()
+
+    assert [len(payload['embeds']) for payload in webhook.payloads] == [MAX_EMBEDS_PER_MESSAGE, 2]
+    assert outbox.pending() == 0
+
+def test_pending_releases_survive_a_restart(outbox, monkeypatch):
+    enqueue(outbox, 3)
+    reloaded = DiscordOutbox(outbox.file_path)
+    assert reloaded.pending() == 3
+
+def test_rate_limit_keeps_the_batch_and_waits(outbox, monkeypatch):
+    use_webhook(monkeypatch, FakeWebhook(FakeResponse(429, {'Retry-After': '30'})))
+    enqueue(outbox, 2)
+
+    outbox.dispatch_batch()
+
+    assert outbox.pending() == 2
+    assert outbox.blocked_until >= time.time() + 29
+
+def test_rejected_batches_are_dropped_after_repeated_attempts(outbox, monkeypatch):
+    use_webhook(monkeypatch, FakeWebhook(*[FakeResponse(400)] * MAX_CLIENT_ERROR_ATTEMPTS))
+    enqueue(outbox, 1)
+
+    for _ in range(MAX_CLIENT_ERROR_ATTEMPTS - 1):
+        outbox.dispatch_batch()
+    assert outbox.pending() == 1
+    outbox.dispatch_batch()
+    assert outbox.pending() == 0
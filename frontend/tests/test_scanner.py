@@ -0,0 +1,26 @@
+from python.scanner import LibraryScan, match_renames
+
+def make_scan(artists):
+    scan = LibraryScan()
+    scan.artists = artists
+    scan.added = list(artists)
+    return scan
+
+def test_folder_with_a_known_inode_is_a_rename():
+    scan = make_scan({'New Name': {'inode': 5}, 'Brand New': {'inode': 7}})
+    previous = {'Old Name': {'inode': 5}, 'Gone': {'inode': 6}}
+
+    match_renames(scan, previous, ['Old Name', 'Gone'])
+
+    assert scan.renamed == [('Old Name', 'New Name')]
+    assert scan.added == ['Brand New']
+    assert scan.removed == ['Gone']
+
+def test_inode_of_an_existing_folder_is_not_a_rename():
+    scan = make_scan({'New Name': {'inode': 5}})
+
+    match_renames(scan, {'Old Name': {'inode': 5}}, [])
+
+    assert scan.renamed == []
+    assert scan.added == ['New Name']
+    assert scan.removed == []